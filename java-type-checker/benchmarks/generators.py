@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+
+"""
+Seeded generators of synthetic type hierarchies and expressions, for benchmarks and tests.
+
+Every generator takes a `random.Random` (or a seed), so the same arguments always produce the same
+hierarchy or corpus.
+"""
+
+from java_type_checker import *
+import random
+
+
+PRIMITIVES = [Type.boolean, Type.int, Type.double]
+
+
+def _rng(seed):
+    return seed if isinstance(seed, random.Random) else random.Random(seed)
+
+
+def wide_hierarchy(count, seed=0, interfaces=20, methods_per_type=4):
+    """ `count` classes directly under Object, each implementing up to three of a small pool of
+    shared interfaces.
+    """
+    rng = _rng(seed)
+    shared = [_new_type("Interface{0}".format(i), [Type.object]) for i in range(interfaces)]
+    types = list(shared)
+    for i in range(count):
+        types.append(_new_type(
+            "Wide{0}".format(i),
+            [Type.object] + rng.sample(shared, rng.randint(0, 3))))
+    _add_members(types, rng, methods_per_type)
+    return types
+
+
+def deep_hierarchy(depth, seed=0, methods_per_type=4):
+    """ A single inheritance chain `depth` classes long.
+    """
+    rng = _rng(seed)
+    types = []
+    parent = Type.object
+    for i in range(depth):
+        parent = _new_type("Deep{0}".format(i), [parent])
+        types.append(parent)
+    _add_members(types, rng, methods_per_type)
+    return types
+
+
+def diamond_hierarchy(levels, width, seed=0, methods_per_type=4):
+    """ `levels` layers of `width` types each, where every type extends two random types of the
+    layer above, so that most ancestors are reachable along many paths.
+    """
+    rng = _rng(seed)
+    types = []
+    layer = [Type.object]
+    for level in range(levels):
+        layer = [
+            _new_type(
+                "Diamond{0}_{1}".format(level, i),
+                rng.sample(layer, min(2, len(layer))))
+            for i in range(width)]
+        types.extend(layer)
+    _add_members(types, rng, methods_per_type)
+    return types
+
+
+HIERARCHIES = {
+    "wide": lambda scale, seed: wide_hierarchy(scale, seed),
+    "deep": lambda scale, seed: deep_hierarchy(scale, seed),
+    "diamond": lambda scale, seed: diamond_hierarchy(10, max(2, scale // 10), seed),
+}
+
+#: The largest scale each shape is benchmarked at. Every type in a chain caches its whole ancestry
+#: and method table, so the memory of a deep hierarchy grows with the square of its depth.
+MAX_SCALES = {"deep": 2000}
+
+
+def _new_type(name, supertypes):
+    return ClassOrInterface(name, direct_supertypes=supertypes)
+
+
+def _add_members(types, rng, methods_per_type):
+    """ Gives each type a constructor and some methods whose signatures mention random types.
+    """
+    candidates = PRIMITIVES + types
+    for i, t in enumerate(types):
+        t.constructor = Constructor(rng.sample(candidates, rng.randint(0, 2)))
+        t.methods = [
+            Method(
+                "m{0}_{1}".format(i, j),
+                argument_types=rng.sample(candidates, rng.randint(0, 2)),
+                return_type=rng.choice(candidates))
+            for j in range(methods_per_type)]
+
+
+def well_typed_expression(types, depth, seed=0):
+    """ A random expression of nested method and constructor calls, up to `depth` levels deep, that
+    passes type checking.
+    """
+    return _ExpressionGenerator(types, _rng(seed)).expression(depth)
+
+
+def ill_typed_expression(types, depth, seed=0):
+    """ A random expression like well_typed_expression(), with one node broken so that it fails
+    type checking.
+    """
+    rng = _rng(seed)
+    generator = _ExpressionGenerator(types, rng)
+    return generator.break_one(generator.expression(depth))
+
+
+def corpus(types, count, depth, seed=0, ill_typed_fraction=0.0):
+    """ A list of `count` random expressions, of which about `ill_typed_fraction` are ill typed.
+    """
+    rng = _rng(seed)
+    generator = _ExpressionGenerator(types, rng)
+    expressions = []
+    for _ in range(count):
+        expr = generator.expression(depth)
+        if rng.random() < ill_typed_fraction:
+            expr = generator.break_one(expr)
+        expressions.append(expr)
+    return expressions
+
+
+class _ExpressionGenerator(object):
+    def __init__(self, types, rng):
+        self.rng = rng
+        self.types = [t for t in types if isinstance(t, ClassOrInterface)]
+        self.with_methods = [t for t in self.types if t.method_table()]
+        self.subtypes = {}
+        for t in self.types:
+            for ancestor in t.ancestors():
+                self.subtypes.setdefault(ancestor, []).append(t)
+
+    def expression(self, depth):
+        """ A well-typed expression whose static type is a random type with methods.
+        """
+        if depth <= 0 or self.rng.random() < 0.2:
+            return Variable("v", self.rng.choice(self.with_methods))
+        receiver = self.expression_with_methods(depth - 1)
+        receiver_type = receiver.check_types()
+        method = self.rng.choice(self.rng.choice(list(receiver_type.method_table().values())))
+        return MethodCall(
+            receiver,
+            method.name,
+            *[self.expression_of(t, depth - 1) for t in method.argument_types])
+
+    def expression_with_methods(self, depth):
+        for _ in range(10):
+            expr = self.expression(depth)
+            t = expr.check_types()
+            if isinstance(t, ClassOrInterface) and t.method_table():
+                return expr
+        return Variable("v", self.rng.choice(self.with_methods))
+
+    def expression_of(self, expected_type, depth):
+        """ A well-typed expression whose static type is a subtype of `expected_type`.
+        """
+        if not isinstance(expected_type, ClassOrInterface):
+            return Literal("0", expected_type)
+        actual_type = self.rng.choice(self.subtypes.get(expected_type, [expected_type]))
+        roll = self.rng.random()
+        if depth <= 0 or roll < 0.3:
+            return Variable("v", actual_type)
+        if roll < 0.6:
+            return ConstructorCall(
+                actual_type,
+                *[self.expression_of(t, depth - 1) for t in actual_type.constructor.argument_types])
+        return NullLiteral()
+
+    def break_one(self, expr):
+        """ Returns a copy of a well-typed call expression with one error introduced.
+        """
+        if isinstance(expr, MethodCall):
+            kind = self.rng.randrange(3)
+            if kind == 0:
+                return MethodCall(expr.receiver, expr.method_name + "_missing", *expr.args)
+            if kind == 1:
+                return MethodCall(expr.receiver, expr.method_name, *(expr.args + (NullLiteral(),)))
+            return MethodCall(self.break_one(expr.receiver), expr.method_name, *expr.args)
+        return MethodCall(Variable("x", Type.int), "hashCode")
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measures the memory cost of the type model and AST objects, in bytes per object.
+
+    python3 -m benchmarks.node_memory
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from java_type_checker import *
+import tracemalloc
+
+
+def bytes_per_object(factory, count=10000):
+    """ Average traced allocation size of `count` objects built by `factory(i)`.
+    """
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    total -= sys.getsizeof(objects)
+    return total / count
+
+
+point = ClassOrInterface("Point", direct_supertypes=[Type.object])
+variable = Variable("p", point)
+
+FACTORIES = [
+    ("Type", lambda i: Type("T", [Type.object])),
+    ("ClassOrInterface", lambda i: ClassOrInterface("C", [Type.object], methods=[
+        Method("getX", return_type=Type.double),
+        Method("setX", argument_types=[Type.double], return_type=Type.void)])),
+    ("Method", lambda i: Method("m", argument_types=[Type.int, Type.int], return_type=Type.int)),
+    ("Constructor", lambda i: Constructor([Type.double, Type.double])),
+    ("Variable", lambda i: Variable("p", point)),
+    ("Literal", lambda i: Literal("0", Type.int)),
+    ("MethodCall", lambda i: MethodCall(variable, "getX")),
+    ("ConstructorCall", lambda i: ConstructorCall(point, variable, variable)),
+]
+
+
+def main():
+    for name, factory in FACTORIES:
+        print("{0:<20} {1:>8.1f} bytes".format(name, bytes_per_object(factory)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measures the throughput and memory use of the type checker on synthetic hierarchies and
+expressions, and compares the results with stored baselines.
+
+    python3 -m benchmarks.run                    # run and compare with baselines.json
+    python3 -m benchmarks.run --save-baseline    # run and store the results as the new baseline
+    python3 -m benchmarks.run --scales 100 1000 --hierarchies wide
+
+Throughput is in operations per second. A benchmark counts as a regression when its throughput
+falls more than --tolerance (a fraction) below its baseline; the command then exits with status 1.
+Baselines are machine specific, so store them from the machine you compare on. Scales beyond a
+shape's entry in MAX_SCALES are skipped.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from java_type_checker import *
+from benchmarks.generators import HIERARCHIES, MAX_SCALES, corpus
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+
+def measure(operation, items, min_time=0.2):
+    """ Operations per second of `operation(item)` over `items`, repeating until `min_time` passes.
+    Like timeit, this keeps the garbage collector off while timing: a full collection of a large
+    hierarchy can take longer than `min_time` on its own.
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        count = 0
+        start = time.perf_counter()
+        while True:
+            for item in items:
+                operation(item)
+            count += len(items)
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                return count / elapsed
+    finally:
+        gc.enable()
+
+
+def run_scale(kind, scale, seed=0):
+    """ Benchmarks one hierarchy shape at one scale, returning {benchmark name: ops per second}.
+    """
+    rng = random.Random(seed)
+
+    tracemalloc.start()
+    types = HIERARCHIES[kind](scale, seed)
+    well_typed = corpus(types, 200, 6, seed)
+    ill_typed = corpus(types, 200, 6, seed + 1, ill_typed_fraction=1.0)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    type_pairs = [(rng.choice(types), rng.choice(types)) for _ in range(1000)]
+    lookups = []
+    for _ in range(1000):
+        t = rng.choice(types)
+        names = list(t.method_table())
+        lookups.append((t, rng.choice(names) if names and rng.random() < 0.8 else "missing"))
+
+    def check(expr):
+        try:
+            expr.check_types()
+        except (JavaTypeError, NoSuchMethod):
+            pass
+
+    def method_named(pair):
+        try:
+            pair[0].method_named(pair[1])
+        except NoSuchMethod:
+            pass
+
+    prefix = "{0}/{1}/".format(kind, scale)
+    return {
+        prefix + "is_subtype_of": measure(lambda pair: pair[0].is_subtype_of(pair[1]), type_pairs),
+        prefix + "method_named": measure(method_named, lookups),
+        prefix + "static_type": measure(lambda expr: expr.static_type(), well_typed),
+        prefix + "check_types": measure(check, well_typed),
+        prefix + "check_types_ill_typed": measure(check, ill_typed),
+        prefix + "build_peak_kib": peak / 1024,
+    }
+
+
+def compare(results, baselines, tolerance):
+    """ Prints each result next to its baseline, returning the names of regressed benchmarks.
+    """
+    regressions = []
+    for name, value in results.items():
+        baseline = baselines.get(name)
+        note = ""
+        if baseline:
+            change = value / baseline - 1
+            note = "{0:+.0%}".format(change)
+            higher_is_better = not name.endswith("_kib")
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(name)
+                note += "  REGRESSION"
+        print("{0:<45} {1:>14,.0f}   {2}".format(name, value, note))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--hierarchies", nargs="+", choices=sorted(HIERARCHIES), default=sorted(HIERARCHIES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--baselines", default=BASELINES)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for kind in args.hierarchies:
+        for scale in args.scales:
+            if scale <= MAX_SCALES.get(kind, scale):
+                results.update(run_scale(kind, scale, args.seed))
+
+    baselines = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines) as f:
+            baselines = json.load(f)
+    regressions = compare(results, baselines, args.tolerance)
+
+    if args.save_baseline:
+        baselines.update(results)
+        with open(args.baselines, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+    return 1 if regressions and not args.save_baseline else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -25,3 +25,17 @@ if sys.version_info[0] < 3:
 
 from .types import *
 from .expressions import *
+from .checker import *
+from .interning import *
+from .batch import *
+from .registry import *
+from .snapshot import *
+from .incremental import *
+from .instrumentation import *
+from .assignability import *
+from .columnar import *
+from .parser import *
+from .result_cache import *
+from .builder import *
+from .generics import *
+from .universe import *
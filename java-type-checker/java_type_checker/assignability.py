@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""
+Bulk subtype queries as NumPy boolean matrices. Requires NumPy, which the rest of the package
+does not need.
+"""
+
+from .types import ClassOrInterface, NullType
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - exercised only where NumPy is missing
+    numpy = None
+
+
+__all__ = ["AssignabilityMatrix", "assignability_matrix"]
+
+
+class AssignabilityMatrix(object):
+    """
+    A precomputed answer to “which of these source types are assignable to which of these target
+    types”: entry `[i, j]` is True iff `sources[i].is_subtype_of(targets[j])`. Covers primitives,
+    `null` (assignable to every class type) and class types.
+
+    With `packed=True`, rows are stored bit-packed (numpy.packbits), using an eighth of the memory;
+    query() works the same either way.
+    """
+    def __init__(self, sources, targets=None, packed=False):
+        if numpy is None:
+            raise ImportError("AssignabilityMatrix requires NumPy")
+        self.sources = list(sources)
+        self.targets = list(targets) if targets is not None else self.sources
+        self.source_ids = {t: i for i, t in enumerate(self.sources)}
+        self.target_ids = {t: j for j, t in enumerate(self.targets)}
+        self.packed = packed
+
+        # Each source’s cached closure gives its row directly, so building costs one pass over
+        # the closures instead of len(sources) × len(targets) subtype queries.
+        rows, columns = [], []
+        class_columns = [j for j, t in enumerate(self.targets) if isinstance(t, ClassOrInterface)]
+        for i, source in enumerate(self.sources):
+            if isinstance(source, NullType):
+                row = class_columns + [j for j, t in enumerate(self.targets) if t is source]
+            else:
+                row = [self.target_ids[t] for t in source.ancestors() if t in self.target_ids]
+            rows.extend([i] * len(row))
+            columns.extend(row)
+        matrix = numpy.zeros((len(self.sources), len(self.targets)), dtype=bool)
+        matrix[numpy.array(rows, dtype=numpy.intp), numpy.array(columns, dtype=numpy.intp)] = True
+        self.matrix = numpy.packbits(matrix, axis=1) if packed else matrix
+
+    @property
+    def dense(self):
+        """ The full boolean matrix, unpacked if necessary.
+        """
+        if self.packed:
+            return numpy.unpackbits(self.matrix, axis=1, count=len(self.targets)).astype(bool)
+        return self.matrix
+
+    def ids(self, types, targets=False):
+        """ The row (or, with `targets=True`, column) indexes of the given types, as an array.
+        """
+        index = self.target_ids if targets else self.source_ids
+        return numpy.fromiter((index[t] for t in types), dtype=numpy.intp)
+
+    def query(self, source_ids, target_ids):
+        """
+        Vectorized subtype check: returns a boolean array whose entries say whether each source id
+        is assignable to the target id at the same position (the arrays broadcast against each
+        other, so one side may be a scalar or a column).
+        """
+        source_ids = numpy.asarray(source_ids)
+        target_ids = numpy.asarray(target_ids)
+        if not self.packed:
+            return self.matrix[source_ids, target_ids]
+        bytes_ = self.matrix[source_ids, target_ids >> 3]
+        return ((bytes_ >> (7 - (target_ids & 7))) & 1).astype(bool)
+
+
+def assignability_matrix(sources, targets=None, packed=False):
+    """ Shorthand for `AssignabilityMatrix(sources, targets, packed).dense`.
+    """
+    return AssignabilityMatrix(sources, targets, packed).dense
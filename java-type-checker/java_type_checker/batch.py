@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+from .types import Type, IntersectionType, NoSuchMethod, _builtin_types, _reachable_types, _intersection_of
+from .generics import ParameterizedType
+from .expressions import JavaTypeError, _fields
+from .checker import check_iteratively
+from collections import namedtuple, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import io
+import os
+import pickle
+
+
+__all__ = ["CheckResult", "check_all"]
+
+
+CheckResult = namedtuple("CheckResult", ["static_type", "error"])
+CheckResult.__doc__ = """ The outcome of checking one expression: its static type, or the error it raised.
+"""
+
+
+def check_all(expressions, types=(), workers=None, chunk_size=1000):
+    """
+    Checks many independent expressions, returning a CheckResult for each one in input order.
+
+    With more than one worker, the type hierarchy reachable from `types` (plus the built-in types)
+    is sent to each worker process once, when it starts. Expressions are then streamed to the
+    workers in chunks of `chunk_size`, and refer to their types by index into that hierarchy, so
+    every type an expression mentions must be reachable from `types`. If you leave out `types`,
+    the expressions are first read in full to collect the types they mention. Result types made up
+    while checking, such as intersections and parameterized types, are sent back as their parts.
+
+    `workers` defaults to the number of CPUs; with one worker, expressions are checked in this
+    process.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        return [_check_one(expr) for expr in expressions]
+    if not types:
+        expressions = list(expressions)
+        types = _mentioned_types(expressions)
+
+    hierarchy = _reachable_types(types)
+    index = {t: i for i, t in enumerate(hierarchy)}
+    results = []
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_start_worker,
+            initargs=(_dumps(hierarchy, {}),)) as executor:
+        in_flight = deque()
+        expressions = iter(expressions)
+        while True:
+            while len(in_flight) < workers * 2:
+                chunk = list(islice(expressions, chunk_size))
+                if not chunk:
+                    break
+                in_flight.append(executor.submit(_check_chunk, _dumps(chunk, index)))
+            if not in_flight:
+                return results
+            results.extend(_loads(in_flight.popleft().result(), hierarchy))
+
+
+def _mentioned_types(expressions):
+    """ Every type that a node of the given expressions mentions.
+    """
+    found = set()
+    seen = set()  # ids of nodes visited, so shared subexpressions are visited once
+    pending = list(expressions)
+    while pending:
+        node = pending.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        for value in _fields(node):
+            if isinstance(value, Type):
+                found.add(value)
+        pending.extend(node.children())
+    return list(found)
+
+
+def _check_one(expression):
+    try:
+        return CheckResult(check_iteratively(expression), None)
+    except (JavaTypeError, NoSuchMethod) as e:
+        return CheckResult(None, e)
+
+
+class _HierarchyPickler(pickle.Pickler):
+    """ Pickles built-in types by name and hierarchy types by index, so that neither is copied, and
+    intersection and parameterized types by their parts, so that they are shared again on loading.
+    """
+    def __init__(self, file, index):
+        super().__init__(file)
+        self.index = index
+        self.builtin_names = {value: name for name, value in _builtin_types().items()}
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Type):
+            if obj in self.builtin_names:
+                return ("builtin", self.builtin_names[obj])
+            if obj in self.index:
+                return ("type", self.index[obj])
+            if not self.index:
+                return None
+            if isinstance(obj, IntersectionType):
+                return ("intersection", obj.components)
+            if isinstance(obj, ParameterizedType):
+                return ("parameterized", (obj.generic,) + obj.type_arguments)
+            raise ValueError(
+                "Type {0} is not reachable from the types passed to check_all()".format(obj.name))
+        return None
+
+
+class _HierarchyUnpickler(pickle.Unpickler):
+    def __init__(self, file, hierarchy):
+        super().__init__(file)
+        self.hierarchy = hierarchy
+
+    def persistent_load(self, pid):
+        kind, key = pid
+        if kind == "builtin":
+            return getattr(Type, key)
+        if kind == "intersection":
+            return _intersection_of(key)
+        if kind == "parameterized":
+            return key[0].of(*key[1:])
+        return self.hierarchy[key]
+
+
+def _dumps(obj, index):
+    buffer = io.BytesIO()
+    _HierarchyPickler(buffer, index).dump(obj)
+    return buffer.getvalue()
+
+
+def _loads(data, hierarchy):
+    return _HierarchyUnpickler(io.BytesIO(data), hierarchy).load()
+
+
+_worker_hierarchy = None
+_worker_index = None
+
+
+def _start_worker(hierarchy_data):
+    global _worker_hierarchy, _worker_index
+    _worker_hierarchy = _loads(hierarchy_data, ())
+    _worker_index = {t: i for i, t in enumerate(_worker_hierarchy)}
+
+
+def _check_chunk(chunk_data):
+    results = [_check_one(expression) for expression in _loads(chunk_data, _worker_hierarchy)]
+    return _dumps(results, _worker_index)
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+from .types import ClassOrInterface, Constructor, CyclicHierarchy
+from .registry import TypeRegistry
+from collections import deque
+
+
+__all__ = ["HierarchyBuilder", "topological_order", "build_indexes"]
+
+
+class HierarchyBuilder(object):
+    """
+    Builds many class and interface types at once from declarations given in any order, which may
+    refer to each other (and to types already in `registry`) by name.
+
+    build() resolves every name in one pass and rejects inheritance cycles before linking or
+    registering any of the new types, so a failed build leaves the registry as it was. It then
+    precomputes each type’s supertype closure and method table in topological order. Like any
+    cached index, these last until the hierarchy next changes, and are then rebuilt on demand.
+    """
+    def __init__(self, registry=None):
+        self.registry = registry if registry is not None else TypeRegistry()
+        self.order = None  #: The types built by build(), supertypes first (list of Types)
+        self._declarations = {}
+
+    def declare(self, name, supertypes=(), constructor=(), methods=(), instantiable=True):
+        """
+        Adds the declaration of a type. `supertypes` and `constructor` (the constructor’s argument
+        types) are lists of types or type names, and `methods` a list of Methods whose argument and
+        return types may also be names.
+        """
+        if name in self._declarations or name in self.registry:
+            raise ValueError("Type {0} is declared twice".format(name))
+        self._declarations[name] = (tuple(supertypes), tuple(constructor), tuple(methods), instantiable)
+
+    def __len__(self):
+        return len(self._declarations)
+
+    def build(self):
+        """
+        Creates and links the declared types, registers them, and builds their indexes. Returns the
+        registry. Raises CyclicHierarchy if some types inherit from themselves, and UnknownType if
+        a name resolves to no type.
+        """
+        types = {name: ClassOrInterface(name) for name in self._declarations}
+
+        def resolve(t):
+            if isinstance(t, str):
+                return types[t] if t in types else self.registry[t]
+            return t
+
+        # Resolve every name before changing anything, so that an unknown name leaves both the
+        # registry and the declared Methods as they were.
+        supertypes = {}
+        members = {}
+        for name, (supertype_names, constructor, methods, instantiable) in self._declarations.items():
+            t = types[name]
+            supertypes[t] = tuple([resolve(s) for s in supertype_names])
+            members[t] = (
+                Constructor([resolve(a) for a in constructor]),
+                [(method, tuple([resolve(a) for a in method.argument_types]),
+                    resolve(method.return_type)) for method in methods],
+                instantiable)
+        order = _topological_order(list(types.values()), lambda t: supertypes[t], set(types.values()))
+
+        # The types are new, so nothing has cached anything about them yet: link them directly
+        # instead of invalidating every cached index once per type.
+        for t, (constructor, methods, instantiable) in members.items():
+            t._direct_supertypes = supertypes[t]
+            t.constructor = constructor
+            for method, argument_types, return_type in methods:
+                method.argument_types = argument_types
+                method.return_type = return_type
+                t._declare(method)
+            t.is_instantiable = instantiable
+        for t in order:
+            self.registry.register(t)
+        build_indexes(order, ordered=True)
+        self._declarations = {}
+        self.order = order
+        return self.registry
+
+
+def topological_order(types):
+    """
+    Returns the given types and all their supertypes, each after all of its supertypes (list of
+    Types). Raises CyclicHierarchy if the supertypes form a cycle.
+    """
+    found = set()
+    pending = list(types)
+    while pending:
+        t = pending.pop()
+        if t not in found:
+            found.add(t)
+            pending.extend(t.direct_supertypes)
+    return _topological_order(list(found), lambda t: t.direct_supertypes, found)
+
+
+def build_indexes(types, ordered=False):
+    """
+    Precomputes the supertype closure, and the method table of class types, for the given types and
+    all their supertypes, visiting supertypes first. Pass `ordered=True` if the types are already in
+    topological order and include all their supertypes, to skip sorting them.
+    """
+    for t in (types if ordered else topological_order(types)):
+        t.ancestors()
+        if isinstance(t, ClassOrInterface):
+            t.method_table()
+
+
+def _topological_order(nodes, supertypes_of, within):
+    """ Kahn’s algorithm over the supertype edges between `nodes`, ignoring supertypes not `within`.
+    """
+    waiting_for = {}
+    subtypes = {}
+    ready = deque()
+    for t in nodes:
+        count = 0
+        for s in supertypes_of(t):
+            if s in within:
+                count += 1
+                subtypes.setdefault(s, []).append(t)
+        waiting_for[t] = count
+        if not count:
+            ready.append(t)
+    order = []
+    while ready:
+        t = ready.popleft()
+        order.append(t)
+        for subtype in subtypes.get(t, ()):
+            waiting_for[subtype] -= 1
+            if not waiting_for[subtype]:
+                ready.append(subtype)
+    if len(order) < len(nodes):
+        raise CyclicHierarchy(_find_cycle([t for t in nodes if waiting_for[t]], supertypes_of))
+    return order
+
+
+def _find_cycle(stuck, supertypes_of):
+    """ Returns a cycle among types that Kahn’s algorithm could not order. Every such type is on a
+    cycle or below one, so following stuck supertypes from any of them must come back around.
+    """
+    stuck_set = set(stuck)
+    path, position = [], {}
+    t = stuck[0]
+    while t not in position:
+        position[t] = len(path)
+        path.append(t)
+        t = next(s for s in supertypes_of(t) if s in stuck_set)
+    return path[position[t]:]
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+"""
+Alternative checking engines that produce the same results as Expression.check_types().
+"""
+
+from .types import Type
+from .expressions import Expression, TypeProblem
+
+
+__all__ = ["check_iteratively", "Diagnostic", "collect_diagnostics", "diagnose"]
+
+
+def check_iteratively(expression, memo=None):
+    """
+    Checks the given expression exactly like `expression.check_types()` would, raising the same
+    errors and returning its static type, but walks the tree with an explicit stack instead of
+    recursion. Use this for machine-generated trees too deep for Python’s recursion limit.
+
+    Children are checked in the same order as the recursive engine, so when a tree contains
+    several errors, both engines report the same one.
+
+    If you pass a `memo` dict, the result of every node checked is stored in it (its static type,
+    or the error it raised), and nodes already in it are not checked again. This makes checking a
+    DAG of shared subexpressions cost time proportional to its distinct nodes.
+    """
+    return _walk(expression, memo=memo)
+
+
+class Diagnostic(object):
+    """ A type error reported by collect_diagnostics() or diagnose(). Its message, and the error it
+    would have raised, are only created when asked for.
+    """
+    __slots__ = ("path", "problem")
+
+    def __init__(self, path, problem):
+        self.path = path        #: Child indexes leading from the root to the node, following children()
+        self.problem = problem  #: What went wrong (TypeProblem)
+
+    @property
+    def node(self):
+        """ The expression that failed to check.
+        """
+        return self.problem.node
+
+    @property
+    def expected(self):
+        return self.problem.expected
+
+    @property
+    def actual(self):
+        return self.problem.actual
+
+    @property
+    def error(self):
+        """ The error the node raises when checked with check_types() (JavaTypeError or NoSuchMethod).
+        """
+        return self.problem.exception()
+
+    @property
+    def message(self):
+        return self.problem.message
+
+    def __repr__(self):
+        return "Diagnostic({0!r}, {1}: {2})".format(
+            self.path, self.problem.error_class.__name__, self.message)
+
+
+def collect_diagnostics(expressions):
+    """
+    Checks an expression, or an iterable of expressions, in a single traversal, and returns a list
+    of every error found instead of stopping at the first one.
+
+    A node that fails to check is given the error type, which is compatible with everything, so
+    its siblings and ancestors are still checked without reporting errors it caused. Paths start
+    with the index of the expression when you pass several.
+    """
+    if isinstance(expressions, Expression):
+        roots = [(expressions, ())]
+    else:
+        roots = [(expression, (i,)) for i, expression in enumerate(expressions)]
+
+    diagnostics = []
+    for root, root_path in roots:
+        _walk(root, diagnostics=diagnostics, root_path=root_path)
+    return diagnostics
+
+
+def diagnose(expression):
+    """
+    Checks an expression without raising: returns its static type and an empty list if it checks,
+    or else None and the list of Diagnostics that collect_diagnostics() would return. Nothing is
+    raised or formatted along the way, so failing checks cost as little as passing ones, and passing
+    ones as little as with check_iteratively().
+    """
+    diagnostics = []
+    static_type = _walk(expression, diagnostics=diagnostics)
+    return (None if diagnostics else static_type), diagnostics
+
+
+def _walk(root, memo=None, diagnostics=None, root_path=()):
+    """
+    The one traversal behind every engine here. Without `diagnostics`, it raises the first error
+    found, as check_types() would, and uses `memo` if given. With a list of `diagnostics`, it
+    appends a Diagnostic for each error instead, gives the failing node the error type, and keeps
+    going. Returns the static type of `root`.
+
+    Both modes do the same work per node; a Diagnostic’s path is worked out from the stack only
+    when it is recorded.
+    """
+    pending = [root]  # nodes to expand, and expanded nodes followed by their child count
+    types = []        # static types of checked nodes whose parents are still pending
+    while pending:
+        item = pending.pop()
+        if type(item) is int:
+            node = pending.pop()
+            if item:
+                first = len(types) - item
+                child_types = types[first:]
+                del types[first:]
+            else:
+                child_types = ()
+            result = node.diagnose_node(child_types)
+            if type(result) is TypeProblem:
+                if diagnostics is None:
+                    error = result.exception()
+                    if memo is not None:
+                        memo[node] = error
+                    raise error
+                diagnostics.append(Diagnostic(root_path + _path_from(pending), result))
+                result = Type.error
+            elif memo is not None:
+                memo[node] = result
+            types.append(result)
+        elif memo is not None and item in memo:
+            result = memo[item]
+            if isinstance(result, Exception):
+                raise result.with_traceback(None)
+            types.append(result)
+        else:
+            children = item.children()
+            pending.append(item)
+            pending.append(len(children))  # ints are not tracked by the GC, unlike pair tuples
+            pending.extend(reversed(children))
+    return types[0]
+
+
+def _path_from(pending):
+    """
+    The path of the node _walk() has just checked, given its pending stack. The child counts left
+    on the stack belong to the node’s ancestors, and each ancestor’s child being worked on is the
+    one just below its siblings still waiting above the count.
+    """
+    path = []
+    parent = None  # position of the last child count seen
+    for position, item in enumerate(pending):
+        if type(item) is int:
+            if parent is not None:
+                waiting = position - 2 - parent  # siblings between the parent’s count and this node
+                path.append(pending[parent] - 1 - waiting)
+            parent = position
+    if parent is not None:
+        path.append(pending[parent] - 1 - (len(pending) - 1 - parent))
+    return tuple(path)
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+"""
+Bulk resolution of flat `receiver.method(args...)` calls whose receiver and argument types are
+already known, given as columns of ids instead of Expression objects.
+"""
+
+from .types import ClassOrInterface, NullType
+from array import array
+
+
+__all__ = ["resolve_calls"]  # the codes below stay in this module, e.g. columnar.OK
+
+# Error codes returned by resolve_calls(). Each matches an error that MethodCall.check_types()
+# would raise for the same call.
+OK = 0
+NO_SUCH_METHOD = 1          #: NoSuchMethod: the receiver type has no method with that name
+NO_METHODS = 2              #: JavaTypeError: the receiver is a primitive type
+NULL_RECEIVER = 3           #: NoSuchMethod: the receiver is null
+WRONG_ARGUMENT_COUNT = 4    #: JavaTypeError: wrong number of arguments
+WRONG_ARGUMENT_TYPES = 5    #: JavaTypeError: no overload accepts the argument types
+AMBIGUOUS = 6               #: JavaTypeError: several overloads apply and none is most specific
+
+NO_TYPE = -1  #: The return type id of a call that failed
+
+
+def resolve_calls(types, method_names, receiver_ids, method_name_ids, argument_ids, argument_offsets):
+    """
+    Resolves many method calls at once, with the same method lookup and subtype rules as
+    MethodCall.check_types().
+
+    Types and method names are referred to by their index in `types` and `method_names`. Call i
+    has receiver type `receiver_ids[i]`, calls `method_names[method_name_ids[i]]`, and passes
+    arguments of the types `argument_ids[argument_offsets[i]:argument_offsets[i + 1]]`, so
+    `argument_offsets` has one more entry than there are calls. The columns can be lists, arrays
+    or NumPy arrays.
+
+    Returns two arrays, with one entry per call: the id of each call’s return type in `types` (or
+    NO_TYPE), and its error code (OK if it resolved). Every method’s return type must be in `types`.
+    Calls with the same receiver, name and argument types are resolved only once.
+    """
+    type_ids = {t: i for i, t in enumerate(types)}
+    receiver_ids = _as_list(receiver_ids)
+    method_name_ids = _as_list(method_name_ids)
+    argument_ids = _as_list(argument_ids)
+    argument_offsets = _as_list(argument_offsets)
+
+    return_type_ids = array("i", bytes(4 * len(receiver_ids)))
+    error_codes = array("b", bytes(len(receiver_ids)))
+    resolved = {}
+    for i, (receiver_id, name_id) in enumerate(zip(receiver_ids, method_name_ids)):
+        args = tuple(argument_ids[argument_offsets[i]:argument_offsets[i + 1]])
+        key = (receiver_id, name_id, args)
+        result = resolved.get(key)
+        if result is None:
+            result = resolved[key] = _resolve(
+                types[receiver_id], method_names[name_id], [types[a] for a in args], type_ids)
+        return_type_ids[i], error_codes[i] = result
+    return return_type_ids, error_codes
+
+
+def _resolve(receiver_type, name, arg_types, type_ids):
+    if isinstance(receiver_type, NullType):
+        return NO_TYPE, NULL_RECEIVER
+    if not isinstance(receiver_type, ClassOrInterface):
+        return NO_TYPE, NO_METHODS
+    method = receiver_type.resolve_method(name, arg_types)
+    if method is not None:
+        if method.return_type is None:
+            raise ValueError("{0}.{1}() has no return type".format(receiver_type.name, name))
+        try:
+            return type_ids[method.return_type], OK
+        except KeyError:
+            raise ValueError("Return type {0} of {1}.{2}() is not in the type column".format(
+                method.return_type.name, receiver_type.name, name)) from None
+    overloads = receiver_type.overloads(name)
+    if not overloads:
+        return NO_TYPE, NO_SUCH_METHOD
+    if len(overloads) == 1 and len(overloads[0].argument_types) != len(arg_types):
+        return NO_TYPE, WRONG_ARGUMENT_COUNT
+    if len(overloads) > 1 and receiver_type.applicable_methods(name, arg_types):
+        return NO_TYPE, AMBIGUOUS
+    return NO_TYPE, WRONG_ARGUMENT_TYPES
+
+
+def _as_list(column):
+    """ The column as a list of plain ints (NumPy arrays convert much faster with tolist()).
+    """
+    return column.tolist() if hasattr(column, "tolist") else list(column)
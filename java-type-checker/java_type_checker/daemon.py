@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+"""
+A long-running type-check server, so that editors pay for importing this package and loading a
+hierarchy once rather than on every check.
+
+Run it with `python -m java_type_checker.daemon --hierarchy NAME=SNAPSHOT ... [--socket PATH]`.
+It reads one JSON request per line, from each connection to the Unix socket or else from stdin:
+
+    {"id": 1, "hierarchy": "NAME", "source": "Rectangle r; r.getPosition();"}
+
+`source` is parsed as by parse_expressions(), and `hierarchy` may be left out when the daemon has
+only one. Each request gets one JSON line in response, carrying the same id:
+
+    {"id": 1, "results": [{"type": "Point", "diagnostics": []}]}
+
+with one result per expression statement. An expression that fails to check has a null type and
+a list of `{"path": [...], "message": "..."}` diagnostics. A request that cannot be parsed at all
+gets `{"id": 1, "error": "..."}` instead.
+"""
+
+from .checker import diagnose
+from .parser import parse_expressions, ParseError
+from .registry import UnknownType
+from .snapshot import load_snapshot
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import asyncio
+import io
+import json
+import sys
+
+
+class CheckDaemon(object):
+    """
+    Serves check requests against warm hierarchies, given as a dict of name → TypeRegistry.
+
+    Requests that arrive while a batch is being checked, or within `batch_delay` seconds of the
+    first one, are coalesced into the next batch of at most `max_batch` requests. Each batch is
+    checked in one call on a worker thread, grouped by hierarchy, so the event loop keeps reading
+    requests meanwhile and pays for one thread hand-off per batch rather than per request.
+    """
+    def __init__(self, hierarchies, max_batch=256, batch_delay=0.001):
+        self.hierarchies = dict(hierarchies)
+        self.max_batch = max_batch
+        self.batch_delay = batch_delay
+        self.batch_sizes = []  #: The number of requests in each batch checked so far
+        self._queue = None
+        self._batcher = None
+        self._checker = None
+
+    async def check(self, request):
+        """ Queues a request (a dict, as decoded from JSON) and returns its response.
+        """
+        if not isinstance(request, dict):
+            return {"id": None, "error": "Invalid request: A request must be a JSON object"}
+        if self._batcher is None:
+            self._checker = ThreadPoolExecutor(max_workers=1)  # types cache lookups unlocked
+            self._queue = asyncio.Queue()
+            self._batcher = asyncio.ensure_future(self._run_batches())
+        response = asyncio.get_running_loop().create_future()
+        await self._queue.put((request, response))
+        return await response
+
+    async def close(self):
+        """ Stops the batching task. Requests still queued are dropped.
+        """
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+            self._checker.shutdown()
+            self._checker = None
+
+    async def handle_connection(self, reader, writer):
+        """ Serves the requests read from `reader` until end of input, writing their responses
+        to `writer` as they are ready (so not necessarily in request order).
+        """
+        pending = set()
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if line.strip():
+                task = asyncio.ensure_future(self._respond(line, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.wait(pending)
+
+    async def serve_unix(self, path):
+        """ Listens on the Unix socket at `path` until cancelled.
+        """
+        server = await asyncio.start_unix_server(self._serve_client, path)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_stdio(self):
+        """ Serves requests from stdin, writing responses to stdout, until stdin is closed.
+        """
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        await self.handle_connection(reader, _StdoutWriter())
+
+    async def _serve_client(self, reader, writer):
+        try:
+            await self.handle_connection(reader, writer)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _respond(self, line, writer):
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = {"id": None, "error": "Invalid request: {0}".format(e)}
+        else:
+            response = await self.check(request)
+        writer.write(json.dumps(response).encode("utf-8") + b"\n")
+
+    async def _run_batches(self):
+        while True:
+            batch = [await self._queue.get()]
+            if self.batch_delay:
+                await asyncio.sleep(self.batch_delay)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self.batch_sizes.append(len(batch))
+            batch = [(request, response) for request, response in batch if not response.cancelled()]
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._checker, self.check_batch, [request for request, _ in batch])
+            for (_, response), result in zip(batch, results):
+                if not response.cancelled():
+                    response.set_result(result)
+
+    def check_batch(self, requests):
+        """ Checks several requests right away, one hierarchy at a time, returning their responses
+        in request order.
+        """
+        by_hierarchy = {}
+        for i, request in enumerate(requests):
+            by_hierarchy.setdefault(_hashable(request.get("hierarchy")), []).append(i)
+        responses = [None] * len(requests)
+        for indexes in by_hierarchy.values():
+            for i in indexes:
+                try:
+                    responses[i] = self.check_request(requests[i])
+                except Exception as e:  # keep serving everyone else
+                    responses[i] = {"id": requests[i].get("id"), "error": "Internal error: {0!r}".format(e)}
+        return responses
+
+    def check_request(self, request):
+        """ Checks one request right away, returning its response.
+        """
+        request_id = request.get("id")
+        source = request.get("source")
+        if not isinstance(source, str):
+            return {"id": request_id, "error": "Request has no source"}
+        try:
+            registry = self._hierarchy(request.get("hierarchy"))
+            expressions = list(parse_expressions(io.StringIO(source), registry))
+        except (ParseError, UnknownType) as e:
+            return {"id": request_id, "error": str(e)}
+        return {"id": request_id, "results": [_result(expression) for expression in expressions]}
+
+    def _hierarchy(self, name):
+        if name is None and len(self.hierarchies) == 1:
+            return next(iter(self.hierarchies.values()))
+        try:
+            return self.hierarchies[name]
+        except (KeyError, TypeError):
+            raise UnknownType("No hierarchy named {0}".format(name)) from None
+
+
+def _hashable(value):
+    return value if isinstance(value, (str, type(None))) else repr(value)
+
+
+def _result(expression):
+    static_type, diagnostics = diagnose(expression)
+    return {
+        "type": static_type.name if static_type is not None else None,
+        "diagnostics": [{"path": list(d.path), "message": d.message} for d in diagnostics]}
+
+
+class _StdoutWriter(object):
+    def write(self, data):
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serves type-check requests as JSON lines.")
+    parser.add_argument("--hierarchy", action="append", required=True, metavar="NAME=SNAPSHOT",
+        help="a snapshot file to keep loaded, under the given name (repeatable)")
+    parser.add_argument("--socket", metavar="PATH", help="a Unix socket to listen on (default: stdin)")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--eager", action="store_true", help="load every type up front")
+    args = parser.parse_args(argv)
+
+    hierarchies = {}
+    for spec in args.hierarchy:
+        name, _, path = spec.partition("=")
+        if not path:
+            parser.error("--hierarchy must be NAME=SNAPSHOT")
+        hierarchies[name] = load_snapshot(path, lazy=not args.eager)
+
+    daemon = CheckDaemon(hierarchies, max_batch=args.max_batch)
+    try:
+        asyncio.run(daemon.serve_unix(args.socket) if args.socket else daemon.serve_stdio())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from .types import Type
+from .types import Type, ClassOrInterface, NullType, ErrorType, NoSuchMethod
 
 
 class Expression(object):
@@ -9,6 +9,8 @@ class Expression(object):
     this class does not actually _evaluate_ expressions.
     """
 
+    __slots__ = ()
+
     def static_type(self):
         """
         Returns the compile-time type of this expression, i.e. the most specific type that describes
@@ -20,13 +22,42 @@ class Expression(object):
         """
         Validates the structure of this expression, checking for any logical inconsistencies in the
         child nodes and the operation this expression applies to them.
+
+        Returns the static type of this expression. Each node is visited exactly once: children
+        report their static types as they are checked, so a parent never walks its subtree again.
+        """
+        return self.check_node([child.check_types() for child in self.children()])
+
+    def children(self):
+        """
+        Returns the subexpressions of this expression, in the order they are checked.
+        """
+        return ()
+
+    def check_node(self, child_types):
+        """
+        Validates this node alone, given the already-checked static types of its children (in the
+        order of children()), and returns its static type. Raises JavaTypeError or NoSuchMethod if
+        the node does not check.
         """
-        raise NotImplementedError(type(self).__name__ + " must implement check_types()")
+        result = self.diagnose_node(child_types)
+        if type(result) is TypeProblem:
+            raise result.exception()
+        return result
+
+    def diagnose_node(self, child_types):
+        """
+        Like check_node(), but returns a TypeProblem instead of raising an error, so that checks
+        expected to fail cost no more than checks that pass. Subclasses must implement this method.
+        """
+        raise NotImplementedError(type(self).__name__ + " must implement diagnose_node()")
 
 
 class Variable(Expression):
     """ An expression that reads the value of a variable, e.g. `x` in the expression `x + 5`.
     """
+    __slots__ = ("name", "declared_type")
+
     def __init__(self, name, declared_type):
         self.name = name                    #: The name of the variable
         self.declared_type = declared_type  #: The declared type of the variable (Type)
@@ -34,14 +65,15 @@ class Variable(Expression):
     def static_type(self):
         return self.declared_type
 
-    def check_types(self):
+    def diagnose_node(self, child_types):
         return self.declared_type
 
 
-
 class Literal(Expression):
     """ A literal value entered in the code, e.g. `5` in the expression `x + 5`.
     """
+    __slots__ = ("value", "type")
+
     def __init__(self, value, type):
         self.value = value  #: The literal value, as a string
         self.type = type    #: The type of the literal (Type)
@@ -49,52 +81,168 @@ class Literal(Expression):
     def static_type(self):
         return self.type
 
+    def diagnose_node(self, child_types):
+        return self.type
 
 
 class NullLiteral(Literal):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("null", Type.null)
 
     def static_type(self):
         return Type.null
 
+    def diagnose_node(self, child_types):
+        return Type.null
 
 
 class MethodCall(Expression):
     """
     A Java method invocation, i.e. `foo.bar(0, 1, 2)`.
     """
+    __slots__ = ("receiver", "method_name", "args")
+
     def __init__(self, receiver, method_name, *args):
-        self.receiver = receiver
         self.receiver = receiver        #: The object whose method we are calling (Expression)
         self.method_name = method_name  #: The name of the method to call (String)
-        self.args = args                #: The method arguments (list of Expressions)
+        self.args = args                #: The method arguments (tuple of Expressions)
 
     def static_type(self):
-        return self.receiver.static_type().method_named(self.method_name).return_type
+        receiver_type = self.receiver.static_type()
+        overloads = receiver_type.overloads(self.method_name)
+        if len(overloads) == 1:
+            return overloads[0].return_type
+        argument_types = tuple(arg.static_type() for arg in self.args) if overloads else None
+        return receiver_type.method_named(self.method_name, argument_types).return_type
+
+    def children(self):
+        return (self.receiver,) + self.args
 
+    def diagnose_node(self, child_types):
+        receiver_type, arg_types = child_types[0], tuple(child_types[1:])
+        if isinstance(receiver_type, ErrorType):
+            return receiver_type
+        if isinstance(receiver_type, NullType):
+            return TypeProblem(self, "null_receiver", receiver_type)
+        if not isinstance(receiver_type, ClassOrInterface):
+            return TypeProblem(self, "no_methods", receiver_type)
+        method = receiver_type.resolve_method(self.method_name, arg_types)
+        if method is None:
+            return self._unresolved_call(receiver_type, arg_types)
+        return method.return_type
+
+    def _unresolved_call(self, receiver_type, arg_types):
+        """ Explains why no overload could be picked for this call, unless that is only because an
+        argument already failed to check.
+        """
+        overloads = receiver_type.overloads(self.method_name)
+        if not overloads:
+            return TypeProblem(self, "no_such_method", receiver_type)
+        if len(overloads) == 1:
+            problem = _argument_problem(self, receiver_type, overloads[0].argument_types, arg_types)
+            if problem is not None:
+                return problem
+        if receiver_type.applicable_methods(self.method_name, arg_types):
+            if any(isinstance(t, ErrorType) for t in arg_types):
+                return Type.error
+            return TypeProblem(self, "ambiguous_call", receiver_type, actual=arg_types)
+        return TypeProblem(self, "no_applicable_overload", receiver_type, actual=arg_types)
 
 
 class ConstructorCall(Expression):
     """
     A Java object instantiation, i.e. `new Foo(0, 1, 2)`.
     """
+    __slots__ = ("instantiated_type", "args")
+
     def __init__(self, instantiated_type, *args):
         self.instantiated_type = instantiated_type  #: The type to instantiate (Type)
-        self.args = args                            #: Constructor arguments (list of Expressions)
+        self.args = args                            #: Constructor arguments (tuple of Expressions)
 
     def static_type(self):
         return self.instantiated_type
 
-    def check_types(self):
-        if self.instantiated_type == int:
-            raise JavaTypeError("Type int is not instantiable")
-        elif len(self.instantiated_type.constructor.argument_types) != len(self.args):
-            raise JavaTypeError(
-                "Wrong number of arguments for Rectangle constructor: expected 2, got 1".format(
-                        self.instantiated_type.name + " constructor",
-                        len(self.instantiated_type.constructor.argument_types),
-                        len(self.args)))
+    def children(self):
+        return self.args
+
+    def diagnose_node(self, child_types):
+        t = self.instantiated_type
+        if not t.is_instantiable:
+            return TypeProblem(self, "not_instantiable", t)
+        problem = _argument_problem(self, t, t.constructor.argument_types, tuple(child_types))
+        return t if problem is None else problem
+
+
+class ConditionalExpression(Expression):
+    """
+    A Java conditional expression, i.e. `foo ? bar : baz`.
+    """
+    __slots__ = ("condition", "true_expr", "false_expr")
+
+    def __init__(self, condition, true_expr, false_expr):
+        self.condition = condition    #: The boolean to test (Expression)
+        self.true_expr = true_expr    #: The value if the condition holds (Expression)
+        self.false_expr = false_expr  #: The value otherwise (Expression)
+
+    def static_type(self):
+        result = _conditional_type(self, self.true_expr.static_type(), self.false_expr.static_type())
+        if type(result) is TypeProblem:
+            raise result.exception()
+        return result
+
+    def children(self):
+        return (self.condition, self.true_expr, self.false_expr)
+
+    def diagnose_node(self, child_types):
+        condition_type, true_type, false_type = child_types
+        if not condition_type.is_subtype_of(Type.boolean):
+            return TypeProblem(self, "non_boolean_condition", condition_type, (Type.boolean,))
+        return _conditional_type(self, true_type, false_type)
+
+
+class TypeProblem(object):
+    """
+    A type error in one node, kept as data: the node, the type the error is about, and the types
+    expected and given where that applies. Its message is only formatted when asked for.
+
+    Raising API (check_node(), check_types()) wrap it in the exception given by `error_class`.
+    """
+    __slots__ = ("node", "kind", "subject", "expected", "actual")
+
+    def __init__(self, node, kind, subject=None, expected=(), actual=()):
+        self.node = node          #: The expression that failed to check (Expression)
+        self.kind = kind          #: What went wrong, as a key of TypeProblem.kinds (string)
+        self.subject = subject    #: The receiver, instantiated or condition type (Type)
+        self.expected = expected  #: The argument types required (tuple of Types)
+        self.actual = actual      #: The argument or branch types given (tuple of Types)
+
+    @property
+    def error_class(self):
+        """ The exception this problem is raised as (JavaTypeError or NoSuchMethod).
+        """
+        return self.kinds[self.kind][0]
+
+    @property
+    def message(self):
+        return self.kinds[self.kind][1](self)
+
+    def exception(self):
+        """ Returns the exception for this problem, which renders the message when printed.
+        """
+        return self.error_class(self)
+
+    def __str__(self):
+        return self.message
+
+    def __repr__(self):
+        return "TypeProblem({0}: {1})".format(self.kind, self.message)
+
+    def __reduce__(self):
+        # Only the message crosses process boundaries, not the node and types.
+        return (str, (self.message,))
+
 
 class JavaTypeError(Exception):
     """ Indicates a compile-time type error in an expression.
@@ -106,3 +254,75 @@ def names(named_things):
     """ Helper for formatting pretty error messages
     """
     return "(" + ", ".join([e.name for e in named_things]) + ")"
+
+
+def _fields(node):
+    """ The values of every field of an expression node, children included.
+    """
+    for cls in type(node).__mro__:
+        for slot in getattr(cls, "__slots__", ()):
+            yield getattr(node, slot)
+
+
+def _argument_problem(node, subject, expected_types, actual_types):
+    """ Returns a TypeProblem unless the actual argument types can be passed for the expected ones.
+    """
+    if len(expected_types) != len(actual_types):
+        return TypeProblem(node, "wrong_argument_count", subject, expected_types, actual_types)
+    for expected_type, actual_type in zip(expected_types, actual_types):
+        if not actual_type.is_subtype_of(expected_type):
+            return TypeProblem(node, "wrong_argument_types", subject, expected_types, actual_types)
+    return None
+
+
+def _call_name(problem):
+    if isinstance(problem.node, ConstructorCall):
+        return problem.subject.name + " constructor"
+    return "{0}.{1}()".format(problem.subject.name, problem.node.method_name)
+
+
+TypeProblem.kinds = {
+    # kind: (exception class, message)
+    "null_receiver": (NoSuchMethod, lambda p:
+        "Cannot invoke method {0}() on null".format(p.node.method_name)),
+    "no_methods": (JavaTypeError, lambda p:
+        "Type {0} does not have methods".format(p.subject.name)),
+    "no_such_method": (NoSuchMethod, lambda p:
+        "{0} has no method named {1}".format(p.subject.name, p.node.method_name)),
+    "wrong_argument_count": (JavaTypeError, lambda p:
+        "Wrong number of arguments for {0}: expected {1}, got {2}".format(
+            _call_name(p), len(p.expected), len(p.actual))),
+    "wrong_argument_types": (JavaTypeError, lambda p:
+        "{0} expects arguments of type {1}, but got {2}".format(
+            _call_name(p), names(p.expected), names(p.actual))),
+    "ambiguous_call": (JavaTypeError, lambda p:
+        "Call to {0} with arguments {1} is ambiguous".format(_call_name(p), names(p.actual))),
+    "no_applicable_overload": (JavaTypeError, lambda p:
+        "No overload of {0} accepts arguments {1}".format(_call_name(p), names(p.actual))),
+    "not_instantiable": (JavaTypeError, lambda p:
+        "Type {0} is not instantiable".format(p.subject.name)),
+    "non_boolean_condition": (JavaTypeError, lambda p:
+        "Condition of conditional expression must be boolean, but got {0}".format(p.subject.name)),
+    "void_branch": (JavaTypeError, lambda p:
+        "Conditional expression cannot have a void branch"),
+    "incompatible_branches": (JavaTypeError, lambda p:
+        "Incompatible types in conditional expression: {0} and {1}".format(
+            p.actual[0].name, p.actual[1].name)),
+}
+
+
+_numeric_types = (Type.int, Type.double)
+
+
+def _conditional_type(node, true_type, false_type):
+    """ The type of a conditional expression with branches of the given types: the wider of two
+    numeric types, or else their least upper bound. Returns a TypeProblem if there is none.
+    """
+    if Type.void in (true_type, false_type):
+        return TypeProblem(node, "void_branch", actual=(true_type, false_type))
+    if true_type in _numeric_types and false_type in _numeric_types:
+        return Type.double if Type.double in (true_type, false_type) else Type.int
+    result = true_type.least_upper_bound(false_type)
+    if result is None:
+        return TypeProblem(node, "incompatible_branches", actual=(true_type, false_type))
+    return result
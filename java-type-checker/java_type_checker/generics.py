@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+from .types import Type, ClassOrInterface, Constructor, Method
+
+
+__all__ = ["TypeParameter", "GenericClassOrInterface", "ParameterizedType", "substitute"]
+
+
+class TypeParameter(ClassOrInterface):
+    """
+    A type variable such as `T` in `class Box<T>`, standing for whichever type a parameterized type
+    supplies. Within the generic type it is known only to be a subtype of its bound, so it has the
+    bound’s methods, and accepts `null`.
+    """
+    __slots__ = ()
+
+    def __init__(self, name, bound=None):
+        super().__init__(name, direct_supertypes=[bound or Type.object])
+        self.is_instantiable = False
+
+    @property
+    def bound(self):
+        return self.direct_supertypes[0]
+
+
+class GenericClassOrInterface(ClassOrInterface):
+    """
+    A class-like type declared with type parameters, e.g. `List<T>`. Its supertypes, constructor
+    and methods may mention the TypeParameters, and parameterized types such as `Iterable<T>`.
+
+    Use of() to get the type for particular type arguments.
+    """
+    __slots__ = ("type_parameters", "_instantiations", "_revision")
+
+    def __init__(self, name, type_parameters, direct_supertypes=[], constructor=Constructor([]), methods=[]):
+        self._revision = 0  # bumped by every change to the members, which its instantiations copy
+        super().__init__(name, direct_supertypes, constructor, methods)
+        self.type_parameters = tuple(type_parameters)  #: (tuple of TypeParameters)
+        self._instantiations = {}
+
+    @property
+    def direct_supertypes(self):
+        return self._direct_supertypes
+
+    @direct_supertypes.setter
+    def direct_supertypes(self, supertypes):
+        self._revision += 1
+        Type.direct_supertypes.fset(self, supertypes)
+
+    @property
+    def constructor(self):
+        return ClassOrInterface.constructor.__get__(self)
+
+    @constructor.setter
+    def constructor(self, constructor):
+        self._revision += 1
+        ClassOrInterface.constructor.__set__(self, constructor)
+
+    @property
+    def is_instantiable(self):
+        return Type.is_instantiable.__get__(self)
+
+    @is_instantiable.setter
+    def is_instantiable(self, is_instantiable):
+        self._revision += 1
+        Type.is_instantiable.__set__(self, is_instantiable)
+
+    @property
+    def methods(self):
+        return ClassOrInterface.methods.fget(self)
+
+    @methods.setter
+    def methods(self, methods):
+        self._revision += 1
+        ClassOrInterface.methods.fset(self, methods)
+
+    def add_method(self, method):
+        self._revision += 1
+        super().add_method(method)
+
+    def of(self, *type_arguments):
+        """ Returns this type parameterized by the given class types, e.g. `List<Point>` for
+        `list_type.of(point)`. The same arguments always give the very same ParameterizedType.
+        """
+        try:
+            return self._instantiations[type_arguments]
+        except KeyError:
+            pass
+        if len(type_arguments) != len(self.type_parameters):
+            raise ValueError("{0} expects {1} type arguments, got {2}".format(
+                self.name, len(self.type_parameters), len(type_arguments)))
+        for argument in type_arguments:
+            if not isinstance(argument, ClassOrInterface):
+                raise ValueError("Type argument {0} of {1} is not a class or interface".format(
+                    argument.name, self.name))
+        instantiation = self._instantiations[type_arguments] = ParameterizedType(self, type_arguments)
+        return instantiation
+
+
+class ParameterizedType(ClassOrInterface):
+    """
+    A generic type applied to type arguments, e.g. `List<Point>`. Its supertypes, constructor and
+    methods are the generic type’s, with each type parameter replaced by its argument.
+
+    The substituted members are built on first use and kept until the generic type itself changes,
+    so calls on a parameterized type cost the same as on any other type. They cannot be changed
+    directly: change the generic type instead, and every parameterization follows. Create these
+    with GenericClassOrInterface.of(), never directly.
+    """
+    __slots__ = ("generic", "type_arguments", "_substituted_revision")
+
+    def __init__(self, generic, type_arguments):
+        self.generic = None  # members may be set until the base class has initialized
+        super().__init__("{0}<{1}>".format(generic.name, ", ".join(t.name for t in type_arguments)))
+        self.generic = generic                #: The type with parameters (GenericClassOrInterface)
+        self.type_arguments = type_arguments  #: The types given for them (tuple of Types)
+        self._substituted_revision = None
+
+    def _substitute(self):
+        if self._substituted_revision == self.generic._revision:
+            return
+        generic = self.generic
+        mapping = dict(zip(generic.type_parameters, self.type_arguments))
+        self._direct_supertypes = tuple(substitute(s, mapping) for s in generic.direct_supertypes)
+        ClassOrInterface.constructor.__set__(self, Constructor(
+            [substitute(a, mapping) for a in generic.constructor.argument_types]))
+        self._methods = {}
+        for method in generic._declared_methods():
+            argument_types = tuple(substitute(a, mapping) for a in method.argument_types)
+            return_type = substitute(method.return_type, mapping)
+            if argument_types != method.argument_types or return_type is not method.return_type:
+                method = Method(method.name, argument_types, return_type)
+            self._declare(method)
+        Type.is_instantiable.__set__(self, generic.is_instantiable)
+        self._substituted_revision = generic._revision
+
+    def _cannot_change(self):
+        return TypeError("Cannot change {0} directly; change the generic type {1} instead".format(
+            self.name, self.generic.name))
+
+    @property
+    def direct_supertypes(self):
+        self._substitute()
+        return self._direct_supertypes
+
+    @direct_supertypes.setter
+    def direct_supertypes(self, supertypes):
+        raise self._cannot_change()
+
+    @property
+    def constructor(self):
+        self._substitute()
+        return ClassOrInterface.constructor.__get__(self)
+
+    @constructor.setter
+    def constructor(self, constructor):
+        if self.generic is not None:
+            raise self._cannot_change()
+        ClassOrInterface.constructor.__set__(self, constructor)
+
+    @property
+    def is_instantiable(self):
+        self._substitute()
+        return Type.is_instantiable.__get__(self)
+
+    @is_instantiable.setter
+    def is_instantiable(self, is_instantiable):
+        if self.generic is not None:
+            raise self._cannot_change()
+        Type.is_instantiable.__set__(self, is_instantiable)
+
+    @property
+    def methods(self):
+        self._substitute()
+        return ClassOrInterface.methods.fget(self)
+
+    @methods.setter
+    def methods(self, methods):
+        raise self._cannot_change()
+
+    def add_method(self, method):
+        raise self._cannot_change()
+
+    def method_table(self):
+        self._substitute()
+        return super().method_table()
+
+    def __setstate__(self, state):
+        slots = dict(state[1])
+        self.generic = None  # as in __init__, members may be set until the generic is
+        generic = slots.pop("generic")
+        for name, value in slots.items():
+            setattr(self, name, value)
+        self.generic = generic
+
+
+def substitute(t, mapping):
+    """ Returns `t` with the type parameters in `mapping` (a dict of TypeParameter → Type) replaced,
+    including within the arguments of parameterized types.
+    """
+    if t in mapping:
+        return mapping[t]
+    if isinstance(t, ParameterizedType):
+        arguments = tuple(substitute(a, mapping) for a in t.type_arguments)
+        if arguments != t.type_arguments:
+            return t.generic.of(*arguments)
+    return t
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+from .types import ClassOrInterface, Constructor, Method, NoSuchMethod, hierarchy_changed
+from .expressions import MethodCall, ConstructorCall, JavaTypeError
+from .checker import check_iteratively
+from .batch import CheckResult
+
+
+__all__ = ["IncrementalChecker"]
+
+
+class IncrementalChecker(object):
+    """
+    Checks a corpus of expressions, remembering which types, methods and constructors each result
+    depended on. After you edit the hierarchy, tell the checker what changed with changed(), and it
+    re-checks only the expressions that depended on it.
+
+    An expression depends on every type that appears as the static type of one of its nodes, plus
+    all of their supertypes (whose members and supertypes subtype checks and method lookups read),
+    on every type it instantiates, and on the constructors it calls and every overload of the methods it calls.
+    """
+    def __init__(self, expressions=()):
+        self._expressions = []
+        self._results = []
+        self._dependencies = []  # expression index → set of definitions
+        self._dependents = {}    # definition → set of expression indexes
+        for expression in expressions:
+            self.add(expression)
+
+    def add(self, expression):
+        """ Checks a new expression and adds it to the corpus, returning its index.
+        """
+        index = len(self._expressions)
+        self._expressions.append(expression)
+        self._results.append(None)
+        self._dependencies.append(set())
+        self._check(index)
+        return index
+
+    def __len__(self):
+        return len(self._expressions)
+
+    def __getitem__(self, index):
+        """ The CheckResult of the expression at the given index.
+        """
+        return self._results[index]
+
+    def results(self):
+        """ The CheckResult of every expression, in the order they were added.
+        """
+        return list(self._results)
+
+    def changed(self, *definitions):
+        """
+        Re-checks every expression that depended on any of the given types, methods or
+        constructors, and returns their indexes in ascending order.
+
+        Report the type itself when you change its supertypes or declared methods, and the Method or
+        Constructor when you change its argument or return types. Since such edits bypass the
+        setters that keep cached method tables and resolutions current, reporting one also discards
+        those caches, as hierarchy_changed() does.
+        """
+        if any(isinstance(definition, (Method, Constructor)) for definition in definitions):
+            hierarchy_changed()
+        affected = set()
+        for definition in definitions:
+            affected.update(self._dependents.get(definition, ()))
+        for index in sorted(affected):
+            self._check(index)
+        return sorted(affected)
+
+    def _check(self, index):
+        expression = self._expressions[index]
+        memo = {}
+        try:
+            result = CheckResult(check_iteratively(expression, memo=memo), None)
+        except (JavaTypeError, NoSuchMethod) as e:
+            result = CheckResult(None, e)
+        self._results[index] = result
+
+        old_dependencies = self._dependencies[index]
+        new_dependencies = _dependencies_of(expression, memo)
+        for definition in old_dependencies - new_dependencies:
+            dependents = self._dependents[definition]
+            dependents.discard(index)
+            if not dependents:
+                del self._dependents[definition]
+        for definition in new_dependencies - old_dependencies:
+            self._dependents.setdefault(definition, set()).add(index)
+        self._dependencies[index] = new_dependencies
+
+
+def _dependencies_of(expression, memo):
+    """ The definitions that the results in `memo`, from checking `expression`, depended on.
+    """
+    dependencies = set()
+    for node, result in memo.items():
+        if isinstance(result, Exception):
+            continue
+        dependencies.update(result.ancestors())
+    pending = [expression]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, ConstructorCall):
+            t = node.instantiated_type
+            dependencies.add(t)
+            if isinstance(t, ClassOrInterface):
+                dependencies.add(t.constructor)
+        elif isinstance(node, MethodCall):
+            receiver_type = memo.get(node.receiver)
+            if isinstance(receiver_type, ClassOrInterface):
+                dependencies.update(receiver_type.overloads(node.method_name))
+        pending.extend(node.children())
+    return dependencies
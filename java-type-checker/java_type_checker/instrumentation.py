@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+"""
+Optional counters and timings for the type model and the checker.
+
+Instrumentation works by temporarily replacing methods with counting wrappers, so code that runs
+outside an `instrumented()` block pays nothing for it.
+"""
+
+from .types import Type, ClassOrInterface, _hierarchy
+from .expressions import Expression, TypeProblem
+from .universe import _FrozenTypeMixin, _FrozenClassOrInterfaceMixin
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+import json
+import time
+
+
+__all__ = ["Stats", "instrumented"]
+
+
+class Stats(object):
+    """
+    What happened while instrumentation was on.
+
+    `counters` counts subtype queries, method lookups, hits and misses of the cached supertype
+    closures and method tables, and errors raised while checking, by exception type. `timings` maps
+    each Expression subclass name to `[nodes checked, total seconds]`, counting only time spent on
+    the node itself, not on its children.
+    """
+    def __init__(self, trace=False):
+        self.counters = Counter()
+        self.timings = {}
+        self.events = [] if trace else None
+        self._start = time.perf_counter()
+
+    def to_chrome_trace(self):
+        """
+        Returns the recorded node checks as a Chrome trace (for chrome://tracing or Perfetto), with
+        the final counter values attached. Node events are only recorded with `trace=True`.
+        """
+        return {
+            "traceEvents": list(self.events or []),
+            "displayTimeUnit": "ns",
+            "otherData": {"counters": dict(self.counters)},
+        }
+
+    def write_chrome_trace(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+_active = None
+
+
+@contextmanager
+def instrumented(trace=False):
+    """
+    Turns instrumentation on for the duration of a `with` block, yielding the Stats it collects.
+    Pass `trace=True` to also record one trace event per node checked (see to_chrome_trace()).
+    """
+    global _active
+    if _active is not None:
+        raise RuntimeError("Instrumentation is already on")
+    stats = _active = Stats(trace)
+    replaced = []
+    try:
+        for cls in _subclasses(Type):
+            _replace(replaced, cls, "is_subtype_of", _counting_subtype_query)
+            _replace(replaced, cls, "ancestors", _counting_cache("ancestors", "_ancestors_version"))
+        for cls in _subclasses(ClassOrInterface):
+            _replace(replaced, cls, "find_method", _counting_method_lookup)
+            _replace(replaced, cls, "resolve_method", _counting_method_lookup)
+            _replace(replaced, cls, "method_table", _counting_cache("method_table", "_method_table_version"))
+        # Frozen types take their indexes from these mixins, which come first in their MRO.
+        _replace(replaced, _FrozenTypeMixin, "ancestors", _counting_cache("ancestors", None))
+        _replace(replaced, _FrozenClassOrInterfaceMixin, "method_table", _counting_cache("method_table", None))
+        for cls in _subclasses(Expression):
+            _replace(replaced, cls, "diagnose_node", _timed_check(cls.__name__))
+        yield stats
+    finally:
+        for cls, name, original in reversed(replaced):
+            setattr(cls, name, original)
+        _active = None
+
+
+def _subclasses(cls):
+    found = [cls]
+    for subclass in cls.__subclasses__():
+        found.extend(s for s in _subclasses(subclass) if s not in found)
+    return found
+
+
+def _replace(replaced, cls, name, make_wrapper):
+    """ Wraps the method `name` if `cls` defines it itself (inherited ones are wrapped already).
+    """
+    original = cls.__dict__.get(name)
+    if original is not None:
+        replaced.append((cls, name, original))
+        setattr(cls, name, make_wrapper(original))
+
+
+def _counting_subtype_query(original):
+    @wraps(original)
+    def is_subtype_of(self, other):
+        _active.counters["subtype_queries"] += 1
+        return original(self, other)
+    return is_subtype_of
+
+
+def _counting_method_lookup(original):
+    @wraps(original)
+    def lookup(self, *args):
+        _active.counters["method_lookups"] += 1
+        return original(self, *args)
+    return lookup
+
+
+def _counting_cache(cache_name, version_attr):
+    """ Counts hits and misses of a cache kept current by `version_attr`, or of one that never goes
+    stale (always a hit) if that is None.
+    """
+    def make_wrapper(original):
+        @wraps(original)
+        def cached(self):
+            hit = version_attr is None or getattr(self, version_attr) == _hierarchy.version
+            _active.counters["{0}_cache_{1}".format(cache_name, "hits" if hit else "misses")] += 1
+            return original(self)
+        return cached
+    return make_wrapper
+
+
+def _timed_check(node_type):
+    def make_wrapper(original):
+        @wraps(original)
+        def diagnose_node(self, child_types):
+            stats = _active
+            start = time.perf_counter()
+            try:
+                result = original(self, child_types)
+            finally:
+                end = time.perf_counter()
+                timing = stats.timings.setdefault(node_type, [0, 0.0])
+                timing[0] += 1
+                timing[1] += end - start
+                if stats.events is not None:
+                    stats.events.append({
+                        "name": node_type, "ph": "X", "pid": 0, "tid": 0,
+                        "ts": (start - stats._start) * 1e6,
+                        "dur": (end - start) * 1e6,
+                    })
+            if type(result) is TypeProblem:
+                stats.counters["errors." + result.error_class.__name__] += 1
+            return result
+        return diagnose_node
+    return make_wrapper
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+from .types import _hierarchy
+from .expressions import Variable, Literal, NullLiteral, MethodCall, ConstructorCall, ConditionalExpression
+from .checker import check_iteratively
+
+
+__all__ = ["ExpressionInterner"]
+
+
+class ExpressionInterner(object):
+    """
+    A factory for expressions that hash-conses structurally identical nodes, so that a corpus of
+    expressions becomes a DAG in which every distinct subtree exists only once.
+
+    Build expressions with this object’s methods instead of the node constructors, passing it
+    nodes it created itself as children, and check them with its check_types(). The result of
+    every distinct node is cached, so a corpus costs time proportional to its distinct subtrees.
+    Cached results are discarded whenever the type hierarchy changes.
+    """
+    def __init__(self):
+        self._nodes = {}
+        self._results = {}
+        self._results_version = _hierarchy.version
+
+    def __len__(self):
+        """ The number of distinct nodes interned so far.
+        """
+        return len(self._nodes)
+
+    def variable(self, name, declared_type):
+        return self._intern((Variable, name, declared_type), Variable, name, declared_type)
+
+    def literal(self, value, type):
+        return self._intern((Literal, value, type), Literal, value, type)
+
+    def null(self):
+        return self._intern((NullLiteral,), NullLiteral)
+
+    def method_call(self, receiver, method_name, *args):
+        return self._intern(
+            (MethodCall, receiver, method_name) + args,
+            MethodCall, receiver, method_name, *args)
+
+    def constructor_call(self, instantiated_type, *args):
+        return self._intern(
+            (ConstructorCall, instantiated_type) + args,
+            ConstructorCall, instantiated_type, *args)
+
+    def conditional(self, condition, true_expr, false_expr):
+        return self._intern(
+            (ConditionalExpression, condition, true_expr, false_expr),
+            ConditionalExpression, condition, true_expr, false_expr)
+
+    def check_types(self, expression):
+        """
+        Checks the given expression like `expression.check_types()`, reusing the cached result of
+        every node this interner has checked before.
+        """
+        if self._results_version != _hierarchy.version:
+            self._results.clear()
+            self._results_version = _hierarchy.version
+        return check_iteratively(expression, memo=self._results)
+
+    def _intern(self, key, node_class, *fields):
+        # Children are themselves interned, so they compare (and hash) by identity in the key.
+        node = self._nodes.get(key)
+        if node is None:
+            node = node_class(*fields)
+            self._nodes[key] = node
+        return node
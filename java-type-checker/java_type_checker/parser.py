@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+
+"""
+Parses Java expressions from source text. The text is a sequence of statements, each ending with a
+semicolon:
+
+    Rectangle rect;                         // declares a variable
+    java.lang.Object o;                     // types may be qualified, as registered
+    rect.getPosition().getX();              // an expression to check
+    flag ? new Point(1.0, 2.0) : null;
+
+Expressions are variables, `int`, `double` and `boolean` literals, `null`, method calls,
+`new` constructor calls, parentheses and conditional expressions. `//` starts a comment.
+"""
+
+from .types import Type
+from .expressions import Variable, Literal, NullLiteral, MethodCall, ConstructorCall, ConditionalExpression
+from .registry import UnknownType
+from .batch import _check_one
+import re
+
+
+__all__ = ["parse_expressions", "parse_file", "check_stream", "ParseError"]
+
+
+def parse_expressions(stream, registry, variables=None):
+    """
+    Parses the statements in `stream` (a text file, or any iterable of lines), yielding an Expression
+    for each expression statement as soon as its semicolon is read. Type names are looked up in
+    `registry` (a TypeRegistry), and `variables` can predeclare variables as a dict of name → Type.
+
+    Only one statement is held in memory at a time, so arbitrarily large inputs can be parsed, and
+    checked as they are parsed (see check_stream()). Raises ParseError for malformed input.
+    """
+    parser = _Parser(registry, variables or {})
+    for statement in _statements(_tokens(stream)):
+        expression = parser.statement(statement)
+        if expression is not None:
+            yield expression
+
+
+def parse_file(path, registry, variables=None):
+    """ Like parse_expressions(), reading the file at `path`.
+    """
+    with open(path, encoding="utf-8") as stream:
+        yield from parse_expressions(stream, registry, variables)
+
+
+def check_stream(stream, registry, variables=None):
+    """
+    Parses and checks the expressions in `stream` one at a time, yielding a CheckResult for each
+    expression statement in order.
+    """
+    for expression in parse_expressions(stream, registry, variables):
+        yield _check_one(expression)
+
+
+class ParseError(Exception):
+    """ Indicates malformed source text, or a name that does not resolve.
+    """
+    def __init__(self, message, line):
+        super().__init__("line {0}: {1}".format(line, message))
+        self.line = line  #: The line number of the error, starting at 1
+
+
+_keywords = {"new", "null", "true", "false"}
+
+_token_pattern = re.compile(r"""
+    \s*(?:
+        (?P<comment>//.*)
+      | (?P<double>\d+\.\d+)
+      | (?P<int>\d+)
+      | (?P<name>[A-Za-z_$][\w$]*)
+      | (?P<punct>\S)
+    )""", re.VERBOSE)
+
+
+def _tokens(lines):
+    """ Yields (kind, text, line number) for each token, where kind is a group of _token_pattern.
+    """
+    for line_number, line in enumerate(lines, 1):
+        line = line.rstrip()
+        position = 0
+        while position < len(line):
+            match = _token_pattern.match(line, position)
+            position = match.end()
+            if match.lastgroup != "comment":
+                yield (match.lastgroup, match.group(match.lastgroup), line_number)
+
+
+def _statements(tokens):
+    """ Groups tokens into statements, yielding a list of tokens per statement, semicolon included.
+    """
+    statement = []
+    for token in tokens:
+        statement.append(token)
+        if token[1] == ";":
+            yield statement
+            statement = []
+    if statement:
+        raise ParseError("Expected ; at end of input", statement[-1][2])
+
+
+class _Parser(object):
+    """ Parser for one statement at a time.
+    """
+    def __init__(self, registry, variables):
+        self.registry = registry
+        self.variables = {name: Variable(name, t) for name, t in variables.items()}
+        self.tokens = None
+        self.position = 0
+
+    def statement(self, tokens):
+        """ Parses one statement, returning its Expression, or None for a declaration.
+        """
+        self.tokens = tokens
+        self.position = 0
+        if self._is_declaration():
+            type_name = "".join(text for _, text, _ in tokens[:-2])
+            name = tokens[-2][1]
+            self.variables[name] = Variable(name, self._type(type_name, tokens[-2][2]))
+            return None
+        expression = self.expression()
+        self.expect(";")
+        return expression
+
+    def _is_declaration(self):
+        # `Name (. Name)* Name ;`
+        tokens = self.tokens
+        if len(tokens) < 3 or tokens[-2][0] != "name" or tokens[0][1] in _keywords:
+            return False
+        for i, (kind, text, _) in enumerate(tokens[:-2]):
+            if kind != ("name" if i % 2 == 0 else "punct") or (i % 2 == 1 and text != "."):
+                return False
+        return len(tokens) % 2 == 1
+
+    def expression(self):
+        # Nested expressions are parsed with an explicit stack of the constructs waiting for them,
+        # innermost last, so that nesting depth is limited by memory rather than by recursion:
+        #   ["?", branches]                  an expression: `cond ? value :` pairs so far, and a
+        #                                    condition whose value is being parsed
+        #   ["("]                            parentheses
+        #   ["new", type, args]              the arguments of a constructor call
+        #   ["call", receiver, name, args]   the arguments of a method call
+        # primary(), postfix() and close() return None when they open a nested expression.
+        frames = [["?", []]]
+        while True:
+            value = self.primary(frames)
+            while value is not None:
+                value = self.postfix(value, frames)
+                if value is None:
+                    break
+                frame = frames[-1]
+                if self.accept("?"):
+                    frame[1].append([value])
+                    frames.append(["?", []])
+                    break
+                # Conditionals nest to the right, so fold the `cond ? value :` prefixes.
+                frames.pop()
+                for condition, branch_value in reversed(frame[1]):
+                    value = ConditionalExpression(condition, branch_value, value)
+                if not frames:
+                    return value
+                value = self.close(value, frames)
+
+    def close(self, value, frames):
+        """ Hands a complete nested expression to the construct waiting for it.
+        """
+        frame = frames[-1]
+        kind = frame[0]
+        if kind == "?":
+            self.expect(":")
+            frame[1][-1].append(value)
+            return None
+        if kind == "(":
+            self.expect(")")
+            frames.pop()
+            return value
+        args = frame[-1]
+        args.append(value)
+        if self.accept(","):
+            frames.append(["?", []])
+            return None
+        self.expect(")")
+        frames.pop()
+        if kind == "new":
+            return ConstructorCall(frame[1], *args)
+        return MethodCall(frame[1], frame[2], *args)
+
+    def postfix(self, expression, frames):
+        while self.accept("."):
+            method_name = self.expect_name()
+            self.expect("(")
+            if not self.accept(")"):
+                frames.append(["call", expression, method_name, []])
+                frames.append(["?", []])
+                return None
+            expression = MethodCall(expression, method_name)
+        return expression
+
+    def primary(self, frames):
+        kind, text, line = self.next()
+        if kind == "int":
+            return Literal(text, Type.int)
+        if kind == "double":
+            return Literal(text, Type.double)
+        if kind == "name":
+            if text == "new":
+                type_name = self.expect_name()
+                while self.accept("."):
+                    type_name += "." + self.expect_name()
+                t = self._type(type_name, line)
+                self.expect("(")
+                if self.accept(")"):
+                    return ConstructorCall(t)
+                frames.append(["new", t, []])
+                frames.append(["?", []])
+                return None
+            if text == "null":
+                return NullLiteral()
+            if text in ("true", "false"):
+                return Literal(text, Type.boolean)
+            try:
+                return self.variables[text]
+            except KeyError:
+                raise ParseError("Undeclared variable {0}".format(text), line) from None
+        if text == "(":
+            frames.append(["("])
+            frames.append(["?", []])
+            return None
+        raise ParseError("Unexpected {0}".format(text), line)
+
+    def next(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def accept(self, text):
+        if self.tokens[self.position][1] == text:
+            self.position += 1
+            return True
+        return False
+
+    def expect(self, text):
+        kind, found, line = self.next()
+        if found != text:
+            raise ParseError("Expected {0} but found {1}".format(text, found), line)
+
+    def expect_name(self):
+        kind, text, line = self.next()
+        if kind != "name":
+            raise ParseError("Expected a name but found {0}".format(text), line)
+        return text
+
+    def _type(self, name, line):
+        try:
+            return self.registry[name]
+        except UnknownType as e:
+            raise ParseError(str(e), line) from None
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+from .types import Type, ClassOrInterface, LazyClassOrInterface
+import sys
+
+
+__all__ = ["TypeRegistry", "UnknownType"]
+
+
+class TypeRegistry(object):
+    """
+    Interns types by qualified name, so that loaders and checkers can resolve a type from its name
+    in constant time instead of passing Type objects around.
+
+    Types registered here may refer to other types by name, as strings, anywhere a Type is expected
+    (in `direct_supertypes`, constructor argument types, and method argument and return types).
+    Those forward references are resolved against the registry the next time a type is looked up,
+    or when you call link(), so declarations can come in any order and refer to each other.
+    """
+    def __init__(self, builtins=True):
+        self._types = {}     # qualified name or alias → Type
+        self._distinct = {}  # Type → None, in registration order
+        self._unlinked = []
+        if builtins:
+            for t in [Type.void, Type.boolean, Type.int, Type.double, Type.null]:
+                self.register(t)
+            self.register(Type.object, "java.lang.Object", aliases=["Object"])
+
+    def register(self, t, qualified_name=None, aliases=()):
+        """
+        Adds a type under its qualified name (which defaults to its simple name) and any aliases.
+        Returns the registered type: if the name is already taken, that is the existing type, and
+        the new one is ignored.
+        """
+        name = sys.intern(qualified_name or t.name)
+        existing = self._types.get(name)
+        if existing is not None:
+            return existing
+        self._types[name] = t
+        self._distinct[t] = None
+        for alias in aliases:
+            self._types.setdefault(sys.intern(alias), t)
+        self._unlinked.append(t)
+        return t
+
+    def __getitem__(self, name):
+        """ Returns the type with the given qualified name or alias, raising UnknownType if none.
+        """
+        self.link()
+        try:
+            return self._types[name]
+        except KeyError:
+            raise UnknownType("No type named {0}".format(name)) from None
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except UnknownType:
+            return default
+
+    def __contains__(self, name):
+        return name in self._types
+
+    def __iter__(self):
+        """ Iterates over the distinct registered types (not their names).
+        """
+        self.link()
+        return iter(list(self._distinct))
+
+    def items(self):
+        """ Returns (name, type) pairs for every qualified name and alias, in registration order.
+        """
+        self.link()
+        return list(self._types.items())
+
+    def __len__(self):
+        """ The number of distinct registered types; see items() for their names and aliases.
+        """
+        return len(self._distinct)
+
+    def link(self):
+        """ Resolves the forward references of every type registered since the last link.
+        """
+        while self._unlinked:
+            t = self._unlinked[-1]
+            if isinstance(t, LazyClassOrInterface) and not t.is_loaded:
+                self._unlinked.pop()  # its source provides resolved types, and linking would load it
+                continue
+            if any(isinstance(s, str) for s in t.direct_supertypes):
+                t.direct_supertypes = self._resolve_all(t.direct_supertypes)
+            if isinstance(t, ClassOrInterface):
+                t.constructor.argument_types = self._resolve_all(t.constructor.argument_types)
+                for method in t._declared_methods():
+                    method.argument_types = self._resolve_all(method.argument_types)
+                    method.return_type = self._resolve(method.return_type)
+            self._unlinked.pop()
+
+    def _resolve_all(self, types):
+        return tuple(self._resolve(t) for t in types)
+
+    def _resolve(self, t):
+        if isinstance(t, str):
+            try:
+                return self._types[t]
+            except KeyError:
+                raise UnknownType("No type named {0}".format(t)) from None
+        return t
+
+
+class UnknownType(Exception):
+    pass
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+from .types import Type, ClassOrInterface, NoSuchMethod, _hierarchy, _reachable_types
+from .expressions import Expression, JavaTypeError, _fields
+from .checker import check_iteratively
+from .batch import CheckResult
+import hashlib
+import sqlite3
+
+
+__all__ = ["ResultCache", "structural_hash", "type_fingerprint"]
+
+
+class ResultCache(object):
+    """
+    A persistent cache of check results, stored in an SQLite database at `path`, so that unchanged
+    expressions are not checked again by later runs.
+
+    Results are keyed by the structure of the expression and the definitions of every type it can
+    reach (see structural_hash() and type_fingerprint()), so editing any of those types, or the
+    expression, makes the old result unreachable. A cached static type is stored by its position
+    among the types the expression reaches, so a hit returns that very Type object, and costs
+    time proportional to the expression alone once the fingerprints of its types are known. The
+    least recently used results beyond `max_entries` are evicted.
+
+    Results are written to disk on commit(), or when the cache is closed, e.g. by using it as a
+    context manager.
+    """
+    def __init__(self, path, max_entries=100000):
+        self.max_entries = max_entries
+        self.hits = 0    #: Results found in the cache
+        self.misses = 0  #: Results that had to be checked
+        self._db = sqlite3.connect(path)
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != _FORMAT:
+            self._db.execute("DROP TABLE IF EXISTS results")  # written by another version
+            self._db.execute("PRAGMA user_version = {0}".format(_FORMAT))
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key BLOB PRIMARY KEY, type_ref TEXT, error_class TEXT, message TEXT,"
+            " last_used INTEGER NOT NULL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_by_use ON results (last_used)")
+        self._size, clock = self._db.execute(
+            "SELECT COUNT(*), COALESCE(MAX(last_used), 0) FROM results").fetchone()
+        self._clock = clock
+
+    def __len__(self):
+        return self._size
+
+    def check(self, expression):
+        """ Returns the CheckResult of `expression`, from the cache if possible, checking it and
+        storing the result otherwise.
+        """
+        key, closures = _key_of(expression)
+        result = self._get(key, closures)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        try:
+            result = CheckResult(check_iteratively(expression), None)
+        except (JavaTypeError, NoSuchMethod) as e:
+            result = CheckResult(None, e)
+        self._put(key, closures, result)
+        return result
+
+    def get(self, expression):
+        """ Returns the cached CheckResult of `expression`, or None if there is none.
+        """
+        key, closures = _key_of(expression)
+        return self._get(key, closures)
+
+    def commit(self):
+        self._db.commit()
+
+    def close(self):
+        self._db.commit()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _get(self, key, closures):
+        row = self._db.execute(
+            "SELECT type_ref, error_class, message FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        type_ref, error_class, message = row
+        if error_class is not None:
+            result = CheckResult(None, _error_classes[error_class](message))
+        elif type_ref is None:
+            result = CheckResult(None, None)
+        else:
+            i, j = map(int, type_ref.split(":"))
+            result = CheckResult(closures[i][1][j], None)
+        self._clock += 1
+        self._db.execute("UPDATE results SET last_used = ? WHERE key = ?", (self._clock, key))
+        return result
+
+    def _put(self, key, closures, result):
+        static_type, error = result
+        type_ref = None
+        if static_type is not None:
+            type_ref = _ref_of(static_type, closures)
+            if type_ref is None:
+                return  # e.g. an intersection type, made up while checking; just check again
+        self._clock += 1
+        row = (
+            type_ref,
+            type(error).__name__ if error is not None else None,
+            str(error) if error is not None else None,
+            self._clock,
+            key)
+        if self._db.execute(
+                "UPDATE results SET type_ref = ?, error_class = ?, message = ?, last_used = ?"
+                " WHERE key = ?", row).rowcount:
+            return
+        self._db.execute(
+            "INSERT INTO results (type_ref, error_class, message, last_used, key)"
+            " VALUES (?, ?, ?, ?, ?)", row)
+        self._size += 1
+        if self._size > self.max_entries:
+            # Evict a tenth at once, so that a full cache does not pay for eviction on every insert.
+            excess = self._size - self.max_entries + self.max_entries // 10
+            self._db.execute(
+                "DELETE FROM results WHERE key IN"
+                " (SELECT key FROM results ORDER BY last_used LIMIT ?)", (excess,))
+            self._size = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+_error_classes = {cls.__name__: cls for cls in (JavaTypeError, NoSuchMethod)}
+
+_FORMAT = 2  #: Stored as the database's user_version; tables of other versions are dropped
+
+
+def structural_hash(expression):
+    """
+    Returns a digest (bytes) of the structure of an expression tree: its node classes, their
+    fields, and the names of the types they mention. Equal trees have equal hashes, whether or
+    not they share nodes.
+    """
+    return _structure_of(expression)[0]
+
+
+def type_fingerprint(t):
+    """
+    Returns a digest (bytes) of the definition of `t` and of every type it reaches through its
+    supertypes, constructor and methods. Cached until the hierarchy changes.
+    """
+    return _closure_of(t)[0]
+
+
+def _key_of(expression):
+    """ The cache key of an expression, and the closures of the types it mentions, in key order.
+    """
+    digest, mentioned = _structure_of(expression)
+    key = hashlib.blake2b(digest, digest_size=20)
+    closures = sorted(map(_closure_of, mentioned), key=lambda c: c[0])
+    for fingerprint, _, _ in closures:
+        key.update(fingerprint)
+    return key.digest(), closures
+
+
+def _ref_of(t, closures):
+    """ Where `t` is among the given closures, as "closure index:position", or None.
+    """
+    for i, (_, _, positions) in enumerate(closures):
+        j = positions.get(t)
+        if j is not None:
+            return "{0}:{1}".format(i, j)
+    return None
+
+
+def _structure_of(expression):
+    """ The structural hash of an expression, and the set of types it mentions.
+    """
+    mentioned = set()
+    digests = {}  # id(node) → digest, so shared subtrees are hashed once
+    pending = [expression]
+    while pending:
+        node = pending[-1]
+        if id(node) in digests:
+            pending.pop()
+            continue
+        children = node.children()
+        missing = [child for child in children if id(child) not in digests]
+        if missing:
+            pending.extend(missing)
+            continue
+        pending.pop()
+        h = hashlib.blake2b(type(node).__name__.encode(), digest_size=16)
+        for value in _fields(node):
+            if isinstance(value, Type):
+                mentioned.add(value)
+                h.update(b"\x01T" + value.name.encode())
+            elif not isinstance(value, (Expression, tuple)):
+                h.update(b"\x01V" + str(value).encode())
+        for child in children:
+            h.update(b"\x02" + digests[id(child)])
+        digests[id(node)] = h.digest()
+    return digests[id(expression)], mentioned
+
+
+class _Fingerprints(object):
+    """ Closures by type, for one hierarchy version. The fingerprints are computed once per type
+    and version, and looked up in constant time after that.
+    """
+    closures = {}
+    version = None
+
+
+def _closure_of(t):
+    """ The fingerprint of a type and everything it reaches, those types (in a deterministic order
+    given their definitions), and each one's position in that order.
+    """
+    if _Fingerprints.version != _hierarchy.version:
+        _Fingerprints.closures = {}
+        _Fingerprints.version = _hierarchy.version
+    closure = _Fingerprints.closures.get(t)
+    if closure is None:
+        reachable = _reachable_types([t])
+        h = hashlib.blake2b(digest_size=16)
+        for definition in sorted(_definition_of(r) for r in reachable):
+            h.update(definition.encode() + b"\x00")
+        closure = _Fingerprints.closures[t] = (
+            h.digest(), reachable, {r: i for i, r in reversed(list(enumerate(reachable)))})
+    return closure
+
+
+def _definition_of(t):
+    parts = [type(t).__name__, t.name, str(t.is_instantiable)]
+    parts.append(",".join(s.name for s in t.direct_supertypes))
+    if isinstance(t, ClassOrInterface):
+        parts.append(",".join(a.name for a in t.constructor.argument_types))
+        parts.extend(  # in declaration order, which decides the order of reachable types
+            "{0}({1}){2}".format(
+                m.name,
+                ",".join(a.name for a in m.argument_types),
+                m.return_type.name if m.return_type is not None else "")
+            for m in t._declared_methods())
+    return "|".join(parts)
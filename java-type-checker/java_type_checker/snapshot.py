@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+
+"""
+A compact binary file format for complete type hierarchies, so that large hierarchies can be loaded
+without building them by hand on every process start.
+
+A snapshot holds every type’s name, supertypes, constructor and methods, the names it is registered
+under, and its precomputed supertype closure. All integers are little-endian. The file contains, in
+order:
+
+    header          magic, format version, and the length of each section below
+    string ends     u32 end offset of each string in the string blob
+    types           one fixed-size record per type (see _TYPE)
+    methods         one fixed-size record per method (see _METHOD)
+    names           (string, type) pairs: the registry entries
+    pool            u32 type and string indexes referenced by the records above
+    string blob     UTF-8 text of all strings, back to back
+
+Loading maps the file into memory and decodes records straight from the mapping. An eager load
+decodes each section in bulk; a lazy one decodes each type’s records when it is first used, and
+unmaps the file once every type has been loaded.
+"""
+
+from .types import Type, ClassOrInterface, LazyClassOrInterface, Constructor, Method, \
+    _builtin_types, _reachable_types, _hierarchy
+from .registry import TypeRegistry
+import array
+import mmap
+import struct
+import sys
+
+
+__all__ = ["save_snapshot", "load_snapshot"]
+
+
+_MAGIC = b"JTCS"
+_FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHxxIIIII")    # magic, version, strings, types, methods, names, pool
+_STRING_END = struct.Struct("<I")
+_TYPE = struct.Struct("<BxxxIIIIIIIII")   # kind, name, supertypes, constructor, methods, ancestors
+_METHOD = struct.Struct("<IiII")          # name, return type (-1 for none), arguments
+_NAME = struct.Struct("<II")              # string, type
+_POOL_ITEM = struct.Struct("<I")
+
+_BUILTIN, _PRIMITIVE, _CLASS = range(3)
+_NO_TYPE = -1
+
+
+def save_snapshot(types, path):
+    """
+    Writes the hierarchy of every type reachable from `types` to a snapshot file. `types` is either
+    a TypeRegistry, whose names are preserved, or an iterable of types. Types that have no name in
+    a registry are registered under their simple name when the snapshot is loaded.
+    """
+    if isinstance(types, TypeRegistry):
+        entries = types.items()
+    else:
+        entries = [(t.name, t) for t in types]
+    hierarchy = _reachable_types(t for _, t in entries)
+    named = {t for _, t in entries}
+    entries += [(t.name, t) for t in hierarchy if t not in named]
+    index = {t: i for i, t in enumerate(hierarchy)}
+    builtin_names = {value: name for name, value in _builtin_types().items()}
+
+    strings, string_index = [], {}
+    pool, type_records, method_records = [], [], []
+
+    def string(s):
+        if s not in string_index:
+            string_index[s] = len(strings)
+            strings.append(s)
+        return string_index[s]
+
+    def pooled(items):
+        offset = len(pool)
+        pool.extend(items)
+        return offset, len(items)
+
+    for t in hierarchy:
+        if t in builtin_names:
+            kind, name = _BUILTIN, builtin_names[t]
+        else:
+            kind, name = (_CLASS if isinstance(t, ClassOrInterface) else _PRIMITIVE), t.name
+        constructor, methods = (0, 0), (len(method_records), 0)
+        if kind == _CLASS:
+            constructor = pooled([index[a] for a in t.constructor.argument_types])
+            declared = t._declared_methods()
+            for method in declared:
+                method_records.append(_METHOD.pack(
+                    string(method.name),
+                    index[method.return_type] if method.return_type is not None else _NO_TYPE,
+                    *pooled([index[a] for a in method.argument_types])))
+            methods = (methods[0], len(declared))
+        type_records.append(_TYPE.pack(
+            kind,
+            string(name),
+            *pooled([index[s] for s in t.direct_supertypes]),
+            *constructor,
+            *methods,
+            *pooled([index[a] for a in t.ancestors()])))
+
+    name_records = [_NAME.pack(string(name), index[t]) for name, t in entries]
+
+    blobs = [s.encode("utf-8") for s in strings]
+    string_ends, end = [], 0
+    for blob in blobs:
+        end += len(blob)
+        string_ends.append(_STRING_END.pack(end))
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(
+            _MAGIC, _FORMAT_VERSION,
+            len(strings), len(type_records), len(method_records), len(name_records), len(pool)))
+        for section in [string_ends, type_records, method_records, name_records]:
+            f.write(b"".join(section))
+        f.write(struct.pack("<{0}I".format(len(pool)), *pool))
+        f.write(b"".join(blobs))
+
+
+def load_snapshot(path, lazy=False):
+    """
+    Loads a snapshot written by save_snapshot(), returning a TypeRegistry of its types. Built-in
+    types in the snapshot resolve to this process’s own built-ins (`Type.int`, `Type.object`, etc).
+
+    An eager load costs about as much as building the same types by hand, since nearly all of the
+    time goes to creating the objects themselves: what it saves is writing the code that builds
+    them. For fast startup, pass `lazy=True`: classes and interfaces are then loaded as
+    LazyClassOrInterface objects that decode their members from the snapshot only when first used,
+    so the load itself costs little more than one object per type. The file stays mapped until
+    the last of them has been loaded.
+    """
+    with open(path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    reader = _SnapshotReader(data)
+    try:
+        return reader.load(lazy)
+    except BaseException:
+        reader.close()
+        raise
+
+
+class _SnapshotReader(object):
+    """ Decodes the sections of a snapshot from a buffer.
+    """
+    def __init__(self, data):
+        magic, version, string_count, self.type_count, self.method_count, self.name_count, pool_len = \
+            _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC:
+            raise ValueError("Not a type hierarchy snapshot")
+        if version != _FORMAT_VERSION:
+            raise ValueError("Unsupported snapshot format version {0}".format(version))
+        self.view = memoryview(data)
+        string_ends_at = _HEADER.size
+        self.types_at = string_ends_at + string_count * _STRING_END.size
+        self.methods_at = self.types_at + self.type_count * _TYPE.size
+        self.names_at = self.methods_at + self.method_count * _METHOD.size
+        pool_at = self.names_at + self.name_count * _NAME.size
+        self.strings_at = pool_at + pool_len * _POOL_ITEM.size
+        self.string_ends = _u32_array(self.view[string_ends_at:self.types_at])
+        self.pool = _u32_array(self.view[pool_at:self.strings_at])
+        self.strings = [None] * string_count
+        self.data = data
+        self.unloaded = 0  # lazy types whose members have not been decoded yet
+
+    def close(self):
+        """ Releases all views of the buffer and closes it. Decoded strings stay available.
+        """
+        if self.data is not None:
+            for view in [self.string_ends, self.pool, self.view]:
+                if isinstance(view, memoryview):
+                    view.release()
+            self.data.close()
+            self.data = None
+
+    def string(self, i):
+        s = self.strings[i]
+        if s is None:
+            start = self.strings_at + (self.string_ends[i - 1] if i else 0)
+            s = self.strings[i] = str(self.view[start:self.strings_at + self.string_ends[i]], "utf-8")
+        return s
+
+    def pooled(self, offset, count):
+        return self.pool[offset:offset + count]
+
+    def type_record(self, i):
+        return _TYPE.unpack_from(self.view, self.types_at + i * _TYPE.size)
+
+    def method_record(self, i):
+        return _METHOD.unpack_from(self.view, self.methods_at + i * _METHOD.size)
+
+    def name_records(self):
+        return _NAME.iter_unpack(self.view[self.names_at:self.names_at + self.name_count * _NAME.size])
+
+    def members(self, i):
+        """ The (direct_supertypes, constructor, methods) of the lazy type at index i. Each type
+        asks once, so the file is closed after the last one.
+        """
+        types = self.types
+        _, _, supers_at, supers_n, ctor_at, ctor_n, methods_at, methods_n, _, _ = self.type_record(i)
+        methods = []
+        for m in range(methods_at, methods_at + methods_n):
+            name, return_type, args_at, args_n = self.method_record(m)
+            methods.append(Method(
+                self.string(name),
+                argument_types=[types[a] for a in self.pooled(args_at, args_n)],
+                return_type=types[return_type] if return_type != _NO_TYPE else None))
+        members = (
+            [types[s] for s in self.pooled(supers_at, supers_n)],
+            Constructor([types[a] for a in self.pooled(ctor_at, ctor_n)]),
+            methods)
+        self.unloaded -= 1
+        if not self.unloaded:
+            self.close()
+        return members
+
+    def ancestors(self, i):
+        """ The precomputed supertype closure of the type at index i, or None once the file is
+        closed (every type is loaded by then, so the closure can be computed instead).
+        """
+        if self.data is None:
+            return None
+        _, _, _, _, _, _, _, _, ancestors_at, ancestors_n = self.type_record(i)
+        types = self.types
+        return [types[a] for a in self.pooled(ancestors_at, ancestors_n)]
+
+    def load(self, lazy=False):
+        builtins = _builtin_types()
+        records = list(_TYPE.iter_unpack(self.view[self.types_at:self.methods_at]))
+        if not lazy:
+            self.decode_strings()
+        self.types = types = []
+        for i, (kind, name, *_) in enumerate(records):
+            if kind == _BUILTIN:
+                types.append(builtins[self.string(name)])
+            elif kind == _CLASS and lazy:
+                types.append(LazyClassOrInterface(self.string(name), self, i))
+                self.unloaded += 1
+            elif kind == _CLASS:
+                types.append(ClassOrInterface(self.string(name)))
+            else:
+                types.append(Type(self.string(name)))
+        if not lazy:
+            self.fill_members(records)
+
+        registry = TypeRegistry()
+        names = {}
+        for name, type_index in self.name_records():
+            names.setdefault(type_index, []).append(self.string(name))
+        for type_index, (qualified_name, *aliases) in names.items():
+            registry.register(types[type_index], qualified_name, aliases)
+        if not self.unloaded:
+            self.close()
+        return registry
+
+    def decode_strings(self):
+        """ Decodes every string at once, which is much faster than one at a time.
+        """
+        ends = self.string_ends.tolist()
+        blob = self.view[self.strings_at:self.strings_at + (ends[-1] if ends else 0)].tobytes()
+        self.strings = [blob[start:end].decode("utf-8") for start, end in zip([0] + ends, ends)]
+
+    def fill_members(self, records):
+        """ Fills in the members and closures of every non-built-in type, from the sections decoded
+        in bulk.
+        """
+        types, strings, pool = self.types, self.strings, self.pool.tolist()
+        method_records = list(_METHOD.iter_unpack(self.view[self.methods_at:self.names_at]))
+        version = _hierarchy.version
+        for t, (kind, _, supers_at, supers_n, ctor_at, ctor_n, methods_at, methods_n, ancestors_at,
+                ancestors_n) in zip(types, records):
+            if kind == _BUILTIN:
+                continue
+            # These types are new, so nothing has cached anything about them yet: fill in their
+            # members and closures directly instead of invalidating every cached index.
+            t._direct_supertypes = tuple([types[s] for s in pool[supers_at:supers_at + supers_n]])
+            if kind == _CLASS:
+                t.constructor = Constructor([types[a] for a in pool[ctor_at:ctor_at + ctor_n]])
+                for name, return_type, args_at, args_n in method_records[methods_at:methods_at + methods_n]:
+                    method = Method(
+                        strings[name],
+                        [types[a] for a in pool[args_at:args_at + args_n]],
+                        types[return_type] if return_type != _NO_TYPE else None)
+                    t._declare(method)
+            t._ancestors = frozenset([types[a] for a in pool[ancestors_at:ancestors_at + ancestors_n]])
+            t._ancestors_version = version
+
+
+def _u32_array(buffer):
+    """ A sequence of the little-endian u32s in the buffer, without copying where possible.
+    """
+    if sys.byteorder == "little":
+        return buffer.cast("I")
+    values = array.array("I", buffer)
+    values.byteswap()
+    return values
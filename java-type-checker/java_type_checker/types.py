@@ -1,44 +1,158 @@
 # -*- coding: utf-8 -*-
 
+from types import MappingProxyType
+
+
+__all__ = [
+    "Type", "hierarchy_changed", "Constructor", "Method", "ClassOrInterface", "LazyClassOrInterface",
+    "IntersectionType", "NullType", "ErrorType", "NoSuchMethod", "CyclicHierarchy",
+]
+
 
 class Type(object):
     """ Represents any Java type, including both class types and primitives.
     """
+    __slots__ = ("name", "_direct_supertypes", "_ancestors", "_ancestors_version", "is_instantiable")
+
     def __init__(self, name, direct_supertypes=[]):
         self.name = name
-        self.direct_supertypes = direct_supertypes
+        self._direct_supertypes = tuple(direct_supertypes)  # a new type has no subtypes to invalidate
+        self._ancestors = None
+        self._ancestors_version = None
         self.is_instantiable = False
 
+    @property
+    def direct_supertypes(self):
+        """ The types this type directly extends or implements (tuple of Types).
+
+        Assigning a new list of supertypes invalidates every cached subtype index, since
+        the change may affect the ancestors of this type’s subtypes too.
+        """
+        return self._direct_supertypes
+
+    @direct_supertypes.setter
+    def direct_supertypes(self, supertypes):
+        self._direct_supertypes = tuple(supertypes)
+        hierarchy_changed()
+
+    def ancestors(self):
+        """ Returns the transitive closure of this type’s supertypes, including the type itself
+        (frozenset of Types).
+
+        The closure is computed once per hierarchy version and shared by every subtype, so each
+        ancestor is visited only once no matter how many paths lead to it. Stale supertypes are
+        rebuilt first, without recursion, so any depth of hierarchy works. Raises CyclicHierarchy
+        if this type is its own supertype, directly or indirectly.
+        """
+        ancestors = self._current_ancestors()
+        if ancestors is None:
+            ancestors = _build_ancestors(self)
+        return ancestors
+
+    def _current_ancestors(self):
+        """ The cached closure, or None if it is out of date.
+        """
+        return self._ancestors if self._ancestors_version == _hierarchy.version else None
+
     def is_subtype_of(self, other):
-        if self == other:
-            return True
-        elif other in self.direct_supertypes:
-            return True
-        else:
-            for i in range(len(self.direct_supertypes)):
-                supertype = self.direct_supertypes[i]
-                return supertype.is_subtype_of(other)
-        return False
+        """ True if a value of this type can be used where `other` is expected.
+        """
+        return other in self.ancestors()
 
     def is_supertype_of(self, other):
         """ Convenience counterpart to is_subtype_of().
         """
         return other.is_subtype_of(self)
 
+    def least_upper_bound(self, other):
+        """
+        Returns the most specific type that both this type and `other` are subtypes of, or None if
+        there is none (e.g. for two different primitives).
+
+        When the two types share several unrelated minimal supertypes, as classes that implement
+        the same interfaces do, the result is the IntersectionType of all of them. Results are
+        cached per pair of types until the hierarchy changes.
+        """
+        if _joins.version != _hierarchy.version:
+            _joins.clear()
+        key = (self, other)
+        try:
+            return _joins.results[key]
+        except KeyError:
+            pass
+        if self.is_subtype_of(other):
+            result = other
+        elif other.is_subtype_of(self):
+            result = self
+        else:
+            result = _join_of_ancestors(self.ancestors() & other.ancestors())
+        _joins.results[key] = _joins.results[(other, self)] = result
+        return result
+
+
+def _build_ancestors(t):
+    """ Computes the closure of `t` and of each of its supertypes whose closure is out of date,
+    depth first with an explicit stack, so that every supertype is done before its subtypes.
+    """
+    version = _hierarchy.version
+    path, on_path, supertypes = [t], {t}, [iter(t.direct_supertypes)]
+    while supertypes:
+        for supertype in supertypes[-1]:
+            if supertype._current_ancestors() is None:
+                if supertype in on_path:
+                    raise CyclicHierarchy(path[path.index(supertype):])
+                path.append(supertype)
+                on_path.add(supertype)
+                supertypes.append(iter(supertype.direct_supertypes))
+                break
+        else:
+            supertypes.pop()
+            done = path.pop()
+            on_path.discard(done)
+            ancestors = {done}
+            for supertype in done.direct_supertypes:
+                ancestors.update(supertype._current_ancestors())
+            done._ancestors = frozenset(ancestors)
+            done._ancestors_version = version
+    return t._ancestors
+
+
+class _HierarchyVersion(object):
+    """ Stamp for the cached supertype closures and method tables. Any change to a type’s
+    supertypes or methods bumps it, which lazily invalidates every cached index.
+    """
+    version = 0
+
+
+_hierarchy = _HierarchyVersion()
+
+
+def hierarchy_changed():
+    """ Discards all cached hierarchy indexes, so that they are rebuilt on next use.
+
+    Reassigning `direct_supertypes` or `methods` calls this automatically, and adding new types needs no
+    rebuild at all; call it yourself only if you change the hierarchy by some other means.
+    """
+    _hierarchy.version += 1
+
 
 class Constructor(object):
     """ The declaration of a Java constructor.
     """
-    def __init__(self, argument_types=[]):
-        self.argument_types = argument_types
+    __slots__ = ("argument_types",)
+
+    def __init__(self, argument_types=()):
+        self.argument_types = tuple(argument_types)
 
 
 class Method(object):
     """ The declaration of a Java method.
     """
-    def __init__(self, name, argument_types=[], return_type=None):
+    __slots__ = ("name", "argument_types", "return_type")
+
+    def __init__(self, name, argument_types=(), return_type=None):
         self.name = name
-        self.argument_types = argument_types
+        self.argument_types = tuple(argument_types)
         self.return_type = return_type
 
 
@@ -51,38 +165,409 @@ class ClassOrInterface(Type):
     distinction makes no difference to us here: we are only checking types, not
     compiling or executing code, so none of the methods have implementations.)
     """
+    __slots__ = ("constructor", "_methods", "_method_table", "_method_table_version",
+                 "_overloads_by_arity", "_resolutions")
+
     def __init__(self, name, direct_supertypes=[], constructor=Constructor([]), methods=[]):
         super().__init__(name, direct_supertypes)
-        self.name = name
         self.constructor = constructor
-        self.methods = {method.name: method for method in methods}
+        self._methods = {}  # name → tuple of overloads
+        for method in methods:
+            self._declare(method)
+        self._method_table = None
+        self._method_table_version = None
         self.is_instantiable = True
 
-    def method_named(self, name):
-        """ Returns the Method with the given name, which may come from a supertype.
+    @property
+    def methods(self):
+        """ The methods declared directly on this type, as a read-only mapping from name to the
+        tuple of that name’s overloads.
+
+        Use `add_method()` or assign new methods (a list of Methods, or a mapping like this one)
+        to change them, so that cached method tables are invalidated.
+        """
+        return MappingProxyType(self._methods)
+
+    @methods.setter
+    def methods(self, methods):
+        self._methods = {}
+        for method in _each_method(methods):
+            self._declare(method)
+        hierarchy_changed()
+
+    def add_method(self, method):
+        """ Declares a new method on this type, replacing any existing method with the same name
+        and argument types.
+        """
+        self._declare(method)
+        hierarchy_changed()
+
+    def _declare(self, method):
+        overloads = self._methods.get(method.name, ())
+        for i, existing in enumerate(overloads):
+            if existing.argument_types == method.argument_types:
+                self._methods[method.name] = overloads[:i] + (method,) + overloads[i + 1:]
+                return
+        self._methods[method.name] = overloads + (method,)
+
+    def _declared_methods(self):
+        """ Every method declared directly on this type, overloads included.
         """
+        return [method for overloads in self.methods.values() for method in overloads]
+
+    def method_table(self):
+        """ Returns every method available on this type, declared or inherited, as a dict from
+        name to the tuple of that name’s overloads.
+
+        The table is flattened once per hierarchy version, so a lookup is a single dict probe
+        however deep the hierarchy is. A declared method overrides an inherited one with the same
+        argument types, and earlier supertypes win over later ones. Declared overloads come first.
+        Stale supertype tables are rebuilt first, without recursion, as for ancestors().
+        """
+        table = self._current_method_table()
+        if table is None:
+            table = _build_method_tables(self)
+        return table
+
+    def _current_method_table(self):
+        """ The cached method table, or None if it is out of date.
+        """
+        return self._method_table if self._method_table_version == _hierarchy.version else None
+
+    def _flatten_methods(self):
+        """ Builds the method table, given up-to-date tables for all supertypes.
+        """
+        table = {}
+        for supertype in reversed(self.direct_supertypes):
+            if isinstance(supertype, ClassOrInterface):
+                for name, overloads in supertype._current_method_table().items():
+                    table[name] = _merge_overloads(overloads, table.get(name))
+        for name, overloads in self.methods.items():
+            table[name] = _merge_overloads(overloads, table.get(name))
+        self._method_table = table
+        self._overloads_by_arity = {}
+        self._resolutions = {}
+        self._method_table_version = _hierarchy.version
+
+    def overloads(self, name, arity=None):
+        """ Returns the methods with the given name (and number of arguments, if given) available
+        on this type, which may come from supertypes (tuple of Methods).
+        """
+        overloads = self.method_table().get(name, ())
+        if arity is None:
+            return overloads
+        key = (name, arity)
         try:
-            return self.methods[name]
+            return self._overloads_by_arity[key]
         except KeyError:
-            for supertype in self.direct_supertypes:
-                try:
-                    return supertype.method_named(name)
-                except NoSuchMethod:
-                    pass
+            bucket = self._overloads_by_arity[key] = tuple(
+                method for method in overloads if len(method.argument_types) == arity)
+            return bucket
+
+    def find_method(self, name, argument_types=None):
+        """ Returns the Method with the given name, which may come from a supertype, or None if
+        there is no such method. An overloaded name needs the `argument_types` of the call, and
+        then picks the overload as resolve_method() does; without them, it raises NoSuchMethod.
+        """
+        if argument_types is not None:
+            return self.resolve_method(name, argument_types)
+        overloads = self.method_table().get(name)
+        if not overloads:
+            return None
+        if len(overloads) > 1:
+            raise NoSuchMethod("{0} has {1} methods named {2}; pass argument types to pick one".format(
+                self.name, len(overloads), name))
+        return overloads[0]
+
+    def method_named(self, name, argument_types=None):
+        """ Returns the Method with the given name, which may come from a supertype. See
+        find_method() for overloaded names.
+        """
+        method = self.find_method(name, argument_types)
+        if method is None:
             raise NoSuchMethod("{0} has no method named {1}".format(self.name, name))
+        return method
+
+    def applicable_methods(self, name, argument_types):
+        """ Returns the overloads of `name` that accept arguments of the given types.
+        """
+        return tuple(
+            method
+            for method in self.overloads(name, len(argument_types))
+            if all(actual.is_subtype_of(expected)
+                for actual, expected in zip(argument_types, method.argument_types)))
+
+    def resolve_method(self, name, argument_types):
+        """
+        Picks the overload of `name` that a call with arguments of the given types invokes, using
+        Java’s rule: the most specific of the applicable methods, i.e. the one whose argument
+        types are all subtypes of every other applicable method’s. Returns None if no overload is
+        applicable or none is most specific.
+
+        Only overloads with a matching number of arguments are considered, and results are cached
+        per (name, argument types) until the hierarchy changes.
+        """
+        self.method_table()
+        key = (name, tuple(argument_types))
+        try:
+            return self._resolutions[key]
+        except KeyError:
+            pass
+        applicable = self.applicable_methods(name, argument_types)
+        most_specific = [
+            method for method in applicable
+            if all(_is_at_least_as_specific(method, other) for other in applicable)]
+        method = most_specific[0] if len(most_specific) == 1 else None
+        self._resolutions[key] = method
+        return method
+
+
+def _each_method(methods):
+    """ The Methods in a list of Methods, or in a mapping from name to a Method or to a tuple of
+    overloads.
+    """
+    if not hasattr(methods, "values"):
+        return methods
+    return [method
+        for overloads in methods.values()
+        for method in ((overloads,) if isinstance(overloads, Method) else overloads)]
+
+
+def _build_method_tables(t):
+    """ Flattens the method table of `t` and of each of its class supertypes whose table is out of
+    date, depth first with an explicit stack, as _build_ancestors() does for closures.
+    """
+    t.ancestors()  # rejects cycles
+    path, supertypes = [t], [iter(t.direct_supertypes)]
+    while supertypes:
+        for supertype in supertypes[-1]:
+            if isinstance(supertype, ClassOrInterface) and supertype._current_method_table() is None:
+                path.append(supertype)
+                supertypes.append(iter(supertype.direct_supertypes))
+                break
+        else:
+            supertypes.pop()
+            path.pop()._flatten_methods()
+    return t._method_table
+
+
+def _merge_overloads(preferred, others):
+    """ Combines two tuples of overloads of one name, dropping those in `others` that have the same
+    argument types as one in `preferred`. Returns `preferred` itself when there is nothing to add,
+    so that method tables share tuples with their supertypes’ tables.
+    """
+    if not others:
+        return preferred
+    signatures = {method.argument_types for method in preferred}
+    extra = tuple(method for method in others if method.argument_types not in signatures)
+    return preferred + extra if extra else preferred
+
+
+class _JoinCache(object):
+    """ Least upper bounds by pair of types, and intersection types by set of supertypes, for one
+    hierarchy version.
+    """
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.results = {}
+        self.intersections = {}
+        self.version = _hierarchy.version
+
+
+def _join_of_ancestors(common):
+    """ The least upper bound of two unrelated types, given their common ancestors.
+    """
+    # A proper subtype has strictly more ancestors than its supertypes, so visiting the most
+    # specific types first means every type is seen after everything below it.
+    minimal = []
+    for t in sorted(common, key=lambda t: (-len(t.ancestors()), t.name)):
+        if not any(t in m.ancestors() for m in minimal):
+            minimal.append(t)
+    if not minimal:
+        return None
+    if len(minimal) == 1:
+        return minimal[0]
+    return _intersection_of(minimal)
+
+
+def _intersection_of(components):
+    """ The shared IntersectionType of the given types, created on first use in each hierarchy
+    version.
+    """
+    if _joins.version != _hierarchy.version:
+        _joins.clear()
+    key = frozenset(components)
+    intersection = _joins.intersections.get(key)
+    if intersection is None:
+        intersection = _joins.intersections[key] = IntersectionType(components)
+    return intersection
+
+
+def _is_at_least_as_specific(method, other):
+    return all(mine.is_subtype_of(theirs)
+        for mine, theirs in zip(method.argument_types, other.argument_types))
+
+
+_joins = _JoinCache()
+
+
+class LazyClassOrInterface(ClassOrInterface):
+    """
+    A ClassOrInterface whose supertypes, constructor and methods come from a backing source, and
+    are loaded only when something first needs them. Use this for large class libraries of which
+    any one run touches only a few types: memory and load time then track the types actually used.
+
+    The source identifies each type by a `key` of its choosing, and must provide two methods:
+
+    - `members(key)` returns a `(direct_supertypes, constructor, methods)` tuple, and
+    - `ancestors(key)` returns the type’s precomputed supertype closure (as ancestors() would),
+      or None if it has none. A precomputed closure lets subtype checks skip loading members
+      altogether, as long as the hierarchy has not changed since this type was created.
+    """
+    __slots__ = ("_source", "_key", "_is_loaded")
+
+    def __init__(self, name, source, key):
+        self._is_loaded = True  # nothing to load while the base class initializes
+        super().__init__(name)
+        self._source = source
+        self._key = key
+        self._is_loaded = False
+        self._ancestors_version = _hierarchy.version
+
+    def _materialize(self):
+        if not self._is_loaded:
+            self._is_loaded = True
+            direct_supertypes, constructor, methods = self._source.members(self._key)
+            self._direct_supertypes = tuple(direct_supertypes)
+            ClassOrInterface.constructor.__set__(self, constructor)
+            self._methods = {}
+            for method in methods:
+                self._declare(method)
+
+    @property
+    def is_loaded(self):
+        """ True once the members have been loaded from the backing source.
+        """
+        return self._is_loaded
+
+    @property
+    def direct_supertypes(self):
+        self._materialize()
+        return self._direct_supertypes
+
+    @direct_supertypes.setter
+    def direct_supertypes(self, supertypes):
+        self._materialize()
+        Type.direct_supertypes.fset(self, supertypes)
+
+    @property
+    def constructor(self):
+        self._materialize()
+        return ClassOrInterface.constructor.__get__(self)
+
+    @constructor.setter
+    def constructor(self, constructor):
+        self._materialize()
+        ClassOrInterface.constructor.__set__(self, constructor)
+
+    @property
+    def methods(self):
+        self._materialize()
+        return ClassOrInterface.methods.fget(self)
+
+    @methods.setter
+    def methods(self, methods):
+        self._materialize()
+        ClassOrInterface.methods.fset(self, methods)
+
+    def add_method(self, method):
+        self._materialize()
+        super().add_method(method)
+
+    def method_table(self):
+        self._materialize()
+        return super().method_table()
+
+    def _current_ancestors(self):
+        if self._ancestors is None and self._ancestors_version == _hierarchy.version:
+            ancestors = self._source.ancestors(self._key)
+            if ancestors is None:
+                self._ancestors_version = None
+            else:
+                self._ancestors = frozenset(ancestors)
+        return super()._current_ancestors()
+
+    def __reduce_ex__(self, protocol):
+        # The backing source may not be picklable, so pickle as a fully loaded ClassOrInterface.
+        self._materialize()
+        return (ClassOrInterface, (self.name,), (None, {
+            "_direct_supertypes": self._direct_supertypes,
+            "constructor": self.constructor,
+            "_methods": self._methods,
+        }))
+
+
+class IntersectionType(ClassOrInterface):
+    """
+    The type `A & B & ...` of a value known to be of all of the given types at once, which is how
+    Java types e.g. `cond ? rectangle : group` when both implement the same interfaces. It has the
+    methods of all its components, and cannot be instantiated.
+    """
+    __slots__ = ()
+
+    def __init__(self, components):
+        super().__init__(" & ".join(t.name for t in components), direct_supertypes=components)
+        self.is_instantiable = False
+
+    @property
+    def components(self):
+        """ The types this type intersects (tuple of Types).
+        """
+        return self.direct_supertypes
 
 
 class NullType(Type):
     """ The type of the value `null` in Java.
     """
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("null")
 
+    def is_subtype_of(self, other):
+        """ `null` can stand in for any class or interface, but not for a primitive.
+        """
+        return other is self or isinstance(other, ClassOrInterface)
+
+
+class ErrorType(Type):
+    """ The type of an expression that failed to check. It stands in for every type, so that one
+    error does not cause more errors in the expressions around it.
+    """
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__("<error>")
+
+    def is_subtype_of(self, other):
+        return True
+
 
 class NoSuchMethod(Exception):
     pass
 
 
+class CyclicHierarchy(Exception):
+    """ Indicates types that are their own supertypes, directly or indirectly.
+    """
+    def __init__(self, cycle):
+        super().__init__("Cyclic inheritance: {0}".format(
+            " extends ".join(t.name for t in cycle + cycle[:1])))
+        self.cycle = cycle  #: The types on the cycle, each a direct subtype of the next (list of Types)
+
+
 # Our simple language’s built-in types
 
 Type.void    = Type("void")
@@ -93,8 +578,39 @@ Type.double  = Type("double")
 
 Type.null    = NullType()
 
+Type.error   = ErrorType()
+
 Type.object = ClassOrInterface("Object",
     methods=[
-        Method("equals", argument_types=[object], return_type=Type.boolean),
         Method("hashCode", return_type=Type.int),
     ])
+Type.object.add_method(Method("equals", argument_types=[Type.object], return_type=Type.boolean))
+
+
+def _builtin_types():
+    """ The built-in types above, by the name of the Type attribute that holds them.
+    """
+    return {name: value for name, value in vars(Type).items() if isinstance(value, Type)}
+
+
+def _reachable_types(roots, builtins=True):
+    """ Every type mentioned by the given types’ supertypes, constructors and methods, transitively,
+    starting with the built-ins (unless `builtins` is false).
+    """
+    found = list(_builtin_types().values()) if builtins else []
+    seen = set(found)
+    pending = list(roots)
+    while pending:
+        t = pending.pop()
+        if t in seen:
+            continue
+        seen.add(t)
+        found.append(t)
+        pending.extend(t.direct_supertypes)
+        if isinstance(t, ClassOrInterface):
+            pending.extend(t.constructor.argument_types)
+            for method in t._declared_methods():
+                pending.extend(method.argument_types)
+                if method.return_type is not None:
+                    pending.append(method.return_type)
+    return found
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+from .types import Type, ClassOrInterface, Method, _reachable_types
+from .registry import TypeRegistry
+from .builder import topological_order, build_indexes
+from .generics import GenericClassOrInterface, ParameterizedType
+from .batch import _check_one
+from concurrent.futures import ThreadPoolExecutor
+import copyreg
+
+
+__all__ = ["TypeUniverse", "check_in_threads", "FrozenTypeError"]
+
+
+class TypeUniverse(TypeRegistry):
+    """
+    A self-contained hierarchy: a TypeRegistry with its own `Object` type, so that changes to one
+    universe’s types never show in another’s. The primitive types, `null` and the error type have
+    no members to change, so every universe shares them with `Type`, as do the expressions that
+    use them (such as NullLiteral) and the parser. They are never frozen.
+
+    Once a universe is complete, freeze() it to share it between threads.
+    """
+    def __init__(self):
+        super().__init__(builtins=False)
+        self.void = Type.void
+        self.boolean = Type.boolean
+        self.int = Type.int
+        self.double = Type.double
+        self.null = Type.null
+        self.error = Type.error
+        self.object = ClassOrInterface("Object", methods=[Method("hashCode", return_type=Type.int)])
+        self.object.add_method(Method("equals", argument_types=[self.object], return_type=Type.boolean))
+        self.is_frozen = False
+        for t in [self.void, self.boolean, self.int, self.double, self.null]:
+            self.register(t)
+        self.register(self.object, "java.lang.Object", aliases=["Object"])
+
+    def register(self, t, qualified_name=None, aliases=()):
+        if self.is_frozen:
+            raise FrozenTypeError("Cannot register {0} in a frozen universe".format(t.name))
+        return super().register(t, qualified_name, aliases)
+
+    def freeze(self):
+        """
+        Builds the supertype closure and method table of every type reachable from this universe,
+        then makes the universe’s own types immutable: changing their supertypes, constructor,
+        methods or instantiability raises FrozenTypeError, and so does registering new types.
+
+        The universe owns the types registered in it, the parameterizations of its generic types,
+        and their type parameters. Other types it reaches must be shared built-ins or already
+        frozen, or else this raises ValueError and freezes nothing: e.g. a type that extends the
+        global `Type.object` instead of the universe’s `object`.
+
+        Frozen types keep their indexes for good, whatever happens to other hierarchies, so threads
+        can check expressions against them without locks. Lazy types are loaded in full, and Method
+        and Constructor objects must not be modified after this. Returns the universe.
+        """
+        if not self.is_frozen:
+            self.link()
+            order = topological_order(_reachable_types(list(self), builtins=False))
+            registered = set(self)
+            type_parameters = {p
+                for t in registered if isinstance(t, GenericClassOrInterface)
+                for p in t.type_parameters}
+            own = []
+            for t in order:
+                if t in _shared_types or isinstance(t, _FrozenTypeMixin):
+                    continue
+                if not (t in registered or t in type_parameters
+                        or isinstance(t, ParameterizedType) and t.generic in registered):
+                    raise ValueError("Type {0} is reachable from this universe but not part of it".format(t.name))
+                own.append(t)
+            build_indexes(order, ordered=True)
+            for t in own:
+                t.__class__ = _frozen_class(type(t))
+            self.is_frozen = True
+        return self
+
+
+def check_in_threads(expressions, workers=None):
+    """
+    Checks many independent expressions on a pool of threads, returning a CheckResult for each one
+    in input order. The expressions may use types from any number of universes, which should all
+    be frozen first.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_check_one, expressions))
+
+
+_shared_types = frozenset([Type.void, Type.boolean, Type.int, Type.double, Type.null, Type.error])
+
+
+class FrozenTypeError(Exception):
+    """ Indicates an attempt to change a frozen type or universe.
+    """
+    pass
+
+
+class _FrozenTypeMixin(object):
+    """ Overrides for frozen types: cached indexes are returned as they are, and setters raise.
+    """
+    __slots__ = ()
+
+    @property
+    def direct_supertypes(self):
+        return self._direct_supertypes
+
+    @direct_supertypes.setter
+    def direct_supertypes(self, supertypes):
+        raise FrozenTypeError("Cannot change the supertypes of frozen type {0}".format(self.name))
+
+    @property
+    def is_instantiable(self):
+        return Type.is_instantiable.__get__(self)
+
+    @is_instantiable.setter
+    def is_instantiable(self, is_instantiable):
+        raise FrozenTypeError("Cannot change frozen type {0}".format(self.name))
+
+    def ancestors(self):
+        return self._ancestors
+
+    def _current_ancestors(self):
+        return self._ancestors
+
+    def __reduce_ex__(self, protocol):
+        # Unpickle as the original, unfrozen class: the copy belongs to no universe.
+        reduced = super().__reduce_ex__(protocol)
+        if reduced[0] is copyreg.__newobj__:
+            reduced = (_new_unfrozen, (type(self).__bases__[1],) + reduced[1][1:]) + reduced[2:]
+        return reduced
+
+
+class _FrozenClassOrInterfaceMixin(_FrozenTypeMixin):
+    __slots__ = ()
+
+    @property
+    def constructor(self):
+        return ClassOrInterface.constructor.__get__(self)
+
+    @constructor.setter
+    def constructor(self, constructor):
+        raise FrozenTypeError("Cannot change the constructor of frozen type {0}".format(self.name))
+
+    @property
+    def methods(self):
+        return ClassOrInterface.methods.fget(self)
+
+    @methods.setter
+    def methods(self, methods):
+        raise FrozenTypeError("Cannot change the methods of frozen type {0}".format(self.name))
+
+    def add_method(self, method):
+        raise FrozenTypeError("Cannot change the methods of frozen type {0}".format(self.name))
+
+    def method_table(self):
+        return self._method_table
+
+    def _current_method_table(self):
+        return self._method_table
+
+
+def _new_unfrozen(cls, *args):
+    return cls.__new__(cls, *args)
+
+
+_frozen_classes = {}
+
+
+def _frozen_class(cls):
+    """ The frozen counterpart of a type class, with the same instance layout so that an existing
+    type can switch to it.
+    """
+    frozen = _frozen_classes.get(cls)
+    if frozen is None:
+        mixin = _FrozenClassOrInterfaceMixin if issubclass(cls, ClassOrInterface) else _FrozenTypeMixin
+        frozen = type("_Frozen" + cls.__name__, (mixin, cls), {"__slots__": (), "__module__": __name__})
+        _frozen_classes[cls] = frozen
+    return frozen
@@ -91,7 +91,7 @@ class Graphics:
 
     color = ClassOrInterface("Color",
         direct_supertypes=[paint],
-        constructor=Constructor([int, int, int])
+        constructor=Constructor([Type.int, Type.int, Type.int])
     )
 
     fill_colorable = ClassOrInterface("FillColorable",
@@ -128,3 +128,37 @@ class Graphics:
             Method("getSize", return_type=size),
         ]
     )
+
+
+"""
+A self-referential type for building arbitrarily deep expressions:
+
+    class Node {
+        Node next();
+        Node wrap(Node other);
+        Node(Node parent);
+    }
+"""
+
+node = ClassOrInterface("Node", direct_supertypes=[Type.object])
+node.constructor = Constructor([node])
+node.add_method(Method("next", return_type=node))
+node.add_method(Method("wrap", return_type=node, argument_types=[node]))
+
+
+def method_chain(depth):
+    """ n.next().next()...next(), with `depth` calls.
+    """
+    expr = Variable("n", node)
+    for _ in range(depth):
+        expr = MethodCall(expr, "next")
+    return expr
+
+
+def constructor_chain(depth):
+    """ new Node(new Node(...new Node(n)...)), with `depth` constructor calls.
+    """
+    expr = Variable("n", node)
+    for _ in range(depth):
+        expr = ConstructorCall(node, expr)
+    return expr
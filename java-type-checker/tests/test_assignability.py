@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+TYPES = [
+    Type.int, Type.double, Type.boolean, Type.null, Type.object,
+    Graphics.point, Graphics.paint, Graphics.color,
+    Graphics.graphics_object, Graphics.rectangle, Graphics.fill_colorable,
+]
+
+
+@unittest.skipUnless(numpy, "requires NumPy")
+class TestAssignabilityMatrix(unittest.TestCase):
+
+    def expected(self, sources, targets):
+        return [[s.is_subtype_of(t) for t in targets] for s in sources]
+
+    def test_matches_is_subtype_of(self):
+        self.assertEqual(self.expected(TYPES, TYPES), assignability_matrix(TYPES).tolist())
+
+    def test_separate_targets(self):
+        targets = [Type.object, Graphics.paint, Type.double]
+        self.assertEqual(
+            self.expected(TYPES, targets),
+            assignability_matrix(TYPES, targets).tolist())
+
+    def test_packed_matches_dense(self):
+        packed = AssignabilityMatrix(TYPES, packed=True)
+        self.assertLess(packed.matrix.nbytes, len(TYPES) ** 2)
+        self.assertEqual(self.expected(TYPES, TYPES), packed.dense.tolist())
+
+    def test_vectorized_queries(self):
+        for packed in (False, True):
+            m = AssignabilityMatrix(TYPES, packed=packed)
+            sources = m.ids([Graphics.color, Type.null, Type.null, Type.int])
+            targets = m.ids([Graphics.paint, Graphics.rectangle, Type.int, Type.double], targets=True)
+            self.assertEqual([True, True, False, False], m.query(sources, targets).tolist())
+
+    def test_broadcasts_one_target_over_many_sources(self):
+        m = AssignabilityMatrix(TYPES)
+        column = m.query(numpy.arange(len(TYPES)), m.ids([Type.object], targets=True)[0])
+        self.assertEqual([t.is_subtype_of(Type.object) for t in TYPES], column.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+import unittest
+
+
+def corpus():
+    window = Variable("window", Graphics.window)
+    return [
+        MethodCall(window, "getSize"),
+        MethodCall(window, "getFunky"),
+        MethodCall(MethodCall(window, "getSize"), "getWidth"),
+        ConstructorCall(Graphics.rectangle, NullLiteral(), NullLiteral()),
+        ConstructorCall(Graphics.rectangle, Variable("p", Graphics.point)),
+        NullLiteral(),
+    ] * 5
+
+
+class TestBatch(unittest.TestCase):
+
+    def assert_results(self, results):
+        self.assertEqual(30, len(results))
+        self.assertEqual(
+            [Graphics.size, None, Type.double, Graphics.rectangle, None, Type.null] * 5,
+            [r.static_type for r in results])
+        self.assertIsInstance(results[1].error, NoSuchMethod)
+        self.assertEqual("Window has no method named getFunky", str(results[1].error))
+        self.assertIsInstance(results[4].error, JavaTypeError)
+        self.assertIsNone(results[0].error)
+
+    def test_serial(self):
+        self.assert_results(check_all(corpus(), workers=1))
+
+    def test_parallel(self):
+        self.assert_results(
+            check_all(corpus(), types=[Graphics.window, Graphics.rectangle], workers=2, chunk_size=4))
+
+    def test_parallel_without_types(self):
+        self.assert_results(check_all(iter(corpus()), workers=2, chunk_size=4))
+
+    def test_parallel_intersection(self):
+        sprite = ClassOrInterface("Sprite",
+            direct_supertypes=[Graphics.stroke_colorable, Graphics.fill_colorable])
+        expression = ConditionalExpression(
+            Variable("flag", Type.boolean),
+            Variable("rect", Graphics.rectangle),
+            Variable("sprite", sprite))
+        results = check_all([expression] * 3, types=[Graphics.rectangle, sprite], workers=2)
+        self.assertEqual([None] * 3, [r.error for r in results])
+        self.assertEqual({Graphics.rectangle.least_upper_bound(sprite)}, {r.static_type for r in results})
+        self.assertIsInstance(results[0].static_type, IntersectionType)
+
+    def test_rejects_types_outside_hierarchy(self):
+        with self.assertRaisesRegex(ValueError, "Window is not reachable"):
+            check_all(corpus(), types=[Graphics.point], workers=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+from unittest import mock
+import unittest
+
+
+class TestHierarchyBuilder(unittest.TestCase):
+
+    def test_declarations_in_any_order(self):
+        builder = HierarchyBuilder()
+        builder.declare("Rectangle",
+            supertypes=["GraphicsObject"],
+            constructor=["Point", "Point"],
+            methods=[Method("getCorner", return_type="Point")])
+        builder.declare("GraphicsObject",
+            supertypes=["Object"],
+            methods=[Method("moveTo", argument_types=["double", "double"], return_type=Type.void)])
+        builder.declare("Point", supertypes=["Object"], constructor=[Type.double, Type.double])
+        builder.declare("Shape", supertypes=["GraphicsObject"], instantiable=False)
+        registry = builder.build()
+
+        rectangle, point = registry["Rectangle"], registry["Point"]
+        self.assertEqual([registry["GraphicsObject"]], list(rectangle.direct_supertypes))
+        self.assertEqual((point, point), rectangle.constructor.argument_types)
+        self.assertIs(point, rectangle.method_named("getCorner").return_type)
+        self.assertEqual(
+            (Type.double, Type.double), rectangle.method_named("moveTo").argument_types)
+        self.assertTrue(rectangle.is_subtype_of(Type.object))
+        self.assertFalse(registry["Shape"].is_instantiable)
+
+    def test_order_puts_supertypes_first(self):
+        builder = HierarchyBuilder()
+        builder.declare("C", supertypes=["B", "A"])
+        builder.declare("B", supertypes=["A"])
+        builder.declare("A")
+        builder.build()
+        self.assertEqual(["A", "B", "C"], [t.name for t in builder.order])
+
+    def test_existing_types(self):
+        registry = TypeRegistry()
+        registry.register(Graphics.graphics_object)
+        builder = HierarchyBuilder(registry)
+        builder.declare("Circle", supertypes=["GraphicsObject"])
+        builder.build()
+        self.assertTrue(registry["Circle"].is_subtype_of(Graphics.graphics_object))
+
+    def test_cycle(self):
+        builder = HierarchyBuilder()
+        builder.declare("A", supertypes=["Object", "C"])
+        builder.declare("B", supertypes=["A"])
+        builder.declare("C", supertypes=["B"])
+        builder.declare("D", supertypes=["C"])
+        with self.assertRaises(CyclicHierarchy) as context:
+            builder.build()
+        self.assertEqual({"A", "B", "C"}, {t.name for t in context.exception.cycle})
+        self.assertRegex(str(context.exception), "^Cyclic inheritance: (\\w) extends \\w extends \\w extends \\1$")
+        self.assertNotIn("A", builder.registry)
+
+    def test_self_inheritance(self):
+        builder = HierarchyBuilder()
+        builder.declare("A", supertypes=["A"])
+        with self.assertRaisesRegex(CyclicHierarchy, "Cyclic inheritance: A extends A"):
+            builder.build()
+
+    def test_unknown_name(self):
+        builder = HierarchyBuilder()
+        builder.declare("A", supertypes=["Missing"])
+        with self.assertRaisesRegex(UnknownType, "No type named Missing"):
+            builder.build()
+
+    def test_unknown_member_type_leaves_methods_unchanged(self):
+        method = Method("m", argument_types=["Object"], return_type="Nope")
+        builder = HierarchyBuilder()
+        builder.declare("A", methods=[method])
+        with self.assertRaisesRegex(UnknownType, "No type named Nope"):
+            builder.build()
+        self.assertEqual(("Object",), method.argument_types)
+        self.assertEqual("Nope", method.return_type)
+        self.assertNotIn("A", builder.registry)
+
+    def test_build_keeps_other_cached_indexes(self):
+        builder = HierarchyBuilder()
+        for i in range(10):
+            builder.declare("T{0}".format(i),
+                supertypes=["Object"], methods=[Method("m", return_type=Type.int)])
+        with mock.patch("java_type_checker.types.hierarchy_changed") as changed:
+            registry = builder.build()
+        changed.assert_not_called()
+        self.assertEqual(Type.int, registry["T9"].method_named("m").return_type)
+        self.assertTrue(registry["T9"].is_subtype_of(Type.object))
+
+    def test_duplicate_declaration(self):
+        builder = HierarchyBuilder()
+        builder.declare("A")
+        with self.assertRaisesRegex(ValueError, "Type A is declared twice"):
+            builder.declare("A")
+        with self.assertRaisesRegex(ValueError, "Type Object is declared twice"):
+            builder.declare("Object")
+
+    def test_very_deep_hierarchy(self):
+        builder = HierarchyBuilder()
+        depth = 2000  # well past the recursion limit
+        for i in range(depth):
+            builder.declare("T{0}".format(i), supertypes=["T{0}".format(i - 1) if i else "Object"],
+                methods=[Method("m{0}".format(i), return_type=Type.int)])
+        registry = builder.build()
+        bottom = registry["T{0}".format(depth - 1)]
+        self.assertTrue(bottom.is_subtype_of(registry["T0"]))
+        self.assertEqual(Type.int, bottom.method_named("m0").return_type)
+
+
+class TestTopologicalOrder(unittest.TestCase):
+
+    def test_includes_supertypes(self):
+        order = topological_order([Graphics.rectangle])
+        self.assertEqual(Type.object, order[0])
+        self.assertEqual(Graphics.rectangle, order[-1])
+        self.assertEqual(5, len(order))
+        for i, t in enumerate(order):
+            for s in t.direct_supertypes:
+                self.assertLess(order.index(s), i)
+
+    def test_cycle_in_existing_types(self):
+        a = ClassOrInterface("A")
+        b = ClassOrInterface("B", direct_supertypes=[a])
+        a.direct_supertypes = [b]
+        try:
+            with self.assertRaises(CyclicHierarchy):
+                topological_order([a])
+        finally:
+            a.direct_supertypes = []
+
+    def test_build_indexes(self):
+        types = [ClassOrInterface("T0")]
+        for i in range(1, 2000):
+            types.append(ClassOrInterface("T{0}".format(i), direct_supertypes=[types[-1]]))
+        build_indexes([types[-1]])
+        self.assertEqual(2000, len(types[-1].ancestors()))
+
+
+if __name__ == '__main__':
+    unittest.main()
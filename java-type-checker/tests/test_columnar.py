@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from java_type_checker import columnar
+from tests.fixtures import Graphics
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+TYPES = [
+    Type.void, Type.int, Type.double, Type.boolean, Type.null, Type.object,
+    Graphics.point, Graphics.paint, Graphics.color, Graphics.graphics_object,
+    Graphics.rectangle, Graphics.graphics_group,
+]
+NAMES = ["getX", "getPosition", "setPosition", "setFillColor", "add", "hashCode", "flip"]
+
+
+def ids(*types):
+    return [TYPES.index(t) for t in types]
+
+
+class TestColumnar(unittest.TestCase):
+
+    CALLS = [
+        # (receiver, method name, argument types, expected error code)
+        (Graphics.point, "getX", [], columnar.OK),
+        (Graphics.rectangle, "getPosition", [], columnar.OK),
+        (Graphics.rectangle, "setFillColor", [Graphics.color], columnar.OK),
+        (Graphics.graphics_group, "add", [Graphics.rectangle], columnar.OK),
+        (Graphics.point, "hashCode", [], columnar.OK),
+        (Graphics.point, "flip", [], columnar.NO_SUCH_METHOD),
+        (Type.int, "getX", [], columnar.NO_METHODS),
+        (Type.null, "getX", [], columnar.NULL_RECEIVER),
+        (Graphics.rectangle, "setPosition", [Type.double], columnar.WRONG_ARGUMENT_COUNT),
+        (Graphics.rectangle, "setFillColor", [Type.int], columnar.WRONG_ARGUMENT_TYPES),
+        (Graphics.rectangle, "setFillColor", [Type.null], columnar.OK),
+    ]
+
+    def columns(self, calls):
+        receivers, names, args, offsets = [], [], [], [0]
+        for receiver, name, arg_types, _ in calls:
+            receivers += ids(receiver)
+            names.append(NAMES.index(name))
+            args += ids(*arg_types)
+            offsets.append(len(args))
+        return receivers, names, args, offsets
+
+    def test_error_codes(self):
+        _, codes = columnar.resolve_calls(TYPES, NAMES, *self.columns(self.CALLS))
+        self.assertEqual([code for *_, code in self.CALLS], list(codes))
+
+    def test_matches_method_call(self):
+        return_ids, codes = columnar.resolve_calls(TYPES, NAMES, *self.columns(self.CALLS))
+        for (receiver, name, arg_types, _), return_id, code in zip(self.CALLS, return_ids, codes):
+            expr = MethodCall(
+                Variable("r", receiver), name, *[Variable("a", t) for t in arg_types])
+            if code == columnar.OK:
+                self.assertEqual(expr.check_types(), TYPES[return_id])
+            else:
+                self.assertEqual(columnar.NO_TYPE, return_id)
+                with self.assertRaises((JavaTypeError, NoSuchMethod)):
+                    expr.check_types()
+
+    def test_ambiguous(self):
+        canvas = ClassOrInterface("Canvas",
+            direct_supertypes=[Type.object],
+            methods=[
+                Method("mix", argument_types=[Graphics.paint, Type.object], return_type=Type.void),
+                Method("mix", argument_types=[Type.object, Graphics.paint], return_type=Type.void),
+            ])
+        types = [canvas, Graphics.color, Type.void]
+        _, codes = columnar.resolve_calls(types, ["mix"], [0], [0], [1, 1], [0, 2])
+        self.assertEqual([columnar.AMBIGUOUS], list(codes))
+
+    def test_return_type_missing_from_types(self):
+        with self.assertRaises(ValueError):
+            columnar.resolve_calls([Graphics.rectangle], ["getPosition"], [0], [0], [], [0, 0])
+
+    def test_method_without_return_type(self):
+        untyped = ClassOrInterface("Untyped", methods=[Method("m")])
+        with self.assertRaisesRegex(ValueError, r"Untyped.m\(\) has no return type"):
+            columnar.resolve_calls([untyped], ["m"], [0], [0], [], [0, 0])
+
+    def test_codes_are_not_exported(self):
+        import java_type_checker
+        self.assertFalse(hasattr(java_type_checker, "NO_TYPE"))
+        self.assertFalse(hasattr(java_type_checker, "OK"))
+
+    def test_empty(self):
+        return_ids, codes = columnar.resolve_calls(TYPES, NAMES, [], [], [], [0])
+        self.assertEqual(([], []), (list(return_ids), list(codes)))
+
+    @unittest.skipUnless(numpy, "requires NumPy")
+    def test_numpy_columns(self):
+        columns = [numpy.array(c, dtype=numpy.int32) for c in self.columns(self.CALLS)]
+        expected = columnar.resolve_calls(TYPES, NAMES, *self.columns(self.CALLS))
+        self.assertEqual(expected, columnar.resolve_calls(TYPES, NAMES, *columns))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+import unittest
+
+
+class TestCompactRepresentation(unittest.TestCase):
+
+    def test_model_objects_have_no_instance_dict(self):
+        for obj in [
+                Type.int,
+                Type.null,
+                Graphics.point,
+                Graphics.point.constructor,
+                Graphics.point.method_named("getX"),
+                Variable("p", Graphics.point),
+                Literal("0", Type.int),
+                NullLiteral(),
+                MethodCall(Variable("p", Graphics.point), "getX"),
+                ConstructorCall(Graphics.point)]:
+            self.assertFalse(hasattr(obj, "__dict__"), type(obj).__name__)
+
+    def test_argument_lists_are_tuples(self):
+        self.assertEqual((Type.double, Type.double), Graphics.point.constructor.argument_types)
+        self.assertEqual((Type.object,), Type.object.method_named("equals").argument_types)
+        call = MethodCall(Variable("p", Graphics.point), "getX", NullLiteral())
+        self.assertIsInstance(call.args, tuple)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+from tests.helpers import TypeTest
+import unittest
+
+
+class TestLeastUpperBound(unittest.TestCase):
+    """
+    Equivalent Java:
+
+        class Sprite implements Colorable, FillColorable { }
+        class Shape extends GraphicsObject implements Colorable, FillColorable { }
+    """
+    def setUp(self):
+        self.sprite = ClassOrInterface("Sprite",
+            direct_supertypes=[Graphics.stroke_colorable, Graphics.fill_colorable])
+        self.shape = ClassOrInterface("Shape",
+            direct_supertypes=[Graphics.graphics_object, Graphics.stroke_colorable, Graphics.fill_colorable])
+
+    def test_subtype_and_supertype(self):
+        self.assertEqual(Graphics.paint, Graphics.color.least_upper_bound(Graphics.paint))
+        self.assertEqual(Graphics.paint, Graphics.paint.least_upper_bound(Graphics.color))
+        self.assertEqual(Type.int, Type.int.least_upper_bound(Type.int))
+
+    def test_single_common_supertype(self):
+        self.assertEqual(Graphics.graphics_object,
+            Graphics.rectangle.least_upper_bound(Graphics.graphics_group))
+        self.assertEqual(Type.object, Graphics.point.least_upper_bound(Graphics.color))
+
+    def test_intersection(self):
+        lub = Graphics.rectangle.least_upper_bound(self.sprite)
+        self.assertIsInstance(lub, IntersectionType)
+        self.assertEqual("Colorable & FillColorable", lub.name)
+        self.assertEqual(
+            {Graphics.stroke_colorable, Graphics.fill_colorable}, set(lub.components))
+        self.assertFalse(lub.is_instantiable)
+        self.assertTrue(lub.is_subtype_of(Graphics.fill_colorable))
+        self.assertIsNotNone(lub.find_method("getFillColor"))
+        self.assertIsNotNone(lub.find_method("getStrokeColor"))
+
+    def test_intersection_ignores_implied_supertypes(self):
+        lub = Graphics.rectangle.least_upper_bound(self.shape)
+        self.assertEqual("Colorable & FillColorable & GraphicsObject", lub.name)
+
+    def test_intersections_are_shared(self):
+        self.assertIs(
+            Graphics.rectangle.least_upper_bound(self.sprite),
+            self.shape.least_upper_bound(self.sprite))
+
+    def test_join_with_intersection(self):
+        lub = Graphics.rectangle.least_upper_bound(self.sprite)
+        self.assertIs(lub, Graphics.rectangle.least_upper_bound(lub))
+
+    def test_null(self):
+        self.assertEqual(Graphics.point, Type.null.least_upper_bound(Graphics.point))
+        self.assertEqual(Graphics.point, Graphics.point.least_upper_bound(Type.null))
+        self.assertIsNone(Type.null.least_upper_bound(Type.int))
+
+    def test_unrelated_primitives(self):
+        self.assertIsNone(Type.int.least_upper_bound(Type.boolean))
+
+    def test_cached_until_hierarchy_changes(self):
+        first = Graphics.rectangle.least_upper_bound(self.sprite)
+        self.assertIs(first, Graphics.rectangle.least_upper_bound(self.sprite))
+        self.sprite.direct_supertypes = [Graphics.graphics_object]
+        self.assertEqual(Graphics.graphics_object, Graphics.rectangle.least_upper_bound(self.sprite))
+
+
+class TestConditionalExpression(TypeTest):
+
+    def setUp(self):
+        self.flag = Variable("flag", Type.boolean)
+        self.rect = Variable("rect", Graphics.rectangle)
+        self.group = Variable("group", Graphics.graphics_group)
+
+    def test_same_types(self):
+        self.assertEqual(Type.int, ConditionalExpression(
+            self.flag, Literal("1", Type.int), Literal("2", Type.int)).check_types())
+
+    def test_numeric_promotion(self):
+        self.assertEqual(Type.double, ConditionalExpression(
+            self.flag, Literal("1", Type.int), Literal("2.0", Type.double)).check_types())
+
+    def test_class_types(self):
+        expr = ConditionalExpression(self.flag, self.rect, self.group)
+        self.assertEqual(Graphics.graphics_object, expr.check_types())
+        self.assertEqual(Graphics.graphics_object, expr.static_type())
+        self.assertEqual(Graphics.point, MethodCall(expr, "getPosition").check_types())
+
+    def test_null_branch(self):
+        self.assertEqual(Graphics.rectangle,
+            ConditionalExpression(self.flag, NullLiteral(), self.rect).check_types())
+
+    def test_condition_must_be_boolean(self):
+        self.assertCompileError(
+            JavaTypeError,
+            "Condition of conditional expression must be boolean, but got int",
+            ConditionalExpression(Literal("1", Type.int), self.rect, self.rect))
+
+    def test_incompatible_branches(self):
+        self.assertCompileError(
+            JavaTypeError,
+            "Incompatible types in conditional expression: boolean and Rectangle",
+            ConditionalExpression(self.flag, self.flag, self.rect))
+
+    def test_void_branch(self):
+        self.assertCompileError(
+            JavaTypeError,
+            "Conditional expression cannot have a void branch",
+            ConditionalExpression(self.flag,
+                MethodCall(self.rect, "setPosition", Literal("0.0", Type.double), Literal("0.0", Type.double)),
+                MethodCall(self.rect, "setPosition", Literal("0.0", Type.double), Literal("0.0", Type.double))))
+
+    def test_checks_branches(self):
+        self.assertCompileError(
+            NoSuchMethod,
+            "Rectangle has no method named flip",
+            ConditionalExpression(self.flag, MethodCall(self.rect, "flip"), self.rect))
+
+    def test_error_recovery(self):
+        diagnostics = collect_diagnostics(
+            ConditionalExpression(self.flag, MethodCall(self.rect, "flip"), self.rect))
+        self.assertEqual(["Rectangle has no method named flip"], [d.message for d in diagnostics])
+
+    def test_deeply_nested(self):
+        expr = self.rect
+        for _ in range(5000):
+            expr = ConditionalExpression(self.flag, expr, self.group)
+        self.assertEqual(Graphics.graphics_object, check_iteratively(expr))
+
+    def test_interned(self):
+        interner = ExpressionInterner()
+        flag = interner.variable("flag", Type.boolean)
+        rect = interner.variable("rect", Graphics.rectangle)
+        expr = interner.conditional(flag, rect, interner.null())
+        self.assertIs(expr, interner.conditional(flag, rect, interner.null()))
+        self.assertEqual(Graphics.rectangle, interner.check_types(expr))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from java_type_checker.daemon import CheckDaemon
+from tests.fixtures import Graphics
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+
+def graphics_registry():
+    registry = TypeRegistry()
+    for t in [Graphics.point, Graphics.size, Graphics.graphics_object, Graphics.paint,
+              Graphics.color, Graphics.rectangle]:
+        registry.register(t)
+    return registry
+
+
+class TestCheckDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.daemon = CheckDaemon({"graphics": graphics_registry()})
+
+    def check(self, *requests):
+        async def run():
+            try:
+                return await asyncio.gather(*[self.daemon.check(r) for r in requests])
+            finally:
+                await self.daemon.close()
+        return asyncio.run(run())
+
+    def test_static_types(self):
+        response, = self.check(
+            {"id": 7, "source": "Rectangle r; r.getPosition(); r.getPosition().getX();"})
+        self.assertEqual({"id": 7, "results": [
+            {"type": "Point", "diagnostics": []},
+            {"type": "double", "diagnostics": []},
+        ]}, response)
+
+    def test_diagnostics(self):
+        response, = self.check({"id": 1, "source": "Rectangle r; r.setFillColor(r.flip());"})
+        self.assertEqual({"id": 1, "results": [{"type": None, "diagnostics": [
+            {"path": [1], "message": "Rectangle has no method named flip"},
+        ]}]}, response)
+
+    def test_request_errors(self):
+        responses = self.check(
+            {"id": 1, "source": "q.getX();"},
+            {"id": 2, "hierarchy": "other", "source": "1;"},
+            {"id": 3})
+        self.assertEqual([
+            {"id": 1, "error": "line 1: Undeclared variable q"},
+            {"id": 2, "error": "No hierarchy named other"},
+            {"id": 3, "error": "Request has no source"},
+        ], responses)
+
+    def test_malformed_request_does_not_stop_the_daemon(self):
+        async def run():
+            try:
+                bad = await self.daemon.check(["not", "an", "object"])
+                good = await self.daemon.check({"id": 2, "source": "Point p; p.getX();"})
+                return bad, good
+            finally:
+                await self.daemon.close()
+        bad, good = asyncio.run(run())
+        self.assertEqual({"id": None, "error": "Invalid request: A request must be a JSON object"}, bad)
+        self.assertEqual({"id": 2, "results": [{"type": "double", "diagnostics": []}]}, good)
+
+    def test_deeply_nested_source(self):
+        depth = 2000
+        source = "Point p; " + "(true ? " * depth + "p" + " : p)" * depth + ".getX();"
+        response, = self.check({"id": 1, "source": source})
+        self.assertEqual({"id": 1, "results": [{"type": "double", "diagnostics": []}]}, response)
+
+    def test_batches_are_checked_off_the_event_loop(self):
+        threads = set()
+        check_batch = self.daemon.check_batch
+
+        def recording_check_batch(requests):
+            threads.add(threading.get_ident())
+            return check_batch(requests)
+
+        self.daemon.check_batch = recording_check_batch
+        self.check(*[{"id": i, "source": "{0};".format(i)} for i in range(5)])
+        self.assertTrue(threads)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_named_hierarchies(self):
+        daemon = CheckDaemon({"a": graphics_registry(), "b": TypeRegistry()})
+        self.daemon = daemon
+        a, b = self.check(
+            {"id": 1, "hierarchy": "a", "source": "new Point(1.0, 2.0);"},
+            {"id": 2, "hierarchy": "b", "source": "new Point(1.0, 2.0);"})
+        self.assertEqual("Point", a["results"][0]["type"])
+        self.assertEqual("line 1: No type named Point", b["error"])
+
+    def test_concurrent_requests_are_batched(self):
+        responses = self.check(*[{"id": i, "source": "{0};".format(i)} for i in range(50)])
+        self.assertEqual(list(range(50)), [r["id"] for r in responses])
+        self.assertEqual(50, sum(self.daemon.batch_sizes))
+        self.assertLess(len(self.daemon.batch_sizes), 50)
+
+    def test_unix_socket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "checker.sock")
+
+            async def run():
+                server = asyncio.ensure_future(self.daemon.serve_unix(path))
+                while not os.path.exists(path):
+                    await asyncio.sleep(0.001)
+                reader, writer = await asyncio.open_unix_connection(path)
+                writer.write(b'{"id": "a", "source": "Point p; p.getX();"}\n')
+                writer.write(b'not json\n')
+                writer.write_eof()
+                lines = [json.loads(line) async for line in reader]
+                writer.close()
+                server.cancel()
+                await self.daemon.close()
+                return lines
+
+            responses = asyncio.run(run())
+        self.assertIn({"id": "a", "results": [{"type": "double", "diagnostics": []}]}, responses)
+        self.assertEqual([None], [r["id"] for r in responses if "error" in r])
+
+    def test_stdio(self):
+        fd, snapshot = tempfile.mkstemp(suffix=".snap")
+        os.close(fd)
+        try:
+            save_snapshot(graphics_registry(), snapshot)
+            output = subprocess.run(
+                [sys.executable, "-m", "java_type_checker.daemon", "--hierarchy", "g=" + snapshot],
+                input=b'{"id": 1, "source": "Rectangle r; r.getPosition();"}\n',
+                stdout=subprocess.PIPE, check=True, timeout=60,
+                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+        finally:
+            os.remove(snapshot)
+        self.assertEqual(
+            {"id": 1, "results": [{"type": "Point", "diagnostics": []}]},
+            json.loads(output))
+
+
+if __name__ == '__main__':
+    unittest.main()
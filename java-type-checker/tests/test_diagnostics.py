@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics, node
+import unittest
+
+
+class TestCollectDiagnostics(unittest.TestCase):
+
+    def test_no_diagnostics_for_valid_expression(self):
+        self.assertEqual(
+            [],
+            collect_diagnostics(MethodCall(Variable("window", Graphics.window), "getSize")))
+
+    def test_reports_every_error_with_its_path(self):
+        """
+        Equivalent Java:
+
+            GraphicsGroup group;
+            Window window;
+
+            group.add(
+                new Rectangle(
+                    new Size(null, 0),     // error here
+                    window.getFunky()));   // and here
+        """
+        expr = MethodCall(
+            Variable("group", Graphics.graphics_group),
+            "add",
+            ConstructorCall(
+                Graphics.rectangle,
+                ConstructorCall(Graphics.size,
+                    NullLiteral(),
+                    Literal("0", Type.double)),
+                MethodCall(
+                    Variable("window", Graphics.window),
+                    "getFunky")))
+        diagnostics = collect_diagnostics(expr)
+        self.assertEqual([(1, 0), (1, 1)], [d.path for d in diagnostics])
+        self.assertEqual(
+            [
+                "Size constructor expects arguments of type (double, double), but got (null, double)",
+                "Window has no method named getFunky",
+            ],
+            [d.message for d in diagnostics])
+        self.assertIsInstance(diagnostics[0].error, JavaTypeError)
+        self.assertIsInstance(diagnostics[1].error, NoSuchMethod)
+        self.assertIs(expr.args[0].args[1], diagnostics[1].node)
+
+    def test_errors_do_not_cascade(self):
+        """
+        Equivalent Java:
+
+            Window window;
+
+            window.getFunky().getWidth().getHeight()
+        """
+        expr = MethodCall(
+            MethodCall(
+                MethodCall(Variable("window", Graphics.window), "getFunky"),
+                "getWidth"),
+            "getHeight")
+        diagnostics = collect_diagnostics(expr)
+        self.assertEqual([(0, 0)], [d.path for d in diagnostics])
+
+    def test_reports_parent_errors_after_recovering_children(self):
+        expr = ConstructorCall(
+            Graphics.point,
+            MethodCall(Variable("p", Graphics.point), "getZ"))
+        self.assertEqual(
+            [(0,), ()],
+            [d.path for d in collect_diagnostics(expr)])
+
+    def test_batch_paths_start_with_expression_index(self):
+        diagnostics = collect_diagnostics([
+            Variable("p", Graphics.point),
+            MethodCall(Variable("x", Type.int), "hashCode"),
+            ConstructorCall(Type.null),
+        ])
+        self.assertEqual([(1,), (2,)], [d.path for d in diagnostics])
+        self.assertEqual("Type int does not have methods", diagnostics[0].message)
+
+    def test_first_diagnostic_matches_check_types(self):
+        expr = ConstructorCall(
+            Graphics.rectangle,
+            ConstructorCall(Graphics.size, Literal("0.0", Type.double), Literal("0.0", Type.double)),
+            MethodCall(Variable("window", Graphics.window), "getSize"))
+        with self.assertRaises(JavaTypeError) as raised:
+            expr.check_types()
+        self.assertEqual(str(raised.exception), collect_diagnostics(expr)[0].message)
+
+    def test_deep_chain(self):
+        expr = MethodCall(Variable("n", node), "nope")
+        depth = 50000  # deep enough that per-node path tuples would take quadratic time and memory
+        for i in range(depth):  # alternately the receiver, and the argument after another receiver
+            expr = MethodCall(Variable("m", node), "wrap", expr) if i % 2 else MethodCall(expr, "next")
+        diagnostics = collect_diagnostics([Variable("p", Graphics.point), expr])
+        self.assertEqual([(1,) + (1, 0) * (depth // 2)], [d.path for d in diagnostics])
+        self.assertEqual("Node has no method named nope", diagnostics[0].message)
+
+
+if __name__ == '__main__':
+    unittest.main()
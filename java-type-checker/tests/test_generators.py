@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from benchmarks.generators import HIERARCHIES, corpus, well_typed_expression, ill_typed_expression
+import unittest
+
+
+class TestGenerators(unittest.TestCase):
+
+    def test_hierarchies_are_seeded(self):
+        for kind, generate in HIERARCHIES.items():
+            first, second = generate(60, 7), generate(60, 7)
+            self.assertEqual(
+                [(t.name, sorted(t.methods)) for t in first],
+                [(t.name, sorted(t.methods)) for t in second],
+                kind)
+
+    def test_deep_hierarchy_has_requested_depth(self):
+        types = HIERARCHIES["deep"](1500, 0)
+        self.assertEqual(1501, len(types[-1].ancestors()))  # with Object
+
+    def test_well_typed_expressions_pass(self):
+        for kind, generate in HIERARCHIES.items():
+            types = generate(60, 1)
+            for seed in range(20):
+                check_iteratively(well_typed_expression(types, 5, seed))
+
+    def test_ill_typed_expressions_fail(self):
+        for kind, generate in HIERARCHIES.items():
+            types = generate(60, 1)
+            for seed in range(20):
+                with self.assertRaises((JavaTypeError, NoSuchMethod)):
+                    check_iteratively(ill_typed_expression(types, 5, seed))
+
+    def test_corpus_mixes_well_and_ill_typed(self):
+        types = HIERARCHIES["diamond"](60, 2)
+        expressions = corpus(types, 100, 4, seed=3, ill_typed_fraction=0.5)
+        failures = sum(1 for expr in expressions if collect_diagnostics(expr))
+        self.assertTrue(20 < failures < 80)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+from tests.helpers import TypeTest
+import unittest
+
+
+class TestGenerics(TypeTest):
+    """
+    Equivalent Java:
+
+        interface Collection<E> {
+            boolean add(E e);
+            int size();
+        }
+
+        interface List<E> extends Collection<E> {
+            E get(int index);
+            List<E> subList(int from, int to);
+        }
+
+        class ArrayList<E> implements List<E> {
+            ArrayList(Collection<E> items);
+        }
+
+        class Pair<A, B> {
+            A first();
+            B second();
+            Pair<B, A> swap();
+        }
+    """
+    def setUp(self):
+        e = TypeParameter("E")
+        self.collection = GenericClassOrInterface("Collection", [e],
+            direct_supertypes=[Type.object],
+            methods=[
+                Method("add", argument_types=[e], return_type=Type.boolean),
+                Method("size", return_type=Type.int),
+            ])
+        e = TypeParameter("E")
+        self.list = GenericClassOrInterface("List", [e],
+            direct_supertypes=[self.collection.of(e)])
+        self.list.methods = [
+            Method("get", argument_types=[Type.int], return_type=e),
+            Method("subList", argument_types=[Type.int, Type.int], return_type=self.list.of(e)),
+        ]
+        e = TypeParameter("E")
+        self.array_list = GenericClassOrInterface("ArrayList", [e],
+            direct_supertypes=[self.list.of(e)],
+            constructor=Constructor([self.collection.of(e)]))
+        a, b = TypeParameter("A"), TypeParameter("B")
+        self.pair = GenericClassOrInterface("Pair", [a, b],
+            direct_supertypes=[Type.object],
+            methods=[Method("first", return_type=a), Method("second", return_type=b)])
+        self.pair.add_method(Method("swap", return_type=self.pair.of(b, a)))
+
+    def test_instantiations_are_interned(self):
+        self.assertIs(self.list.of(Graphics.point), self.list.of(Graphics.point))
+        self.assertIsNot(self.list.of(Graphics.point), self.list.of(Graphics.size))
+        self.assertEqual("List<Point>", self.list.of(Graphics.point).name)
+        self.assertEqual("Pair<Point, Size>", self.pair.of(Graphics.point, Graphics.size).name)
+
+    def test_substituted_methods(self):
+        points = Variable("points", self.list.of(Graphics.point))
+        self.assertEqual(Graphics.point,
+            MethodCall(points, "get", Literal("0", Type.int)).check_types())
+        self.assertEqual(Type.double,
+            MethodCall(MethodCall(points, "get", Literal("0", Type.int)), "getX").check_types())
+        self.assertEqual(self.list.of(Graphics.point),
+            MethodCall(points, "subList", Literal("0", Type.int), Literal("1", Type.int)).check_types())
+
+    def test_inherited_substituted_methods(self):
+        points = Variable("points", self.array_list.of(Graphics.point))
+        self.assertNoCompileErrors(MethodCall(points, "add", Variable("p", Graphics.point)))
+        self.assertEqual(Graphics.point,
+            MethodCall(points, "get", Literal("0", Type.int)).check_types())
+        self.assertCompileError(
+            JavaTypeError,
+            "ArrayList<Point>.add() expects arguments of type (Point), but got (Size)",
+            MethodCall(points, "add", Variable("s", Graphics.size)))
+
+    def test_nested_substitution(self):
+        pair = self.pair.of(Graphics.point, self.list.of(Graphics.size))
+        swapped = MethodCall(Variable("pair", pair), "swap").check_types()
+        self.assertIs(self.pair.of(self.list.of(Graphics.size), Graphics.point), swapped)
+        self.assertEqual(Graphics.size, MethodCall(
+            MethodCall(Variable("pair", pair), "second"), "get", Literal("0", Type.int)).check_types())
+
+    def test_subtyping_is_invariant(self):
+        array_list = self.array_list.of(Graphics.rectangle)
+        self.assertTrue(array_list.is_subtype_of(self.list.of(Graphics.rectangle)))
+        self.assertTrue(array_list.is_subtype_of(self.collection.of(Graphics.rectangle)))
+        self.assertTrue(array_list.is_subtype_of(Type.object))
+        self.assertFalse(array_list.is_subtype_of(self.list.of(Graphics.graphics_object)))
+        self.assertTrue(Type.null.is_subtype_of(array_list))
+
+    def test_constructor(self):
+        points = Variable("points", self.list.of(Graphics.point))
+        self.assertEqual(self.array_list.of(Graphics.point),
+            ConstructorCall(self.array_list.of(Graphics.point), points).check_types())
+        self.assertCompileError(
+            JavaTypeError,
+            "ArrayList<Size> constructor expects arguments of type (Collection<Size>), but got (List<Point>)",
+            ConstructorCall(self.array_list.of(Graphics.size), points))
+
+    def test_type_parameter_bound(self):
+        t = TypeParameter("T", bound=Graphics.graphics_object)
+        self.assertEqual(Graphics.graphics_object, t.bound)
+        self.assertEqual(Graphics.point, MethodCall(Variable("t", t), "getPosition").check_types())
+        self.assertTrue(Type.null.is_subtype_of(t))
+        self.assertFalse(Graphics.rectangle.is_subtype_of(t))
+
+    def test_wrong_type_arguments(self):
+        with self.assertRaisesRegex(ValueError, "Pair expects 2 type arguments, got 1"):
+            self.pair.of(Graphics.point)
+        with self.assertRaisesRegex(ValueError, "Type argument int of List is not a class or interface"):
+            self.list.of(Type.int)
+
+    def test_substitution_is_cached(self):
+        points = self.list.of(Graphics.point)
+        get = points.method_named("get")
+        self.assertIs(get, points.method_named("get"))
+        self.assertIs(self.collection.methods["size"][0], points.method_named("size"))  # nothing to substitute
+
+    def test_generic_changes_are_seen(self):
+        points = self.list.of(Graphics.point)
+        self.assertIsNone(points.find_method("last"))
+        self.list.add_method(Method("last", return_type=self.list.type_parameters[0]))
+        self.assertEqual(Graphics.point, points.method_named("last").return_type)
+
+    def test_unrelated_changes_keep_substitutions(self):
+        points = self.list.of(Graphics.point)
+        get = points.method_named("get")
+        ClassOrInterface("Unrelated").add_method(Method("m", return_type=Type.int))
+        self.assertIs(get, points.method_named("get"))
+
+    def test_generic_constructor_changes_are_seen(self):
+        points = self.array_list.of(Graphics.point)
+        self.array_list.constructor = Constructor([Type.int])
+        self.assertEqual((Type.int,), points.constructor.argument_types)
+
+    def test_parameterized_types_cannot_be_changed(self):
+        points = self.list.of(Graphics.point)
+        message = "Cannot change List<Point> directly; change the generic type List instead"
+        for change in [
+                lambda: setattr(points, "direct_supertypes", [Type.object]),
+                lambda: setattr(points, "methods", []),
+                lambda: setattr(points, "constructor", Constructor([])),
+                lambda: setattr(points, "is_instantiable", False),
+                lambda: points.add_method(Method("last", return_type=Graphics.point))]:
+            with self.assertRaisesRegex(TypeError, message):
+                change()
+        self.assertIsNone(points.find_method("last"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+import unittest
+
+
+class TestHierarchyIndex(unittest.TestCase):
+
+    def test_ancestors_include_all_paths(self):
+        self.assertEqual(
+            {Graphics.rectangle, Graphics.graphics_object, Graphics.stroke_colorable,
+                Graphics.fill_colorable, Type.object},
+            Graphics.rectangle.ancestors())
+
+    def test_subtype_through_later_supertype(self):
+        self.assertTrue(Graphics.rectangle.is_subtype_of(Graphics.fill_colorable))
+
+    def test_ancestors_are_cached(self):
+        self.assertIs(Graphics.rectangle.ancestors(), Graphics.rectangle.ancestors())
+
+    def test_reassigning_supertypes_rebuilds_index(self):
+        base = ClassOrInterface("Base", direct_supertypes=[Type.object])
+        middle = ClassOrInterface("Middle", direct_supertypes=[Type.object])
+        leaf = ClassOrInterface("Leaf", direct_supertypes=[middle])
+        self.assertFalse(leaf.is_subtype_of(base))
+
+        middle.direct_supertypes = [base]
+        self.assertTrue(leaf.is_subtype_of(base))
+        self.assertTrue(base.is_supertype_of(leaf))
+
+    def test_new_types_need_no_rebuild(self):
+        Graphics.point.ancestors()
+        sub_point = ClassOrInterface("SubPoint", direct_supertypes=[Graphics.point])
+        self.assertTrue(sub_point.is_subtype_of(Type.object))
+
+    def test_deep_chain(self):
+        chain = [Type.object]
+        for i in range(2000):  # well past the recursion limit
+            chain.append(ClassOrInterface("C{0}".format(i), direct_supertypes=[chain[-1]]))
+        self.assertTrue(chain[-1].is_subtype_of(Type.object))
+
+        chain[1].direct_supertypes = [Type.object]  # rebuilds every closure
+        self.assertEqual(len(chain), len(chain[-1].ancestors()))
+
+    def test_cycle(self):
+        a = ClassOrInterface("A")
+        b = ClassOrInterface("B", direct_supertypes=[a])
+        a.direct_supertypes = [b]
+        with self.assertRaisesRegex(CyclicHierarchy, "Cyclic inheritance: (A|B) extends (A|B) extends"):
+            a.ancestors()
+
+    def test_null_is_subtype_of_classes_only(self):
+        self.assertTrue(Type.null.is_subtype_of(Graphics.point))
+        self.assertTrue(Type.null.is_subtype_of(Type.null))
+        self.assertFalse(Type.null.is_subtype_of(Type.double))
+
+
+if __name__ == '__main__':
+    unittest.main()
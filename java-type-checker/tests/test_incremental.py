@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+import unittest
+
+
+class TestIncrementalChecker(unittest.TestCase):
+
+    def setUp(self):
+        self.get_x = Method("getX", return_type=Type.double)
+        self.point = ClassOrInterface("Point",
+            direct_supertypes=[Type.object],
+            constructor=Constructor([Type.double, Type.double]),
+            methods=[self.get_x])
+        self.size = ClassOrInterface("Size", direct_supertypes=[Type.object])
+        self.checker = IncrementalChecker([
+            MethodCall(Variable("p", self.point), "getX"),
+            MethodCall(Variable("s", self.size), "getWidth"),
+            ConstructorCall(self.point, Literal("0", Type.int), Literal("0", Type.double)),
+            Variable("x", Type.int),
+        ])
+
+    def test_checks_everything_up_front(self):
+        results = self.checker.results()
+        self.assertEqual(Type.double, results[0].static_type)
+        self.assertIsInstance(results[1].error, NoSuchMethod)
+        self.assertIsInstance(results[2].error, JavaTypeError)
+        self.assertEqual(Type.int, results[3].static_type)
+
+    def test_rechecks_only_dependents_of_changed_type(self):
+        self.size.add_method(Method("getWidth", return_type=Type.double))
+        self.assertEqual([1], self.checker.changed(self.size))
+        self.assertEqual(Type.double, self.checker[1].static_type)
+
+    def test_rechecks_dependents_of_changed_method(self):
+        self.get_x.return_type = Type.int
+        self.assertEqual([0], self.checker.changed(self.get_x))
+        self.assertEqual(Type.int, self.checker[0].static_type)
+
+    def test_rechecks_dependents_of_changed_argument_types(self):
+        a = ClassOrInterface("A", direct_supertypes=[Type.object])
+        b = ClassOrInterface("B", direct_supertypes=[Type.object])
+        foo = Method("foo", argument_types=[a], return_type=Type.int)
+        r = ClassOrInterface("R", direct_supertypes=[Type.object], methods=[foo])
+        index = self.checker.add(MethodCall(Variable("r", r), "foo", Variable("b", b)))
+        self.assertIsInstance(self.checker[index].error, JavaTypeError)
+
+        foo.argument_types = (b,)
+        self.assertEqual([index], self.checker.changed(foo))
+        self.assertEqual(CheckResult(Type.int, None), self.checker[index])
+
+    def test_rechecks_dependents_of_changed_constructor(self):
+        self.point.constructor.argument_types = (Type.int, Type.double)
+        self.assertEqual([2], self.checker.changed(self.point.constructor))
+        self.assertEqual(self.point, self.checker[2].static_type)
+
+    def test_supertype_changes_reach_subtypes(self):
+        self.assertEqual([0, 1], self.checker.changed(Type.object))
+
+    def test_unrelated_changes_recheck_nothing(self):
+        self.assertEqual([], self.checker.changed(ClassOrInterface("Unrelated")))
+
+    def test_tracks_new_dependencies_after_recheck(self):
+        shape = ClassOrInterface("Shape")
+        self.size.direct_supertypes = [shape]
+        self.checker.changed(self.size)
+        shape.add_method(Method("getWidth", return_type=Type.double))
+        self.assertEqual([1], self.checker.changed(shape))
+        self.assertEqual(Type.double, self.checker[1].static_type)
+
+    def test_add_returns_index(self):
+        self.assertEqual(4, self.checker.add(NullLiteral()))
+        self.assertEqual(Type.null, self.checker[4].static_type)
+        self.assertEqual(5, len(self.checker))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+import json
+import os
+import tempfile
+import unittest
+
+
+def deep_expression():
+    return MethodCall(
+        Variable("group", Graphics.graphics_group),
+        "add",
+        ConstructorCall(
+            Graphics.rectangle,
+            ConstructorCall(Graphics.point,
+                Literal("0.0", Type.double),
+                Literal("0.0", Type.double)),
+            MethodCall(
+                Variable("window", Graphics.window),
+                "getSize")))
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_counts_queries_and_lookups(self):
+        hierarchy_changed()  # resolved calls are cached
+        with instrumented() as stats:
+            deep_expression().check_types()
+        self.assertEqual(2, stats.counters["method_lookups"])
+        self.assertEqual(6, stats.counters["subtype_queries"])
+
+    def test_counts_ancestor_cache_hits(self):
+        deep_expression().check_types()
+        with instrumented() as stats:
+            deep_expression().check_types()
+        self.assertEqual(4, stats.counters["ancestors_cache_hits"])
+        self.assertEqual(0, stats.counters["ancestors_cache_misses"])
+
+    def test_counts_cache_misses_after_changes(self):
+        hierarchy_changed()
+        with instrumented() as stats:
+            Graphics.point.method_named("getX")
+            Graphics.point.method_named("getY")
+        self.assertEqual(1, stats.counters["method_table_cache_hits"])
+        self.assertEqual(1, stats.counters["method_table_cache_misses"])  # Point’s, which rebuilds Object’s too
+
+    def test_counts_frozen_type_lookups(self):
+        builder = HierarchyBuilder(TypeUniverse())
+        builder.declare("Shape", supertypes=["Object"], methods=[Method("area", return_type="double")])
+        builder.declare("Circle", supertypes=["Shape"])
+        universe = builder.build().freeze()
+        circle, shape = universe["Circle"], universe["Shape"]
+        hierarchy_changed()  # frozen indexes stay current anyway
+        with instrumented() as stats:
+            circle.method_named("area")
+            circle.is_subtype_of(shape)
+            self.assertEqual(Type.double, MethodCall(Variable("c", circle), "area").check_types())
+        self.assertGreater(stats.counters["method_table_cache_hits"], 0)
+        self.assertEqual(0, stats.counters["method_table_cache_misses"])
+        self.assertGreater(stats.counters["ancestors_cache_hits"], 0)
+        self.assertEqual(0, stats.counters["ancestors_cache_misses"])
+        self.assertGreater(stats.counters["method_lookups"], 0)
+
+    def test_counts_errors(self):
+        with instrumented() as stats:
+            with self.assertRaises(NoSuchMethod):
+                MethodCall(Variable("p", Graphics.point), "getZ").check_types()
+        self.assertEqual(1, stats.counters["errors.NoSuchMethod"])
+
+    def test_times_each_node_type(self):
+        with instrumented() as stats:
+            check_iteratively(deep_expression())
+        self.assertEqual(2, stats.timings["Variable"][0])
+        self.assertEqual(2, stats.timings["Literal"][0])
+        self.assertEqual(2, stats.timings["MethodCall"][0])
+        self.assertEqual(2, stats.timings["ConstructorCall"][0])
+        self.assertIsNone(stats.events)  # only recorded with trace=True
+
+    def test_exports_chrome_trace(self):
+        with instrumented(trace=True) as stats:
+            deep_expression().check_types()
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            stats.write_chrome_trace(path)
+            with open(path) as f:
+                trace = json.load(f)
+        finally:
+            os.remove(path)
+        self.assertEqual(8, len(trace["traceEvents"]))
+        self.assertEqual({"X"}, {e["ph"] for e in trace["traceEvents"]})
+        self.assertEqual(2, trace["otherData"]["counters"]["method_lookups"])
+
+    def test_restores_methods_afterwards(self):
+        original = MethodCall.diagnose_node
+        with instrumented():
+            self.assertIsNot(original, MethodCall.diagnose_node)
+        self.assertIs(original, MethodCall.diagnose_node)
+        self.assertIs(original, MethodCall.__dict__["diagnose_node"])
+
+    def test_cannot_nest(self):
+        with instrumented():
+            with self.assertRaises(RuntimeError):
+                with instrumented():
+                    pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+from unittest import mock
+import unittest
+
+
+class TestInterning(unittest.TestCase):
+
+    def setUp(self):
+        self.interner = ExpressionInterner()
+
+    def position_of(self, name):
+        i = self.interner
+        return i.method_call(i.variable(name, Graphics.graphics_object), "getPosition")
+
+    def test_identical_nodes_are_shared(self):
+        self.assertIs(self.position_of("p"), self.position_of("p"))
+        self.assertIs(self.interner.null(), self.interner.null())
+        self.assertEqual(3, len(self.interner))
+
+    def test_different_nodes_are_distinct(self):
+        self.assertIsNot(self.position_of("p"), self.position_of("q"))
+        i = self.interner
+        self.assertIsNot(
+            i.literal("0.0", Type.double),
+            i.literal("0", Type.double))
+
+    def test_interned_nodes_are_ordinary_expressions(self):
+        self.assertEqual(Graphics.point, self.position_of("p").check_types())
+
+    def test_checks_each_distinct_node_once(self):
+        i = self.interner
+        position = self.position_of("p")
+        corpus = [
+            i.method_call(position, "getX"),
+            i.method_call(position, "getY"),
+            i.method_call(position, "getX"),
+        ]
+        with mock.patch.object(
+                MethodCall, "diagnose_node",
+                autospec=True, side_effect=MethodCall.diagnose_node) as diagnose_node:
+            for expr in corpus:
+                self.assertEqual(Type.double, i.check_types(expr))
+        self.assertEqual(3, diagnose_node.call_count)
+
+    def test_caches_errors(self):
+        i = self.interner
+        bad = i.method_call(i.variable("w", Graphics.window), "getFunky")
+        for _ in range(2):
+            with self.assertRaisesRegex(NoSuchMethod, "Window has no method named getFunky"):
+                i.check_types(i.method_call(bad, "hashCode"))
+
+    def test_hierarchy_change_discards_results(self):
+        i = self.interner
+        thing = ClassOrInterface("Thing")
+        call = i.method_call(i.variable("t", thing), "size")
+        with self.assertRaises(NoSuchMethod):
+            i.check_types(call)
+
+        thing.add_method(Method("size", return_type=Type.int))
+        self.assertEqual(Type.int, i.check_types(call))
+
+
+if __name__ == '__main__':
+    unittest.main()
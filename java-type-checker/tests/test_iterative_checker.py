@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics, node, method_chain, constructor_chain
+from tests.helpers import TypeTest
+from tests import test_type_checking, test_null
+import re
+import sys
+import unittest
+
+
+class IterativeTypeTest(TypeTest):
+    """ Runs the standard assertions through check_iteratively() instead of check_types().
+    """
+    def assertCompileError(self, error, error_message, expr):
+        with self.assertRaisesRegex(error, re.escape(error_message)):
+            check_iteratively(expr)
+
+    def assertNoCompileErrors(self, expr):
+        check_iteratively(expr)
+
+
+class TestIterativeTypeChecking(IterativeTypeTest, test_type_checking.TestTypeChecking):
+    pass
+
+
+class TestIterativeNull(IterativeTypeTest, test_null.TestNull):
+    pass
+
+
+class TestIterativeDepth(unittest.TestCase):
+
+    def test_returns_static_type(self):
+        self.assertEqual(
+            Graphics.size,
+            check_iteratively(MethodCall(Variable("window", Graphics.window), "getSize")))
+
+    def test_handles_trees_deeper_than_recursion_limit(self):
+        depth = sys.getrecursionlimit() * 50
+        self.assertEqual(node, check_iteratively(method_chain(depth)))
+        self.assertEqual(node, check_iteratively(constructor_chain(depth)))
+
+    def test_reports_error_deep_in_tree(self):
+        expr = MethodCall(method_chain(sys.getrecursionlimit() * 10), "getFunky")
+        with self.assertRaisesRegex(NoSuchMethod, "Node has no method named getFunky"):
+            check_iteratively(expr)
+
+    def test_checks_arguments_of_deep_calls(self):
+        expr = MethodCall(method_chain(100), "wrap", method_chain(100))
+        self.assertEqual(node, check_iteratively(expr))
+
+
+if __name__ == '__main__':
+    unittest.main()
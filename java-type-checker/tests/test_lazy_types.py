@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+from tests.helpers import TypeTest
+import os
+import pickle
+import tempfile
+import unittest
+
+
+class RecordingSource(object):
+    """ Serves members from a dict of (supertypes, constructor, methods), recording each load.
+    """
+    def __init__(self, members, ancestors=None):
+        self.member_data = members
+        self.ancestor_data = ancestors or {}
+        self.loaded = []
+
+    def members(self, key):
+        self.loaded.append(key)
+        return self.member_data[key]
+
+    def ancestors(self, key):
+        return self.ancestor_data.get(key)
+
+
+class TestLazyTypes(TypeTest):
+
+    def setUp(self):
+        self.source = RecordingSource({
+            "Shape": ([Type.object], Constructor([]), [Method("area", return_type=Type.double)]),
+            "Square": ([], Constructor([Type.double]), []),
+        })
+        self.shape = LazyClassOrInterface("Shape", self.source, "Shape")
+        self.square = LazyClassOrInterface("Square", self.source, "Square")
+        self.source.member_data["Square"][0].append(self.shape)
+
+    def test_loads_nothing_up_front(self):
+        self.assertEqual([], self.source.loaded)
+        self.assertFalse(self.shape.is_loaded)
+
+    def test_loads_members_on_first_use(self):
+        self.assertEqual(Type.double, self.square.method_named("area").return_type)
+        self.assertEqual(["Square", "Shape"], self.source.loaded)
+        self.square.method_named("area")
+        self.assertEqual(["Square", "Shape"], self.source.loaded)
+
+    def test_loads_only_what_constructor_needs(self):
+        self.assertEqual((Type.double,), self.square.constructor.argument_types)
+        self.assertEqual(["Square"], self.source.loaded)
+
+    def test_subtype_check_loads_supertypes(self):
+        self.assertTrue(self.square.is_subtype_of(Type.object))
+        self.assertEqual(["Square", "Shape"], self.source.loaded)
+
+    def test_precomputed_ancestors_skip_loading(self):
+        self.source.ancestor_data["Square"] = [self.square, self.shape, Type.object]
+        self.assertTrue(self.square.is_subtype_of(self.shape))
+        self.assertEqual([], self.source.loaded)
+
+    def test_precomputed_ancestors_ignored_after_hierarchy_change(self):
+        self.source.ancestor_data["Square"] = [self.square]
+        hierarchy_changed()
+        self.assertTrue(self.square.is_subtype_of(self.shape))
+
+    def test_checks_expressions(self):
+        self.assertNoCompileErrors(
+            MethodCall(ConstructorCall(self.square, Literal("1.0", Type.double)), "area"))
+
+    def test_pickles_as_loaded_type(self):
+        copy = pickle.loads(pickle.dumps(self.square))
+        self.assertEqual("Square", copy.name)
+        self.assertIs(ClassOrInterface, type(copy))
+        self.assertEqual("double", copy.method_named("area").return_type.name)
+
+
+class TestLazySnapshot(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".snap")
+        os.close(fd)
+        save_snapshot([Graphics.rectangle, Graphics.graphics_group, Graphics.window], self.path)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_loads_members_on_demand(self):
+        loaded = load_snapshot(self.path, lazy=True)
+        rectangle = loaded["Rectangle"]
+        self.assertIsInstance(rectangle, LazyClassOrInterface)
+        self.assertTrue(rectangle.is_subtype_of(loaded["GraphicsObject"]))
+        self.assertFalse(rectangle.is_loaded)
+        self.assertIs(loaded["Point"], rectangle.method_named("getPosition").return_type)
+        self.assertTrue(rectangle.is_loaded)
+        self.assertFalse(loaded["Window"].is_loaded)
+
+    def test_closes_file_once_everything_is_loaded(self):
+        loaded = load_snapshot(self.path, lazy=True)
+        rectangle = loaded["Rectangle"]
+        self.assertIsNotNone(rectangle._source.data)
+        for t in loaded:
+            t.direct_supertypes
+        self.assertIsNone(rectangle._source.data)
+        self.assertTrue(rectangle.is_subtype_of(loaded["GraphicsObject"]))
+        self.assertIs(loaded["Point"], rectangle.method_named("getPosition").return_type)
+
+
+if __name__ == '__main__':
+    unittest.main()
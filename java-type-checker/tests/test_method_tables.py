@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+import unittest
+
+
+class TestMethodTables(unittest.TestCase):
+
+    def test_table_includes_inherited_methods(self):
+        table = Graphics.rectangle.method_table()
+        self.assertIs(Graphics.graphics_object.methods["getPosition"], table["getPosition"])
+        self.assertIs(Graphics.fill_colorable.methods["getFillColor"], table["getFillColor"])
+        self.assertIs(Type.object.methods["hashCode"], table["hashCode"])
+
+    def test_find_method_returns_none_on_miss(self):
+        self.assertIsNone(Graphics.rectangle.find_method("ergleflopse"))
+
+    def test_declared_methods_override_inherited(self):
+        parent = ClassOrInterface("Parent", methods=[Method("m", return_type=Type.int)])
+        child = ClassOrInterface("Child",
+            direct_supertypes=[parent],
+            methods=[Method("m", return_type=Type.double)])
+        self.assertEqual(Type.double, child.method_named("m").return_type)
+
+    def test_earlier_supertypes_win(self):
+        first = ClassOrInterface("First", methods=[Method("m", return_type=Type.int)])
+        second = ClassOrInterface("Second", methods=[Method("m", return_type=Type.double)])
+        both = ClassOrInterface("Both", direct_supertypes=[first, second])
+        self.assertEqual(Type.int, both.method_named("m").return_type)
+
+    def test_adding_method_invalidates_subtype_tables(self):
+        parent = ClassOrInterface("Parent")
+        child = ClassOrInterface("Child", direct_supertypes=[parent])
+        self.assertIsNone(child.find_method("m"))
+
+        parent.add_method(Method("m", return_type=Type.int))
+        self.assertEqual(Type.int, child.method_named("m").return_type)
+
+        parent.methods = {}
+        self.assertIsNone(child.find_method("m"))
+
+    def test_changing_supertypes_invalidates_tables(self):
+        parent = ClassOrInterface("Parent", methods=[Method("m", return_type=Type.int)])
+        child = ClassOrInterface("Child")
+        self.assertIsNone(child.find_method("m"))
+
+        child.direct_supertypes = [parent]
+        self.assertIsNotNone(child.find_method("m"))
+
+    def test_deep_chain(self):
+        chain = [ClassOrInterface("C0", methods=[Method("m", return_type=Type.int)])]
+        for i in range(1, 2000):  # well past the recursion limit
+            chain.append(ClassOrInterface("C{0}".format(i), direct_supertypes=[chain[-1]]))
+        self.assertEqual(Type.int, chain[-1].method_named("m").return_type)
+
+        chain[0].add_method(Method("n", return_type=Type.double))  # rebuilds every table
+        self.assertEqual(Type.double, chain[-1].method_named("n").return_type)
+
+    def test_declared_methods_are_read_only(self):
+        with self.assertRaises(TypeError):
+            Graphics.point.methods["getZ"] = (Method("getZ", return_type=Type.double),)
+
+
+if __name__ == '__main__':
+    unittest.main()
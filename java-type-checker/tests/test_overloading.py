@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+from tests.helpers import TypeTest
+from unittest import mock
+import unittest
+
+
+class TestOverloading(TypeTest):
+    """
+    Equivalent Java:
+
+        class Canvas {
+            void add(GraphicsObject gObject);
+            int add(Rectangle rect);
+            double add(Object obj);
+            void add(double x, double y);
+            void mix(Paint paint, Object obj);
+            void mix(Object obj, Paint paint);
+        }
+
+        class Easel extends Canvas {
+            boolean add(Object obj);   // overrides Canvas.add(Object)
+        }
+    """
+    def setUp(self):
+        self.canvas = ClassOrInterface("Canvas",
+            direct_supertypes=[Type.object],
+            methods=[
+                Method("add", argument_types=[Graphics.graphics_object], return_type=Type.void),
+                Method("add", argument_types=[Graphics.rectangle], return_type=Type.int),
+                Method("add", argument_types=[Type.object], return_type=Type.double),
+                Method("add", argument_types=[Type.double, Type.double], return_type=Type.void),
+                Method("mix", argument_types=[Graphics.paint, Type.object], return_type=Type.void),
+                Method("mix", argument_types=[Type.object, Graphics.paint], return_type=Type.void),
+            ])
+        self.easel = ClassOrInterface("Easel",
+            direct_supertypes=[self.canvas],
+            methods=[
+                Method("add", argument_types=[Type.object], return_type=Type.boolean),
+            ])
+
+    def call(self, receiver_type, name, *arg_types):
+        return MethodCall(
+            Variable("c", receiver_type),
+            name,
+            *[Variable("a{0}".format(i), t) for i, t in enumerate(arg_types)])
+
+    def test_overloads_do_not_overwrite_each_other(self):
+        self.assertEqual(4, len(self.canvas.overloads("add")))
+        self.assertEqual(1, len(self.canvas.overloads("add", 2)))
+
+    def test_picks_exact_match(self):
+        self.assertEqual(Type.void, self.call(self.canvas, "add", Graphics.graphics_object).check_types())
+
+    def test_picks_most_specific_applicable(self):
+        self.assertEqual(Type.int, self.call(self.canvas, "add", Graphics.rectangle).check_types())
+        self.assertEqual(Type.void, self.call(self.canvas, "add", Graphics.graphics_group).check_types())
+        self.assertEqual(Type.double, self.call(self.canvas, "add", Graphics.point).check_types())
+
+    def test_null_picks_most_specific(self):
+        self.assertEqual(
+            Type.int,
+            MethodCall(Variable("c", self.canvas), "add", NullLiteral()).check_types())
+
+    def test_picks_by_arity(self):
+        self.assertEqual(Type.void, self.call(self.canvas, "add", Type.double, Type.double).check_types())
+
+    def test_subtype_overrides_same_signature(self):
+        self.assertEqual(4, len(self.easel.overloads("add")))
+        self.assertEqual(Type.boolean, self.call(self.easel, "add", Graphics.point).check_types())
+        self.assertEqual(Type.int, self.call(self.easel, "add", Graphics.rectangle).check_types())
+
+    def test_flags_ambiguous_call(self):
+        self.assertCompileError(
+            JavaTypeError,
+            "Call to Canvas.mix() with arguments (Color, Color) is ambiguous",
+            self.call(self.canvas, "mix", Graphics.color, Graphics.color))
+
+    def test_flags_inapplicable_call(self):
+        self.assertCompileError(
+            JavaTypeError,
+            "No overload of Canvas.add() accepts arguments (boolean)",
+            self.call(self.canvas, "add", Type.boolean))
+
+    def test_caches_resolution(self):
+        hierarchy_changed()
+        self.canvas.resolve_method("add", (Graphics.rectangle,))
+        with mock.patch.object(ClassOrInterface, "applicable_methods") as applicable_methods:
+            method = self.canvas.resolve_method("add", (Graphics.rectangle,))
+        applicable_methods.assert_not_called()
+        self.assertEqual(Type.int, method.return_type)
+
+    def test_find_method_needs_argument_types_when_overloaded(self):
+        with self.assertRaisesRegex(NoSuchMethod, "Canvas has 4 methods named add"):
+            self.canvas.find_method("add")
+        self.assertEqual(Type.int, self.canvas.find_method("add", (Graphics.rectangle,)).return_type)
+        self.assertIsNone(self.canvas.find_method("add", (Type.boolean,)))
+
+    def test_static_type_resolves_overloads(self):
+        self.assertEqual(Type.int, self.call(self.canvas, "add", Graphics.rectangle).static_type())
+
+    def test_redeclaring_signature_replaces_method(self):
+        self.canvas.add_method(Method("add", argument_types=[Type.object], return_type=Type.int))
+        self.assertEqual(4, len(self.canvas.methods["add"]))
+        self.assertEqual(Type.int, self.call(self.canvas, "add", Graphics.point).check_types())
+
+
+if __name__ == '__main__':
+    unittest.main()
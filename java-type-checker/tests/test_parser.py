@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics, node
+import io
+import os
+import tempfile
+import unittest
+
+
+def graphics_registry():
+    registry = TypeRegistry()
+    for t in [Graphics.point, Graphics.size, Graphics.graphics_object, Graphics.paint,
+              Graphics.color, Graphics.rectangle, Graphics.graphics_group]:
+        registry.register(t)
+    return registry
+
+
+SOURCE = """
+Rectangle rect;
+java.lang.Object o;    // qualified type name
+boolean flag;
+
+rect.getPosition().getX();
+new Point(1.0, 2.0);
+new Rectangle(new Point(1.0, 2.0), null).setFillColor(new Color(1, 2, 3));
+flag ? rect : null;
+flag ? 1 : flag ? 2.5 : 3;
+(rect).hashCode();
+o.equals(rect);
+true;
+"""
+
+
+class TestParser(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = graphics_registry()
+
+    def parse(self, source, variables=None):
+        return list(parse_expressions(io.StringIO(source), self.registry, variables))
+
+    def test_static_types(self):
+        types = [expr.check_types() for expr in self.parse(SOURCE)]
+        self.assertEqual(
+            [Type.double, Graphics.point, Type.void, Graphics.rectangle,
+             Type.double, Type.int, Type.boolean, Type.boolean],
+            types)
+
+    def test_tree_structure(self):
+        call, = self.parse("rect.setPosition(1.0, 2);", {"rect": Graphics.rectangle})
+        self.assertIsInstance(call, MethodCall)
+        self.assertEqual("setPosition", call.method_name)
+        self.assertEqual(Graphics.rectangle, call.receiver.declared_type)
+        self.assertEqual(["1.0", "2"], [arg.value for arg in call.args])
+        self.assertEqual([Type.double, Type.int], [arg.type for arg in call.args])
+
+    def test_conditionals_nest_to_the_right(self):
+        expr, = self.parse("true ? 1 : false ? 2 : 3;")
+        self.assertIsInstance(expr.false_expr, ConditionalExpression)
+        self.assertEqual("3", expr.false_expr.false_expr.value)
+
+    def test_conditional_arguments(self):
+        expr, = self.parse("new Point(true ? 1.0 : 2.0, (false ? 3 : 4.0)).getX();")
+        self.assertEqual(Type.double, expr.check_types())
+        self.assertIsInstance(expr.receiver.args[0], ConditionalExpression)
+        self.assertIsInstance(expr.receiver.args[1], ConditionalExpression)
+
+    def test_deep_nesting(self):
+        depth = 5000  # well past the recursion limit
+        self.registry.register(node)
+        expr, = self.parse("new Node(" * depth + "n" + ")" * depth + ";", {"n": node})
+        self.assertEqual(node, check_iteratively(expr))
+        expr, = self.parse("(" * depth + "n" + ").next()" * depth + ";", {"n": node})
+        self.assertEqual("next", expr.method_name)
+        self.assertEqual(node, check_iteratively(expr))
+        expr, = self.parse("true ? " * depth + "n" + " : null" * depth + ";", {"n": node})
+        self.assertEqual(node, check_iteratively(expr))
+
+    def test_statements_span_lines(self):
+        expr, = self.parse("new Point(\n  1.0,\n  2.0\n);")
+        self.assertEqual(Graphics.point, expr.check_types())
+
+    def test_several_statements_per_line(self):
+        self.assertEqual(3, len(self.parse("1; 2; 3;")))
+
+    def test_variables_are_shared(self):
+        first, second = self.parse("Point p; p; p.getX();")
+        self.assertIs(first, second.receiver)
+
+    def test_parses_lazily(self):
+        def lines():
+            yield "Point p;\n"
+            yield "p.getX();\n"
+            raise AssertionError("read too far")
+        expressions = parse_expressions(lines(), self.registry)
+        self.assertEqual(Type.double, next(expressions).check_types())
+
+    def test_check_stream(self):
+        results = list(check_stream(io.StringIO("Point p; p.getX(); p.flip();"), self.registry))
+        self.assertEqual(Type.double, results[0].static_type)
+        self.assertIsNone(results[0].error)
+        self.assertIsInstance(results[1].error, NoSuchMethod)
+
+    def test_parse_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".java", delete=False) as f:
+            f.write(SOURCE)
+        try:
+            self.assertEqual(8, len(list(parse_file(f.name, self.registry))))
+        finally:
+            os.unlink(f.name)
+
+    def test_undeclared_variable(self):
+        with self.assertRaisesRegex(ParseError, "line 2: Undeclared variable q"):
+            self.parse("Point p;\nq.getX();")
+
+    def test_unknown_type(self):
+        with self.assertRaisesRegex(ParseError, "line 1: No type named Sprite"):
+            self.parse("Sprite s;")
+        with self.assertRaisesRegex(ParseError, "line 1: No type named Sprite"):
+            self.parse("new Sprite();")
+
+    def test_syntax_errors(self):
+        for source, message in [
+                ("new Point(1.0 2.0);", "Expected \\) but found 2.0"),
+                ("1 2;", "Expected ; but found 2"),
+                ("Point p; p.;", "Expected a name but found ;"),
+                ("true ? 1;", "Expected : but found ;"),
+                ("1", "Expected ; at end of input"),
+                ("(" * 5000 + "1;", "Expected \\) but found ;"),
+                (");", "Unexpected \\)")]:
+            with self.subTest(source=source):
+                with self.assertRaisesRegex(ParseError, message):
+                    self.parse(source)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+import unittest
+
+
+class TestTypeRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = TypeRegistry()
+
+    def test_finds_builtins(self):
+        self.assertIs(Type.object, self.registry["java.lang.Object"])
+        self.assertIs(Type.object, self.registry["Object"])
+        self.assertIs(Type.int, self.registry["int"])
+        self.assertIs(Type.null, self.registry["null"])
+
+    def test_raises_unknown_type(self):
+        with self.assertRaisesRegex(UnknownType, "No type named Nope"):
+            self.registry["Nope"]
+        self.assertIsNone(self.registry.get("Nope"))
+
+    def test_interns_by_qualified_name(self):
+        point = ClassOrInterface("Point")
+        self.assertIs(point, self.registry.register(point, "graphics.Point"))
+        self.assertIs(point, self.registry.register(ClassOrInterface("Point"), "graphics.Point"))
+        self.assertIs(point, self.registry["graphics.Point"])
+        self.assertNotIn("Point", self.registry)
+
+    def test_resolves_forward_references(self):
+        r = self.registry
+        r.register(ClassOrInterface("Rectangle",
+            direct_supertypes=["Shape"],
+            constructor=Constructor(["Point", "Point"])))
+        r.register(ClassOrInterface("Shape",
+            direct_supertypes=["java.lang.Object"],
+            methods=[Method("getPosition", return_type="Point")]))
+        r.register(ClassOrInterface("Point",
+            direct_supertypes=["Object"],
+            methods=[Method("translate", argument_types=["double", "double"], return_type="Point")]))
+
+        rectangle, shape, point = r["Rectangle"], r["Shape"], r["Point"]
+        self.assertTrue(rectangle.is_subtype_of(shape))
+        self.assertTrue(rectangle.is_subtype_of(Type.object))
+        self.assertEqual((point, point), rectangle.constructor.argument_types)
+        self.assertIs(point, rectangle.method_named("getPosition").return_type)
+        self.assertEqual(
+            (Type.double, Type.double),
+            point.method_named("translate").argument_types)
+
+    def test_unresolvable_reference(self):
+        self.registry.register(ClassOrInterface("Orphan", direct_supertypes=["Parent"]))
+        with self.assertRaisesRegex(UnknownType, "No type named Parent"):
+            self.registry.link()
+
+    def test_iterates_distinct_types(self):
+        self.assertEqual(6, len(list(self.registry)))
+        self.assertEqual(6, len(self.registry))
+        self.assertEqual(7, len(self.registry.items()))  # java.lang.Object is also Object
+
+
+if __name__ == '__main__':
+    unittest.main()
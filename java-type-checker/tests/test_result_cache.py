@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+from unittest import mock
+import os
+import tempfile
+import unittest
+
+
+class TestStructuralHash(unittest.TestCase):
+
+    def test_equal_trees(self):
+        def build():
+            rect = Variable("rect", Graphics.rectangle)
+            return MethodCall(MethodCall(rect, "getPosition"), "getX")
+        self.assertEqual(structural_hash(build()), structural_hash(build()))
+
+    def test_shared_and_copied_subtrees(self):
+        shared = Variable("p", Graphics.point)
+        a = ConstructorCall(Graphics.rectangle, shared, shared)
+        b = ConstructorCall(Graphics.rectangle, Variable("p", Graphics.point), Variable("p", Graphics.point))
+        self.assertEqual(structural_hash(a), structural_hash(b))
+
+    def test_different_trees(self):
+        p = Variable("p", Graphics.point)
+        hashes = {structural_hash(e) for e in [
+            p,
+            Variable("q", Graphics.point),
+            Variable("p", Graphics.size),
+            MethodCall(p, "getX"),
+            MethodCall(p, "getY"),
+            MethodCall(p, "getX", p),
+            Literal("1", Type.int),
+            Literal("2", Type.int),
+        ]}
+        self.assertEqual(8, len(hashes))
+
+    def test_deep_tree(self):
+        expr = Variable("n", Graphics.point)
+        for _ in range(10000):
+            expr = ConditionalExpression(Literal("true", Type.boolean), expr, expr)
+        self.assertEqual(16, len(structural_hash(expr)))
+
+
+class TestTypeFingerprint(unittest.TestCase):
+
+    def make_point(self):
+        return ClassOrInterface("Point",
+            direct_supertypes=[Type.object],
+            methods=[Method("getX", return_type=Type.double)])
+
+    def test_same_definitions(self):
+        self.assertEqual(type_fingerprint(self.make_point()), type_fingerprint(self.make_point()))
+
+    def test_changed_method(self):
+        point = self.make_point()
+        before = type_fingerprint(point)
+        point.add_method(Method("getY", return_type=Type.double))
+        self.assertNotEqual(before, type_fingerprint(point))
+
+    def test_changed_reachable_type(self):
+        point = self.make_point()
+        holder = ClassOrInterface("Holder", methods=[Method("get", return_type=point)])
+        before = type_fingerprint(holder)
+        point.add_method(Method("getY", return_type=Type.double))
+        self.assertNotEqual(before, type_fingerprint(holder))
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".sqlite")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def good(self):
+        return MethodCall(MethodCall(Variable("r", Graphics.rectangle), "getPosition"), "getX")
+
+    def bad(self):
+        return MethodCall(Variable("r", Graphics.rectangle), "flip")
+
+    def test_persists_between_runs(self):
+        with ResultCache(self.path) as cache:
+            self.assertEqual(Type.double, cache.check(self.good()).static_type)
+            self.assertIsInstance(cache.check(self.bad()).error, NoSuchMethod)
+            self.assertEqual(2, cache.misses)
+
+        with ResultCache(self.path) as cache:
+            with mock.patch("java_type_checker.result_cache.check_iteratively") as check:
+                good, bad = cache.check(self.good()), cache.check(self.bad())
+            check.assert_not_called()
+            self.assertEqual(CheckResult(Type.double, None), good)
+            self.assertIsInstance(bad.error, NoSuchMethod)
+            self.assertEqual("Rectangle has no method named flip", str(bad.error))
+            self.assertEqual(2, cache.hits)
+
+    def test_get(self):
+        with ResultCache(self.path) as cache:
+            self.assertIsNone(cache.get(self.good()))
+            cache.check(self.good())
+            self.assertEqual(Type.double, cache.get(self.good()).static_type)
+
+    def test_changed_definition_misses(self):
+        point = ClassOrInterface("Point", methods=[Method("getX", return_type=Type.double)])
+        expr = MethodCall(Variable("p", point), "getX")
+        with ResultCache(self.path) as cache:
+            cache.check(expr)
+            point.methods = [Method("getX", return_type=Type.int)]
+            self.assertEqual(Type.int, cache.check(expr).static_type)
+            self.assertEqual(2, cache.misses)
+
+    def test_intersection_results_are_rechecked(self):
+        sprite = ClassOrInterface("Sprite",
+            direct_supertypes=[Graphics.stroke_colorable, Graphics.fill_colorable])
+        expr = ConditionalExpression(
+            Variable("flag", Type.boolean), Variable("r", Graphics.rectangle), Variable("s", sprite))
+        with ResultCache(self.path) as cache:
+            first, second = cache.check(expr), cache.check(expr)
+        self.assertIs(first.static_type, second.static_type)
+
+    def test_results_are_types_not_names(self):
+        first = ClassOrInterface("Point", methods=[Method("getX", return_type=Type.double)])
+        second = ClassOrInterface("Point", methods=[Method("getY", return_type=Type.double)])
+        holder = ClassOrInterface("Holder", methods=[
+            Method("first", return_type=first),
+            Method("second", return_type=second),
+        ])
+        calls = [MethodCall(Variable("h", holder), name) for name in ["first", "second"]]
+        with ResultCache(self.path) as cache:
+            for call in calls:
+                cache.check(call)
+        with ResultCache(self.path) as cache:
+            self.assertIs(first, cache.check(calls[0]).static_type)
+            self.assertIs(second, cache.check(calls[1]).static_type)
+            self.assertEqual(2, cache.hits)
+
+    def test_storing_a_result_again_keeps_the_size(self):
+        with ResultCache(self.path) as cache:
+            with mock.patch.object(cache, "_get", return_value=None):
+                cache.check(self.good())
+                cache.check(self.good())
+            self.assertEqual(1, len(cache))
+
+    def test_lru_eviction(self):
+        literals = [Literal(str(i), Type.int) for i in range(30)]
+        with ResultCache(self.path, max_entries=20) as cache:
+            for literal in literals[:20]:
+                cache.check(literal)
+            cache.check(literals[0])  # now the most recently used
+            for literal in literals[20:]:
+                cache.check(literal)
+            self.assertLessEqual(len(cache), 20)
+            self.assertIsNotNone(cache.get(literals[0]))
+            self.assertIsNone(cache.get(literals[1]))
+            self.assertIsNotNone(cache.get(literals[-1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics, node, method_chain, constructor_chain
+from unittest import mock
+import unittest
+
+
+class TestSinglePass(unittest.TestCase):
+
+    def test_check_types_returns_static_type(self):
+        expr = MethodCall(
+            MethodCall(Variable("window", Graphics.window), "getSize"),
+            "getWidth")
+        self.assertEqual(Type.double, expr.check_types())
+
+    def test_constructor_call_returns_instantiated_type(self):
+        self.assertEqual(node, constructor_chain(3).check_types())
+
+    def test_check_types_never_asks_for_static_types(self):
+        with mock.patch.object(MethodCall, "static_type", side_effect=AssertionError):
+            self.assertEqual(node, method_chain(200).check_types())
+
+    def test_each_method_is_looked_up_once(self):
+        depth = 200
+        with mock.patch.object(
+                ClassOrInterface, "resolve_method",
+                autospec=True, side_effect=ClassOrInterface.resolve_method) as resolve_method:
+            method_chain(depth).check_types()
+        self.assertEqual(depth, resolve_method.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics
+from tests.helpers import TypeTest
+import os
+import tempfile
+import unittest
+
+
+class TestSnapshot(TypeTest):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".snap")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def round_trip(self, types):
+        save_snapshot(types, self.path)
+        return load_snapshot(self.path)
+
+    def test_round_trips_graphics_hierarchy(self):
+        loaded = self.round_trip([Graphics.rectangle, Graphics.graphics_group, Graphics.window])
+        rectangle, group = loaded["Rectangle"], loaded["GraphicsGroup"]
+        self.assertIsNot(Graphics.rectangle, rectangle)
+        self.assertEqual(
+            ["GraphicsObject", "Colorable", "FillColorable"],
+            [s.name for s in rectangle.direct_supertypes])
+        self.assertEqual(
+            ["Point", "Size"],
+            [a.name for a in rectangle.constructor.argument_types])
+        self.assertIs(loaded["Point"], rectangle.method_named("getPosition").return_type)
+        self.assertIs(Type.void, rectangle.method_named("setPosition").return_type)
+        self.assertFalse(rectangle.is_subtype_of(loaded["Paint"]))
+        self.assertTrue(group.is_subtype_of(loaded["GraphicsObject"]))
+        self.assertTrue(group.is_subtype_of(Type.object))
+
+    def test_builtins_are_shared(self):
+        loaded = self.round_trip([Graphics.point])
+        self.assertIs(Type.object, loaded["Object"])
+        self.assertIs(Type.double, loaded["Point"].method_named("getX").return_type)
+        self.assertIs(Type.object, Type.object.method_named("equals").argument_types[0])
+
+    def test_includes_precomputed_closures(self):
+        loaded = self.round_trip([Graphics.rectangle])
+        self.assertEqual(
+            {t.name for t in Graphics.rectangle.ancestors()},
+            {t.name for t in loaded["Rectangle"]._ancestors})
+
+    def test_loaded_types_check_expressions(self):
+        loaded = self.round_trip([Graphics.graphics_group, Graphics.rectangle, Graphics.window])
+        self.assertNoCompileErrors(
+            MethodCall(
+                Variable("group", loaded["GraphicsGroup"]),
+                "add",
+                ConstructorCall(
+                    loaded["Rectangle"],
+                    NullLiteral(),
+                    MethodCall(Variable("window", loaded["Window"]), "getSize"))))
+
+    def test_preserves_registry_names(self):
+        registry = TypeRegistry()
+        registry.register(Graphics.point, "graphics.Point", aliases=["Pt"])
+        loaded = self.round_trip(registry)
+        self.assertIs(loaded["graphics.Point"], loaded["Pt"])
+        self.assertIs(Type.object, loaded["java.lang.Object"])
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"\0" * 64)
+        with self.assertRaisesRegex(ValueError, "Not a type hierarchy snapshot"):
+            load_snapshot(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
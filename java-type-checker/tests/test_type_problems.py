@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.fixtures import Graphics, method_chain, node
+from unittest import mock
+import pickle
+import unittest
+
+
+def bad_expressions():
+    rect = Variable("rect", Graphics.rectangle)
+    flag = Variable("flag", Type.boolean)
+    zero = Literal("0.0", Type.double)
+    abstract = ClassOrInterface("Shape")
+    abstract.is_instantiable = False
+    canvas = ClassOrInterface("Canvas",
+        methods=[
+            Method("mix", argument_types=[Graphics.paint, Type.object], return_type=Type.void),
+            Method("mix", argument_types=[Type.object, Graphics.paint], return_type=Type.void),
+        ])
+    color = Variable("color", Graphics.color)
+    return [
+        MethodCall(NullLiteral(), "getX"),
+        MethodCall(zero, "getX"),
+        MethodCall(rect, "flip"),
+        MethodCall(rect, "setPosition", zero),
+        MethodCall(rect, "setFillColor", zero),
+        MethodCall(Variable("canvas", canvas), "mix", color, color),
+        MethodCall(Variable("canvas", canvas), "mix", zero, zero),
+        ConstructorCall(abstract),
+        ConstructorCall(Graphics.point, zero),
+        ConstructorCall(Graphics.point, zero, flag),
+        ConditionalExpression(zero, rect, rect),
+        ConditionalExpression(flag, MethodCall(rect, "setPosition", zero, zero), rect),
+        ConditionalExpression(flag, flag, rect),
+    ]
+
+
+class TestTypeProblems(unittest.TestCase):
+
+    def test_diagnose_valid_expression(self):
+        expr = MethodCall(Variable("rect", Graphics.rectangle), "getPosition")
+        self.assertEqual((Graphics.point, []), diagnose(expr))
+
+    def test_same_errors_as_raising_checks(self):
+        for expr in bad_expressions():
+            with self.subTest(expr=type(expr).__name__):
+                with self.assertRaises((JavaTypeError, NoSuchMethod)) as context:
+                    expr.check_types()
+                static_type, (diagnostic,) = diagnose(expr)
+                self.assertIsNone(static_type)
+                self.assertEqual(str(context.exception), diagnostic.message)
+                self.assertIs(type(context.exception), type(diagnostic.error))
+                self.assertIs(expr, diagnostic.node)
+
+    def test_deep_expressions(self):
+        depth = 100000
+        self.assertEqual((node, []), diagnose(method_chain(depth)))
+        static_type, (diagnostic,) = diagnose(MethodCall(method_chain(depth), "nope"))
+        self.assertIsNone(static_type)
+        self.assertEqual((), diagnostic.path)
+        _, (diagnostic,) = diagnose(MethodCall(MethodCall(method_chain(depth), "nope"), "next"))
+        self.assertEqual((0,), diagnostic.path)
+
+    def test_structured_fields(self):
+        expr = ConstructorCall(Graphics.point, Literal("0", Type.int), Literal("1.0", Type.double))
+        _, (diagnostic,) = diagnose(expr)
+        self.assertEqual("wrong_argument_types", diagnostic.problem.kind)
+        self.assertIs(Graphics.point, diagnostic.problem.subject)
+        self.assertEqual((Type.double, Type.double), diagnostic.expected)
+        self.assertEqual((Type.int, Type.double), diagnostic.actual)
+
+    def test_nothing_is_raised_or_formatted(self):
+        expressions = bad_expressions()
+        with mock.patch("java_type_checker.expressions.names", side_effect=names) as formatter, \
+                mock.patch.object(TypeProblem, "exception") as exception:
+            diagnostics = [diagnose(expr)[1][0] for expr in expressions]
+        formatter.assert_not_called()
+        exception.assert_not_called()
+        with mock.patch("java_type_checker.expressions.names", side_effect=names) as formatter:
+            diagnostics[4].message
+        formatter.assert_called()
+
+    def test_diagnose_node(self):
+        expr = MethodCall(Variable("rect", Graphics.rectangle), "flip")
+        problem = expr.diagnose_node([Graphics.rectangle])
+        self.assertIsInstance(problem, TypeProblem)
+        self.assertIs(NoSuchMethod, problem.error_class)
+        self.assertEqual(Type.double, MethodCall(Variable("p", Graphics.point), "getX").diagnose_node(
+            [Graphics.point]))
+
+    def test_errors_render_lazily(self):
+        problem = MethodCall(Variable("rect", Graphics.rectangle), "flip").diagnose_node(
+            [Graphics.rectangle])
+        error = problem.exception()
+        self.assertIs(problem, error.args[0])
+        self.assertEqual("Rectangle has no method named flip", str(error))
+
+    def test_pickled_errors_keep_only_the_message(self):
+        with self.assertRaises(NoSuchMethod) as context:
+            MethodCall(Variable("rect", Graphics.rectangle), "flip").check_types()
+        copy = pickle.loads(pickle.dumps(context.exception))
+        self.assertIsInstance(copy, NoSuchMethod)
+        self.assertEqual(("Rectangle has no method named flip",), copy.args)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+from java_type_checker import *
+from tests.helpers import TypeTest
+import pickle
+import unittest
+
+
+def shapes(universe):
+    """
+    Declares, in the given universe:
+
+        class Point { double getX(); }
+        class Shape { Point getPosition(); }
+        class Circle extends Shape { double getRadius(); }
+    """
+    builder = HierarchyBuilder(universe)
+    builder.declare("Point", supertypes=["Object"],
+        methods=[Method("getX", return_type="double")])
+    builder.declare("Shape", supertypes=["Object"],
+        methods=[Method("getPosition", return_type="Point")])
+    builder.declare("Circle", supertypes=["Shape"], constructor=["Point"],
+        methods=[Method("getRadius", return_type="double")])
+    builder.build()
+    return universe
+
+
+class TestTypeUniverse(TypeTest):
+
+    def test_own_object_type(self):
+        a, b = TypeUniverse(), TypeUniverse()
+        self.assertIsNot(a.object, b.object)
+        self.assertIsNot(Type.object, a.object)
+        self.assertIs(a.object, a["java.lang.Object"])
+        self.assertIs(a.object, a["Object"])
+        self.assertIs(Type.int, a["int"])
+        self.assertEqual(Type.boolean, a.object.method_named("equals").return_type)
+
+    def test_universes_are_independent(self):
+        a, b = shapes(TypeUniverse()), shapes(TypeUniverse())
+        a.object.add_method(Method("getClassName", return_type=a["Shape"]))
+        self.assertIsNotNone(a["Circle"].find_method("getClassName"))
+        self.assertIsNone(b["Circle"].find_method("getClassName"))
+        self.assertFalse(a["Circle"].is_subtype_of(b["Shape"]))
+
+    def test_frozen_types_check_as_before(self):
+        universe = shapes(TypeUniverse()).freeze()
+        circle = Variable("c", universe["Circle"])
+        self.assertEqual(Type.double,
+            MethodCall(MethodCall(circle, "getPosition"), "getX").check_types())
+        self.assertEqual(universe["Circle"],
+            ConstructorCall(universe["Circle"], NullLiteral()).check_types())
+        self.assertCompileError(NoSuchMethod, "Circle has no method named getY",
+            MethodCall(circle, "getY"))
+        self.assertTrue(Type.null.is_subtype_of(universe["Shape"]))
+
+    def test_frozen_types_cannot_change(self):
+        universe = shapes(TypeUniverse()).freeze()
+        circle = universe["Circle"]
+        for change in [
+                lambda: setattr(circle, "direct_supertypes", []),
+                lambda: setattr(circle, "methods", []),
+                lambda: setattr(circle, "constructor", Constructor()),
+                lambda: setattr(circle, "is_instantiable", False),
+                lambda: circle.add_method(Method("getY", return_type=Type.double)),
+                lambda: universe.object.add_method(Method("getY", return_type=Type.double)),
+                lambda: universe.register(ClassOrInterface("Square"))]:
+            with self.assertRaises(FrozenTypeError):
+                change()
+        self.assertIsNone(circle.find_method("getY"))
+
+    def test_frozen_indexes_survive_hierarchy_changes(self):
+        universe = shapes(TypeUniverse()).freeze()
+        circle = universe["Circle"]
+        ancestors, table = circle.ancestors(), circle.method_table()
+        ClassOrInterface("Elsewhere").direct_supertypes = [Type.object]
+        self.assertIs(ancestors, circle.ancestors())
+        self.assertIs(table, circle.method_table())
+
+    def test_unfrozen_subtypes_of_frozen_types(self):
+        universe = shapes(TypeUniverse()).freeze()
+        ring = ClassOrInterface("Ring", direct_supertypes=[universe["Circle"]])
+        self.assertTrue(ring.is_subtype_of(universe["Shape"]))
+        self.assertEqual(universe["Point"], ring.method_named("getPosition").return_type)
+
+    def test_freeze_generics(self):
+        universe = TypeUniverse()
+        e = TypeParameter("E", bound=universe.object)
+        box = GenericClassOrInterface("Box", [e], direct_supertypes=[universe.object],
+            methods=[Method("get", return_type=e)])
+        universe.register(box)
+        point = ClassOrInterface("Point", direct_supertypes=[universe.object])
+        universe.register(point)
+        universe.register(box.of(point))
+        universe.freeze()
+        self.assertEqual(point, box.of(point).method_named("get").return_type)
+        self.assertEqual(universe.object, box.of(universe.object).method_named("get").return_type)
+
+    def test_pickled_copies_are_not_frozen(self):
+        universe = shapes(TypeUniverse()).freeze()
+        circle = pickle.loads(pickle.dumps(universe["Circle"]))
+        self.assertIsInstance(circle, ClassOrInterface)
+        circle.add_method(Method("getY", return_type=Type.double))
+        self.assertIsNotNone(circle.find_method("getY"))
+        self.assertEqual("Point", circle.method_named("getPosition").return_type.name)
+
+    def test_freeze_leaves_global_types_alone(self):
+        shapes(TypeUniverse()).freeze()
+        for t in [Type.void, Type.boolean, Type.int, Type.double]:
+            self.assertIs(Type, type(t))
+        self.assertIs(NullType, type(Type.null))
+        self.assertIs(ClassOrInterface, type(Type.object))
+        Type.int.is_instantiable = False  # would raise FrozenTypeError if frozen
+        Type.object.direct_supertypes = Type.object.direct_supertypes
+        Type.object.add_method(Type.object.method_named("hashCode"))
+
+    def test_freeze_rejects_foreign_types(self):
+        universe = TypeUniverse()
+        stray = universe.register(ClassOrInterface("Stray", direct_supertypes=[Type.object]))
+        with self.assertRaisesRegex(ValueError, "Type Object is reachable from this universe but not part of it"):
+            universe.freeze()
+        self.assertFalse(universe.is_frozen)
+        stray.add_method(Method("m", return_type=Type.int))  # nothing was frozen
+
+    def test_freeze_rejects_cycles(self):
+        universe = TypeUniverse()
+        a = universe.register(ClassOrInterface("A"))
+        a.direct_supertypes = [ClassOrInterface("B", direct_supertypes=[a])]
+        with self.assertRaises(CyclicHierarchy):
+            universe.freeze()
+
+
+class TestCheckInThreads(unittest.TestCase):
+
+    def test_several_universes(self):
+        universes = [shapes(TypeUniverse()).freeze() for _ in range(3)]
+        expressions = []
+        for universe in universes:
+            circle = Variable("c", universe["Circle"])
+            expressions += [
+                MethodCall(MethodCall(circle, "getPosition"), "getX"),
+                MethodCall(circle, "getRadius", circle),
+                ConstructorCall(universe["Circle"], NullLiteral()),
+            ] * 50
+        results = check_in_threads(expressions, workers=4)
+        serial = check_all(expressions, workers=1)
+        self.assertEqual([r.static_type for r in serial], [r.static_type for r in results])
+        self.assertEqual(
+            [type(r.error) for r in serial], [type(r.error) for r in results])
+        self.assertEqual(universes[2]["Circle"], results[-1].static_type)
+
+
+if __name__ == '__main__':
+    unittest.main()